@@ -28,6 +28,8 @@ __version__ = '4.5.8.post2'
 
 from ccxt.base.exchange import Exchange                     # noqa: F401
 from ccxt.base.precise import Precise                       # noqa: F401
+from ccxt.base.precise import PreciseExpr                   # noqa: F401
+from ccxt.base.ohlcv_columns import OHLCVColumns            # noqa: F401
 
 from ccxt.base.decimal_to_precision import decimal_to_precision  # noqa: F401
 from ccxt.base.decimal_to_precision import TRUNCATE              # noqa: F401
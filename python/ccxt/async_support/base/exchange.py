@@ -20,11 +20,11 @@ from ccxt.base.types import Int, Str, Num, Strings
 
 # -----------------------------------------------------------------------------
 
-from ccxt.async_support.base.throttler import Throttler
+from ccxt.async_support.base.throttler import Throttler, shared_throttler
 
 # -----------------------------------------------------------------------------
 
-from ccxt.base.errors import BaseError, BadSymbol, BadRequest, BadResponse, ExchangeError, ExchangeNotAvailable, RequestTimeout, NotSupported, NullResponse, InvalidAddress, RateLimitExceeded, OperationFailed
+from ccxt.base.errors import BaseError, BadSymbol, BadRequest, BadResponse, ExchangeError, ExchangeNotAvailable, RequestTimeout, NotSupported, NullResponse, InvalidAddress, RateLimitExceeded, OperationFailed, UnsubscribeError
 from ccxt.base.types import ConstructorArgs, OrderType, OrderSide, OrderRequest, CancellationRequest
 
 # -----------------------------------------------------------------------------
@@ -36,7 +36,12 @@ from ccxt.base.exchange import Exchange as BaseExchange, ArgumentsRequired
 from ccxt.async_support.base.ws.functions import inflate, inflate64, gunzip
 from ccxt.async_support.base.ws.client import Client
 from ccxt.async_support.base.ws.future import Future
-from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook
+from ccxt.async_support.base.ws.stream import Stream, current_stream
+from ccxt.async_support.base.ws.pool import ConnectionPool
+from ccxt.base.ohlcv_columns import OHLCVColumns, ohlcv_array_type, ohlcv_pages
+from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook, DeltaCache  # noqa: F401
+from ccxt.async_support.base.ws.snapshot_scheduler import SnapshotScheduler
+from ccxt.async_support.base.ws.order_book import engines as order_book_engines
 
 
 # -----------------------------------------------------------------------------
@@ -72,8 +77,13 @@ class Exchange(BaseExchange):
         'keepAlive': 30000
     }
     ping = None
+    # True, a key or {'key': key, 'path': directory} to share the rate limiter with other instances
+    sharedRateLimiter = None
     newUpdates = True
     clients = {}
+    connection_pools = None  # {url: ConnectionPool}, see connection_pool
+    snapshot_scheduler = None  # see schedule_order_book_snapshot
+    message_routes = None  # the routing tables of message_handlers, read once, see compile_message_routes
     timeout_on_exit = 250  # needed for: https://github.com/ccxt/ccxt/pull/23470
 
     def __init__(self, config: ConstructorArgs = {}):
@@ -84,19 +94,86 @@ class Exchange(BaseExchange):
         self.own_session = 'session' not in config
         self.cafile = config.get('cafile', certifi.where())
         self.throttler = None
+        self.throttlers = {}
         super(Exchange, self).__init__(config)
         self.markets_loading = None
         self.reloading_markets = False
+        self.markets_refreshing = None
+        self.connection_pools = {}
+        self.compile_message_routes()
+        if type(self).safe_deterministic_call is Exchange.safe_deterministic_call:
+            # the pages of fetch_ohlcv_array are kept as columns, see safe_deterministic_page
+            self.safe_deterministic_call = self.safeDeterministicCall = self.safe_deterministic_page
+        if type(self).fetch_rest_order_book_safe is Exchange.fetch_rest_order_book_safe:
+            # the snapshots of the exchanges that fetch them with the transpiled fetch_rest_order_book_safe go through the scheduler
+            self.fetch_rest_order_book_safe = self.fetchRestOrderBookSafe = self.schedule_rest_order_book_snapshot
 
     def get_event_loop(self):
         return self.asyncio_loop
 
     def init_throttler(self, cost=None):
-        self.throttler = Throttler(self.tokenBucket, self.asyncio_loop)
+        self.throttler = self.create_throttler(self.tokenBucket)
+        self.throttlers = {}
+        if self.rateLimitBuckets:
+            for name, bucket in self.rateLimitBuckets.items():
+                self.throttlers[name] = self.create_throttler(self.extend(self.tokenBucket, bucket), name)
+
+    def create_throttler(self, config, name=None):
+        if not self.sharedRateLimiter:
+            return Throttler(config, self.asyncio_loop)
+        key = self.rate_limiter_key()
+        if name is not None:
+            key = key + ':' + name
+        path = self.safe_string(self.sharedRateLimiter, 'path') if isinstance(self.sharedRateLimiter, dict) else None
+        return shared_throttler(key, config, self.asyncio_loop, path)
+
+    def rate_limiter_key(self):
+        # instances with the same key share their rate limiter, the default
+        # one is the exchange id and the api host
+        shared = self.sharedRateLimiter
+        key = None
+        if isinstance(shared, str):
+            key = shared
+        elif isinstance(shared, dict):
+            key = self.safe_string(shared, 'key')
+        if key is None:
+            host = self.hostname
+            if host is None:
+                api = self.safe_value(self.urls, 'api')
+                while isinstance(api, dict) and api:
+                    api = list(api.values())[0]
+                host = yarl.URL(api).host if isinstance(api, str) else None
+            key = self.id if host is None else self.id + ':' + host
+        return key
+
+    def rate_limit_throttler(self, name=None):
+        # the names not declared in rateLimitBuckets are charged to the main bucket
+        return self.throttlers.get(name, self.throttler)
 
     async def throttle(self, cost=None):
+        if isinstance(cost, dict):
+            # a request waits only on the buckets it consumes, all at once
+            return await asyncio.gather(*[self.rate_limit_throttler(name)(cost[name]) for name in cost])
         return await self.throttler(cost)
 
+    def handle_rate_limit_headers(self, url, code, headers, spent=None):
+        if not self.enableRateLimit or self.throttler is None:
+            return
+        for feedback in self.parse_rate_limit_headers(url, code, headers):
+            bucket = feedback['bucket']
+            throttler = self.rate_limit_throttler(bucket)
+            if feedback['remaining'] > 0:
+                throttler.sync(feedback['remaining'], None if spent is None else spent.get(bucket))
+            elif feedback['reset']:
+                throttler.backoff(feedback['reset'])
+
+    def rate_limit_spent(self):
+        # a snapshot of the tokens granted so far per bucket, see handle_rate_limit_headers
+        spent = {None: self.throttler.spent}
+        for name, throttler in self.throttlers.items():
+            spent[name] = throttler.spent
+        return spent
+
     def get_session(self):
         return self.session
 
@@ -119,6 +196,8 @@ class Exchange(BaseExchange):
             else:
                 self.asyncio_loop = asyncio.get_event_loop()
             self.throttler.loop = self.asyncio_loop
+            for throttler in self.throttlers.values():
+                throttler.loop = self.asyncio_loop
 
         if self.ssl_context is None:
             # Create our SSL context object with our CA cert file
@@ -157,9 +236,8 @@ class Exchange(BaseExchange):
                 await self.socks_proxy_sessions[url].close()
             self.socks_proxy_sessions = None
 
-    async def fetch(self, url, method='GET', headers=None, body=None):
-        """Perform a HTTP request and return decoded JSON data"""
-
+    def prepare_fetch(self, url, method='GET', headers=None, body=None):
+        """:returns tuple: the url, headers, session and proxy of the request, after the proxy settings"""
         # ##### PROXY & HEADERS #####
         request_headers = self.prepare_request_headers(headers)
         self.last_request_headers = request_headers
@@ -202,17 +280,23 @@ class Exchange(BaseExchange):
             self.log("\nfetch Request:", self.id, method, url, "RequestHeaders:", request_headers, "RequestBody:", body)
         self.logger.debug("%s %s, Request: %s %s", method, url, headers, body)
         # end of proxies & headers
+        self.open()
+        final_session = proxy_session if proxy_session is not None else self.session
+        return url, request_headers, final_session, final_proxy
 
+    async def fetch(self, url, method='GET', headers=None, body=None):
+        """Perform a HTTP request and return decoded JSON data"""
+        url, request_headers, final_session, final_proxy = self.prepare_fetch(url, method, headers, body)
         request_body = body
         encoded_body = body.encode() if body else None
-        self.open()
-        final_session = proxy_session if proxy_session is not None else self.session
         session_method = getattr(final_session, method.lower())
 
         http_response = None
         http_status_code = None
         http_status_text = None
         json_response = None
+        # tokens granted after this point are not reflected in the response headers yet
+        spent = self.rate_limit_spent() if self.throttler is not None else None
         try:
             async with session_method(yarl.URL(url, encoded=True),
                                       data=encoded_body,
@@ -230,6 +314,7 @@ class Exchange(BaseExchange):
                         headers[header] = raw_headers[header]
                 http_status_code = response.status
                 http_status_text = response.reason
+                self.handle_rate_limit_headers(url, http_status_code, headers, spent)
                 http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_response, request_headers, request_body)
                 json_response = self.parse_json(http_response)
                 if self.enableLastHttpResponse:
@@ -270,6 +355,146 @@ class Exchange(BaseExchange):
             return http_response
         return response.content
 
+    async def fetch_items(self, url, method='GET', headers=None, body=None, items=[]):
+        """
+        an async generator of the items of the array at the path items of the JSON response, decoded from the
+        chunks of the body as they are received, see JsonItemStream, the response without the items is checked
+        with handle_errors before the first item and kept as last_json_response
+        """
+        url, request_headers, final_session, final_proxy = self.prepare_fetch(url, method, headers, body)
+        request_body = body
+        encoded_body = body.encode() if body else None
+        session_method = getattr(final_session, method.lower())
+        spent = self.rate_limit_spent() if self.throttler is not None else None
+        stream = self.json_item_stream(items)
+        checked = False
+        try:
+            async with session_method(yarl.URL(url, encoded=True),
+                                      data=encoded_body,
+                                      headers=request_headers,
+                                      timeout=(self.timeout / 1000),
+                                      proxy=final_proxy) as response:
+                raw_headers = response.headers
+                headers = {}
+                for header in raw_headers:
+                    if header in headers:
+                        headers[header] = headers[header] + ', ' + raw_headers[header]
+                    else:
+                        headers[header] = raw_headers[header]
+                http_status_code = response.status
+                http_status_text = response.reason
+                self.handle_rate_limit_headers(url, http_status_code, headers, spent)
+                if self.enableLastHttpResponse:
+                    self.last_http_response = None
+                if self.enableLastResponseHeaders:
+                    self.last_response_headers = headers
+                if http_status_code >= 400:
+                    http_response = await response.text(errors='replace')
+                    http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_response, request_headers, request_body)
+                    json_response = self.parse_json(http_response)
+                    self.handle_errors(http_status_code, http_status_text, url, method, headers, http_response, json_response, request_headers, request_body)
+                    self.handle_http_status_code(http_status_code, http_status_text, url, method, http_response)
+                    raise ExchangeError(' '.join([self.id, method, url, str(http_status_code), http_response]))
+                async for chunk in response.content.iter_chunked(self.streamChunkSize):
+                    try:
+                        parsed = stream.feed(chunk)
+                    except ValueError as e:
+                        raise BadResponse(self.id + ' ' + method + ' ' + url + ' returned invalid JSON') from e
+                    if stream.found and not checked:
+                        checked = True
+                        self.check_item_stream(stream, http_status_code, http_status_text, url, method, headers, request_headers, request_body)
+                    for item in parsed:
+                        yield item
+                try:
+                    parsed = stream.close()
+                except ValueError as e:
+                    raise BadResponse(self.id + ' ' + method + ' ' + url + ' returned invalid JSON') from e
+                if not checked:
+                    self.check_item_stream(stream, http_status_code, http_status_text, url, method, headers, request_headers, request_body)
+                for item in parsed:
+                    yield item
+                if self.verbose:
+                    self.log("\nfetch Response:", self.id, method, url, http_status_code, "ResponseHeaders:", headers, "ResponseBody:", stream.envelope, "Items:", stream.count)
+
+        except socket.gaierror as e:
+            details = ' '.join([self.id, method, url])
+            raise ExchangeNotAvailable(details) from e
+
+        except (concurrent.futures.TimeoutError, asyncio.TimeoutError) as e:
+            details = ' '.join([self.id, method, url])
+            raise RequestTimeout(details) from e
+
+        except aiohttp.ClientConnectionError as e:
+            details = ' '.join([self.id, method, url])
+            raise ExchangeNotAvailable(details) from e
+
+        except aiohttp.ClientError as e:  # base exception class
+            details = ' '.join([self.id, method, url])
+            raise ExchangeError(details) from e
+
+    async def fetch2_items(self, path, api: Any = 'public', method='GET', params={}, headers: Any = None, body: Any = None, config={}, items=[]):
+        """
+        fetch2 for the responses too large to be decoded whole, an async generator of the items of the array at
+        the path items of the response, e.g. fetch2_items('exchangeInfo', 'public', 'GET', {}, items=['symbols']),
+        the requests are not retried since the items may have been consumed already
+        """
+        if self.enableRateLimit:
+            cost = self.calculate_rate_limiter_cost(api, method, path, params, config)
+            await self.throttle(cost)
+        self.lastRestRequestTimestamp = self.milliseconds()
+        request = self.sign(path, api, method, params, headers, body)
+        self.last_request_headers = request['headers']
+        self.last_request_body = request['body']
+        self.last_request_url = request['url']
+        async for item in self.fetch_items(request['url'], request['method'], request['headers'], request['body'], items):
+            yield item
+
+    async def parse_items(self, items, parse, *args):
+        """the async generator of parse(item, *args) of each item of the async generator items as it comes"""
+        async for item in items:
+            yield parse(item, *args)
+
+    async def fetch_ohlcv_array(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None, params={}):
+        """
+        fetch_ohlcv returning OHLCVColumns, the pages of the paginated calls are kept as columns until they are concatenated
+        :param dict [params]: the params of fetch_ohlcv, arrayType 'array' (default) or 'numpy', also options['fetchOHLCVArray']['arrayType']
+        :returns OHLCVColumns: the candles as int64 timestamps and float64 open, high, low, close and volume columns
+        """
+        arrayType, params = self.handle_option_and_params(params, 'fetchOHLCVArray', 'arrayType', 'array')
+        OHLCVColumns(None, arrayType)  # raises NotSupported for the unknown array types and for numpy if it is not installed
+        pages = []
+        token = ohlcv_array_type.set(arrayType)
+        pagesToken = ohlcv_pages.set(pages)
+        try:
+            ohlcvs = await self.fetch_ohlcv(symbol, timeframe, since, limit, params)
+        finally:
+            ohlcv_pages.reset(pagesToken)
+            ohlcv_array_type.reset(token)
+        if pages:
+            # the pages of the paginated call, concatenated as columns in the order of their since
+            pages.sort(key=lambda page: page[0])
+            return OHLCVColumns.concat([page[1] for page in pages], arrayType).filter_by_since_limit(since, limit)
+        return OHLCVColumns.from_rows(ohlcvs, arrayType)
+
+    async def safe_deterministic_page(self, method, symbol: Str = None, since: Int = None, limit: Int = None, timeframe: Str = None, params={}):
+        # safe_deterministic_call, the pages of the paginated calls of fetch_ohlcv_array are collected as columns
+        # instead of being returned to fetch_paginated_call_deterministic to be concatenated as rows
+        pages = ohlcv_pages.get()
+        page = await Exchange.safe_deterministic_call(self, method, symbol, since, limit, timeframe, params)
+        if pages is None or method != 'fetchOHLCV':
+            return page
+        pages.append((since, OHLCVColumns.from_rows(page, ohlcv_array_type.get())))
+        return []
+
+    async def watch_ohlcv_array(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None, params={}):
+        """
+        watch_ohlcv returning OHLCVColumns
+        :param dict [params]: the params of watch_ohlcv, arrayType 'array' (default) or 'numpy', also options['watchOHLCVArray']['arrayType']
+        :returns OHLCVColumns: the new candles of the ArrayCacheByTimestamp of the symbol and timeframe as columns
+        """
+        arrayType, params = self.handle_option_and_params(params, 'watchOHLCVArray', 'arrayType', 'array')
+        return OHLCVColumns.from_rows(await self.watch_ohlcv(symbol, timeframe, since, limit, params), arrayType)
+
     def get_socks_proxy_session(self, socksProxy):
         if (self.socks_proxy_sessions is None):
             self.socks_proxy_sessions = {}
@@ -290,6 +515,15 @@ class Exchange(BaseExchange):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+            cached = self.get_cached_markets()
+            if cached is not None:
+                if not cached['stale']:
+                    return self.set_markets_from_cache(cached)
+                if self.get_markets_cache_option('refresh', True):
+                    # serve the stale markets right away and refresh them in the background
+                    self.set_markets_from_cache(cached)
+                    self.markets_refreshing = asyncio.ensure_future(self.refresh_cached_markets(params))
+                    return self.markets
         currencies = None
         if self.has['fetchCurrencies'] is True:
             currencies = await self.fetch_currencies()
@@ -297,7 +531,19 @@ class Exchange(BaseExchange):
         markets = await self.fetch_markets(params)
         if 'cachedCurrencies' in self.options:
             del self.options['cachedCurrencies']
-        return self.set_markets(markets, currencies)
+        if self.incrementalMarketsReload:
+            result = self.update_markets(markets, currencies)
+        else:
+            result = self.set_markets(markets, currencies)
+        self.cache_markets()
+        return result
+
+    async def refresh_cached_markets(self, params={}):
+        try:
+            await self.load_markets_helper(True, params)
+        except Exception as e:
+            # the stale markets stay in place until the next attempt
+            self.logger.warning('%s failed to refresh the cached markets: %s', self.id, e)
 
 
     async def load_markets(self, reload=False, params={}):
@@ -403,19 +649,79 @@ class Exchange(BaseExchange):
     def gunzip(data):
         return gunzip(data)
 
+    def order_book_class(self, kind):
+        # 'bisect' (default) or 'chunked' for deep books with many updates per message
+        ws_options = self.safe_dict(self.options, 'ws', {})
+        engine = self.safe_string(ws_options, 'orderBookEngine', 'bisect')
+        if engine not in order_book_engines:
+            raise NotSupported(self.id + ' orderBookEngine ' + engine + ' is not supported, use one of ' + ', '.join(order_book_engines.keys()))
+        return order_book_engines[engine][kind]
+
     def order_book(self, snapshot={}, depth=None):
-        return OrderBook(snapshot, depth)
+        return self.bound_delta_cache(self.order_book_class('order_book')(snapshot, depth))
 
     def indexed_order_book(self, snapshot={}, depth=None):
-        return IndexedOrderBook(snapshot, depth)
+        return self.bound_delta_cache(self.order_book_class('indexed_order_book')(snapshot, depth))
 
     def counted_order_book(self, snapshot={}, depth=None):
-        return CountedOrderBook(snapshot, depth)
+        return self.bound_delta_cache(self.order_book_class('counted_order_book')(snapshot, depth))
+
+    def handle_bid_ask_deltas(self, bookside, deltas, priceKey=0, amountKey=1, countOrIdKey=None, number=None):
+        """
+        the batch version of the transpiled handle_bid_ask_deltas, applies all the raw bidasks of a message with a single bookside.apply_deltas() call
+        :param OrderBookSide bookside: the side of the order book to update
+        :param [[str]] deltas: raw bidasks as received from the exchange, like [['31685.1', '0.78'], ...]
+        :param int priceKey: index of the price in a bidask
+        :param int amountKey: index of the amount in a bidask
+        :param int countOrIdKey: index of the count or the order id in a bidask, for counted and indexed books
+        :param callable number: converts the raw prices and amounts, self.number by default
+        """
+        if not deltas:
+            return
+        prices = [delta[priceKey] for delta in deltas]
+        amounts = [delta[amountKey] for delta in deltas]
+        countsOrIds = None if countOrIdKey is None else [delta[countOrIdKey] for delta in deltas]
+        bookside.apply_deltas(prices, amounts, countsOrIds, self.number if number is None else number)
+
+    def bound_delta_cache(self, orderbook):
+        # the deltas buffered until the snapshot, options['watchOrderBook']['maxCachedDeltas'], 0 for no limit
+        max_size = self.handle_option('watchOrderBook', 'maxCachedDeltas', 1000)
+        orderbook.cache = DeltaCache(max_size) if max_size else []
+        return orderbook
+
+    def create_snapshot_scheduler(self):
+        concurrency = self.handle_option('watchOrderBook', 'snapshotConcurrency', 5) or None
+        priorities = self.handle_option('watchOrderBook', 'snapshotPriorities')
+        return SnapshotScheduler(concurrency, priorities)
+
+    async def schedule_order_book_snapshot(self, symbol, limit=None, params={}):
+        """
+        fetches the snapshot of an order book through the snapshot scheduler of the exchange, the options of watchOrderBook
+        are snapshotConcurrency, 5 requests at once by default, 0 for no limit, and snapshotPriorities,
+        {symbol: priority} with the lower priorities first or the list of the symbols to fetch first
+        """
+        if self.snapshot_scheduler is None:
+            self.snapshot_scheduler = self.create_snapshot_scheduler()
+        return await self.snapshot_scheduler.fetch(symbol, self.fetch_order_book, symbol, limit, params)
+
+    async def schedule_rest_order_book_snapshot(self, symbol, limit=None, params={}):
+        # fetch_rest_order_book_safe through the snapshot scheduler, its retries keep the slot
+        if self.snapshot_scheduler is None:
+            self.snapshot_scheduler = self.create_snapshot_scheduler()
+        return await self.snapshot_scheduler.fetch(symbol, Exchange.fetch_rest_order_book_safe, self, symbol, limit, params)
+
+    def order_book_snapshot_stats(self):
+        """
+        :returns dict: {symbol: {'requested', 'snapshots', 'waited', 'fetched', 'firstBook'}}, firstBook is the time to the first snapshot in ms
+        """
+        return {} if self.snapshot_scheduler is None else self.snapshot_scheduler.stats
 
     def client(self, url):
         self.clients = self.clients or {}
         if url not in self.clients:
             on_message = self.handle_message
+            if self.instrumentation is not None:
+                on_message = self.instrumentation.timed_handler(on_message, {'exchange': self.id, 'url': url}, 'ws.handle', 'ws.messages')
             on_error = self.on_error
             on_close = self.on_close
             on_connected = self.on_connected
@@ -428,6 +734,8 @@ class Exchange(BaseExchange):
                 'throttle': Throttler(self.tokenBucket, self.asyncio_loop),
                 'asyncio_loop': self.asyncio_loop,
                 'decompressBinary': self.safe_bool(self.options, 'decompressBinary', True),
+                'on_reconnected_callback': self.on_reconnected,
+                'instrumentation': self.instrumentation,
             }, ws_options)
             # we use aiohttp instead of fastClient now because of this
             # https://github.com/ccxt/ccxt/pull/25995
@@ -438,9 +746,69 @@ class Exchange(BaseExchange):
                 self.clients[url].proxy = httpProxy if httpProxy else httpsProxy
         return self.clients[url]
 
+    def connection_pool(self, url):
+        """
+        the pool of the connections to url, options['ws']['pool'] declares the limits of one connection, e.g.
+        {'maxSubscriptions': 1024, 'maxConnections': 5, 'pinned': {'balance': 'private', 'ticker:BTC/USDT': 'btc'}}
+        :returns ConnectionPool|None: None without options['ws']['pool'], every subscription is sent over the connection to url
+        """
+        pool = self.connection_pools.get(url)
+        if pool is None:
+            ws_options = self.safe_dict(self.options, 'ws', {})
+            pool_options = self.safe_dict(ws_options, 'pool')
+            if pool_options is None:
+                return None
+            pinned = self.safe_dict(pool_options, 'pinned', {})
+            pool = ConnectionPool(url, self.safe_integer(pool_options, 'maxSubscriptions'), self.safe_integer(pool_options, 'maxConnections'), pinned.copy())
+            self.connection_pools[url] = pool
+        return pool
+
+    def connection_url(self, url, subscribe_hashes):
+        pool = self.connection_pool(url)
+        if pool is None:
+            return url
+        result = pool.select(subscribe_hashes, self.clients)
+        if result is None:
+            raise ExchangeError(self.id + ' cannot subscribe to ' + url + ', ' + str(pool.max_connections) + ' connections with ' + str(pool.max_subscriptions) + ' subscriptions each are open')
+        return result
+
     def delay(self, timeout, method, *args):
         return self.asyncio_loop.call_later(timeout / 1000, self.spawn, method, *args)
 
+    def compile_message_routes(self):
+        # the routing tables are read once instead of being built for every message
+        self.message_routes = self.message_handlers()
+        self.message_routes_found = {table: {} for table in self.message_routes}
+        if self.instrumentation is not None:
+            # the routed handlers are replaced with timed ones on the instance, handle_message calls them by name
+            names = set(name for handlers in self.message_routes.values() for name in handlers.values())
+            for name in names:
+                setattr(self, name, self.instrumentation.timed_handler(getattr(self, name), {'exchange': self.id, 'handler': name}, 'ws.handler'))
+
+    def message_handler(self, table, key, find=False):
+        """
+        the transpiled message_handler over the routing tables read by compile_message_routes
+        :param str table: the name of the routing table
+        :param str key: the event, channel or topic of the message
+        :param bool [find]: when no key equals it, the first key contained in it routes the message, the lookups are cached
+        :returns str|None: the name of the handler method
+        """
+        routes = self.message_routes.get(table, {})
+        handler = routes.get(key)
+        if handler is not None or not find or key is None:
+            return handler
+        found = self.message_routes_found.setdefault(table, {})
+        if key in found:
+            return found[key]
+        for route, name in routes.items():
+            if key.find(route) >= 0:
+                handler = name
+                break
+        if len(found) >= 10000:
+            found.clear()
+        found[key] = handler
+        return handler
+
     def handle_message(self, client, message):
         always = True
         if always:
@@ -451,9 +819,13 @@ class Exchange(BaseExchange):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
+        client = self.client(self.connection_url(url, message_hashes if subscribe_hashes is None else subscribe_hashes))
+        stream = current_stream.get()
+        if stream is not None:
+            for message_hash in message_hashes:
+                stream.attach(client, message_hash)
 
-        future = Future.race([client.future(message_hash) for message_hash in message_hashes])
+        future = client.multi_future(message_hashes)
 
         missing_subscriptions = []
         if subscribe_hashes is not None:
@@ -482,6 +854,9 @@ class Exchange(BaseExchange):
                 asyncio.ensure_future(send_message())
 
         if missing_subscriptions:
+            if client.reconnect and message:
+                for subscribe_hash in missing_subscriptions:
+                    client.subscribe_messages[subscribe_hash] = message
             connected.add_done_callback(after)
 
         return future
@@ -490,7 +865,10 @@ class Exchange(BaseExchange):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
+        client = self.client(self.connection_url(url, [message_hash if subscribe_hash is None else subscribe_hash]))
+        stream = current_stream.get()
+        if stream is not None:
+            stream.attach(client, message_hash)
         if subscribe_hash is None and message_hash in client.futures:
             return client.futures[message_hash]
         future = client.future(message_hash)
@@ -525,10 +903,69 @@ class Exchange(BaseExchange):
                 asyncio.ensure_future(send_message())
 
         if not subscribed:
+            if client.reconnect and message:
+                client.subscribe_messages[subscribe_hash] = message
             connected.add_done_callback(after)
 
         return future
 
+    def stream_updates(self, method, *args, max_size=None, overflow=None, callback=None):
+        """
+        subscribes with a watch method and streams every update it receives afterwards, without a watch call per update
+        :param str method: the watch method, e.g. 'watch_trades'
+        :param args: the arguments of the watch method
+        :param int [max_size]: the number of updates queued before the overflow policy applies, options['stream']['maxSize'] by default, 1000
+        :param str [overflow]: 'dropOldest', 'dropNewest' or 'raise', options['stream']['overflow'] by default, 'dropOldest'
+        :param callable [callback]: called with every update instead of queueing it
+        :returns Stream: an async iterator of the updates, the trades, orders and ohlcvs caches yield their new entries, order books yield read-only snapshots
+        """
+        options = self.safe_dict(self.options, 'stream', {})
+        if max_size is None:
+            max_size = self.safe_integer(options, 'maxSize', 1000)
+        if overflow is None:
+            overflow = self.safe_string(options, 'overflow', 'dropOldest')
+        stream = Stream(max_size, overflow, callback)
+        # the watch calls made by the task see the stream, the task copies the context when it is created
+        token = current_stream.set(stream)
+        try:
+            stream.task = asyncio.ensure_future(getattr(self, method)(*args))
+        finally:
+            current_stream.reset(token)
+        stream.task.add_done_callback(stream.subscribed)
+        return stream
+
+    def stream_ticker(self, symbol: str, params={}, **kwargs):
+        return self.stream_updates('watch_ticker', symbol, params, **kwargs)
+
+    def stream_tickers(self, symbols: Strings = None, params={}, **kwargs):
+        return self.stream_updates('watch_tickers', symbols, params, **kwargs)
+
+    def stream_trades(self, symbols, since: Int = None, limit: Int = None, params={}, **kwargs):
+        if isinstance(symbols, list):
+            return self.stream_updates('watch_trades_for_symbols', symbols, since, limit, params, **kwargs)
+        return self.stream_updates('watch_trades', symbols, since, limit, params, **kwargs)
+
+    def stream_order_book(self, symbols, limit: Int = None, params={}, **kwargs):
+        if isinstance(symbols, list):
+            return self.stream_updates('watch_order_book_for_symbols', symbols, limit, params, **kwargs)
+        return self.stream_updates('watch_order_book', symbols, limit, params, **kwargs)
+
+    def stream_ohlcv(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None, params={}, **kwargs):
+        return self.stream_updates('watch_ohlcv', symbol, timeframe, since, limit, params, **kwargs)
+
+    def stream_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}, **kwargs):
+        return self.stream_updates('watch_orders', symbol, since, limit, params, **kwargs)
+
+    def stream_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}, **kwargs):
+        return self.stream_updates('watch_my_trades', symbol, since, limit, params, **kwargs)
+
+    def clean_unsubscription(self, client, subHash: str, unsubHash: str, subHashIsPrefix=False):
+        # the watch_multiple calls wait on a multi future, subHash is only in client.futures.keys() then
+        if not subHashIsPrefix and subHash not in client.futures and subHash in client.futures.keys():
+            client.reject(UnsubscribeError(self.id + ' ' + subHash), subHash)
+        super(Exchange, self).clean_unsubscription(client, subHash, unsubHash, subHashIsPrefix)
+        client.remove_multi_futures(subHash, subHashIsPrefix)
+
     def on_connected(self, client, message=None):
         # for user hooks
         # print('Connected to', client.url)
@@ -539,7 +976,7 @@ class Exchange(BaseExchange):
             del self.clients[client.url]
 
     def on_close(self, client, error):
-        if client.error:
+        if client.error or client.reconnecting:
             # connection closed by the user or due to an error
             pass
         else:
@@ -547,6 +984,55 @@ class Exchange(BaseExchange):
             if client.url in self.clients:
                 del self.clients[client.url]
 
+    def on_reconnected(self, client, messages):
+        """
+        called when options['ws']['reconnect'] restored the connection of client, the order books of client
+        are emptied until a new snapshot and the subscribe messages sent before the gap are sent again
+        """
+        if self.instrumentation is not None:
+            labels = {'exchange': self.id, 'url': client.url}
+            self.instrumentation.increment('ws.reconnects', labels)
+            self.instrumentation.record('ws.gap', client.reconnect_stats['lastGap'], labels)
+        self.resync_order_books(client)
+        self.spawn(self.replay_subscriptions, client, messages)
+
+    def resync_order_books(self, client):
+        # the books of the symbols that client subscribed to missed the deltas of the gap, the replayed
+        # subscriptions bring a new snapshot, like after the first subscription
+        message_hashes = [message_hash for message_hash in list(client.subscriptions.keys()) + client.pending_message_hashes() if isinstance(message_hash, str)]
+        for symbol, orderbook in list(self.orderbooks.items()):
+            for message_hash in message_hashes:
+                if ('orderbook' in message_hash.lower()) and self.message_hash_has_symbol(message_hash, symbol):
+                    orderbook.reset({'symbol': symbol})
+                    # a new bounded cache, the exchanges that replace it by a list after the snapshot lost the bound
+                    self.bound_delta_cache(orderbook)
+                    break
+
+    @staticmethod
+    def message_hash_has_symbol(message_hash, symbol):
+        # BTC/USDT is not in orderbook:BTC/USDT:USDT, it is in orderbook:BTC/USDT:100
+        start = message_hash.find(symbol)
+        while start >= 0:
+            end = start + len(symbol)
+            before = message_hash[start - 1] if start > 0 else ''
+            after = message_hash[end:end + 2]
+            if not before.isalnum() and not after[:1].isalnum() and (after[:1] != ':' or after[1:].isdigit()):
+                return True
+            start = message_hash.find(symbol, start + 1)
+        return False
+
+    async def replay_subscriptions(self, client, messages):
+        options = self.safe_value(self.options, 'ws')
+        cost = self.safe_value(options, 'cost', 1)
+        for message in messages:
+            if self.enableRateLimit:
+                await client.throttle(cost)
+            try:
+                await client.send(message)
+            except Exception as e:
+                client.on_error(e)
+                return
+
     async def ws_close(self):
         if self.clients:
             await asyncio.wait([asyncio.create_task(client.close()) for client in self.clients.values()], return_when=asyncio.ALL_COMPLETED)
@@ -563,7 +1049,7 @@ class Exchange(BaseExchange):
             stored = self.orderbooks[symbol]
             while tries < maxRetries:
                 cache = stored.cache
-                order_book = await self.fetch_order_book(symbol, limit, params)
+                order_book = await self.schedule_order_book_snapshot(symbol, limit, params)
                 index = self.get_cache_index(order_book, cache)
                 if index >= 0:
                     stored.reset(order_book)
@@ -1,9 +1,24 @@
 import asyncio
 import collections
-from time import time
+import contextlib
+import json
+import os
+import re
+import weakref
+from time import monotonic, time
+
+from ccxt.base.errors import NotSupported
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 
 class Throttler:
+    # upper bounds (ms) of the wait time histogram buckets, the last one catches the rest
+    wait_buckets = (1, 5, 10, 50, 100, 500, 1000, 5000, float('inf'))
+
     def __init__(self, config, loop=None):
         self.loop = loop
         self.config = {
@@ -17,34 +32,202 @@ class Throttler:
         self.config.update(config)
         self.queue = collections.deque()
         self.running = False
+        self.timer = None
+        self.last_timestamp = None
+        self.granted = 0
+        self.spent = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_histogram = [0] * len(self.wait_buckets)
+
+    def refill(self, now):
+        # tokens accumulate at refillRate per millisecond up to capacity
+        if self.last_timestamp is None:
+            self.last_timestamp = now
+        elapsed = now - self.last_timestamp
+        self.last_timestamp = now
+        refill_rate = self.config['refillRate']
+        if refill_rate == float('inf'):
+            self.config['tokens'] = self.config['capacity']
+        elif elapsed > 0 and self.config['tokens'] < self.config['capacity']:
+            # a resync from the server may leave more tokens than capacity, those are kept
+            self.config['tokens'] = min(self.config['tokens'] + elapsed * refill_rate, self.config['capacity'])
+
+    def record_wait(self, wait):
+        self.granted += 1
+        self.wait_total += wait
+        if wait > self.wait_max:
+            self.wait_max = wait
+        for i, bound in enumerate(self.wait_buckets):
+            if wait <= bound:
+                self.wait_histogram[i] += 1
+                break
+
+    def clock(self):
+        return monotonic() * 1000
 
-    async def looper(self):
-        last_timestamp = time() * 1000
-        while self.running:
-            future, cost = self.queue[0]
-            cost = self.config['cost'] if cost is None else cost
-            if self.config['tokens'] >= 0:
-                self.config['tokens'] -= cost
-                if not future.done():
-                    future.set_result(None)
-                self.queue.popleft()
-                # context switch
-                await asyncio.sleep(0)
-                if len(self.queue) == 0:
-                    self.running = False
+    def locked(self):
+        # guards the token state, it is only ever touched from the event loop, raises BlockingIOError
+        # instead of waiting when the state is held elsewhere, the caller is then retried after the delay
+        return contextlib.nullcontext()
+
+    def call_later(self, delay, callback, *args):
+        loop = self.loop if self.loop is not None else asyncio.get_running_loop()
+        return loop.call_later(delay, callback, *args)
+
+    def grant(self):
+        # releases every queued request the bucket can afford right now, then
+        # sleeps exactly until the deficit is refilled instead of polling
+        self.timer = None
+        config = self.config
+        queue = self.queue
+        try:
+            with self.locked():
+                self.release()
+        except BlockingIOError:
+            self.timer = self.call_later(config['delay'], self.grant)
+            return
+        if queue:
+            refill_rate = config['refillRate']
+            if refill_rate > 0:
+                delay = max(-config['tokens'] / refill_rate / 1000, config['delay'])
             else:
-                await asyncio.sleep(self.config['delay'])
-                now = time() * 1000
-                elapsed = now - last_timestamp
-                last_timestamp = now
-                self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
+                # the bucket never refills by itself, only a sync from the server can release the queue
+                delay = config['delay']
+            self.timer = self.call_later(delay, self.grant)
+        else:
+            self.running = False
+
+    def release(self):
+        # grants the queued requests that the tokens cover, in order
+        config = self.config
+        queue = self.queue
+        now = self.clock()
+        self.refill(now)
+        while queue:
+            future, cost, timestamp = queue[0]
+            if future.done():
+                # cancelled while waiting, it does not consume any tokens
+                queue.popleft()
+                continue
+            if config['tokens'] < 0:
+                break
+            cost = config['cost'] if cost is None else cost
+            config['tokens'] -= cost
+            self.spent += cost
+            queue.popleft()
+            future.set_result(None)
+            self.record_wait(now - timestamp)
+
+    def reschedule(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.grant()
+
+    def sync(self, tokens, spent=None):
+        # adopts the token count reported by the server, minus whatever was
+        # granted after the request that carried the report
+        try:
+            with self.locked():
+                self.refill(self.clock())
+                if spent is not None:
+                    tokens -= self.spent - spent
+                self.config['tokens'] = tokens
+        except BlockingIOError:
+            self.call_later(self.config['delay'], self.sync, tokens, spent)
+            return
+        self.reschedule()
+
+    def backoff(self, delay):
+        # holds every request for at least delay milliseconds
+        try:
+            with self.locked():
+                self.refill(self.clock())
+                self.config['tokens'] = min(self.config['tokens'], -delay * self.config['refillRate'])
+        except BlockingIOError:
+            self.call_later(self.config['delay'], self.backoff, delay)
+            return
+        self.reschedule()
+
+    def stats(self):
+        histogram = {}
+        for bound, count in zip(self.wait_buckets, self.wait_histogram):
+            histogram[str(bound)] = count
+        return {
+            'tokens': self.config['tokens'],
+            'capacity': self.config['capacity'],
+            'queueSize': len(self.queue),
+            'maxCapacity': self.config['maxCapacity'],
+            'granted': self.granted,
+            'spent': self.spent,
+            'waitTime': {
+                'total': self.wait_total,
+                'max': self.wait_max,
+                'histogram': histogram,
+            },
+        }
 
     def __call__(self, cost=None):
         future = asyncio.Future()
         if len(self.queue) > self.config['maxCapacity']:
             raise RuntimeError('throttle queue is over maxCapacity (' + str(int(self.config['maxCapacity'])) + '), see https://github.com/ccxt/ccxt/issues/11645#issuecomment-1195695526')
-        self.queue.append((future, cost))
-        if not self.running:
+        self.queue.append((future, cost, self.clock()))
+        if self.timer is None:
             self.running = True
-            asyncio.ensure_future(self.looper(), loop=self.loop)
+            self.grant()
         return future
+
+
+class FileThrottler(Throttler):
+    # keeps the bucket in a file locked on every access, so that all the
+    # processes throttling through the same path share the same tokens, the
+    # lock is never waited for on the event loop, a grant that finds it held
+    # by another process is retried after the delay
+
+    def __init__(self, config, path, loop=None):
+        if fcntl is None:
+            raise NotSupported('FileThrottler requires the fcntl module, which is not available on this platform')
+        super(FileThrottler, self).__init__(config, loop)
+        self.path = path
+
+    def clock(self):
+        # the timestamps are compared across processes
+        return time() * 1000
+
+    @contextlib.contextmanager
+    def locked(self):
+        with open(self.path, 'a+') as file:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            file.seek(0)
+            state = file.read()
+            if state:
+                state = json.loads(state)
+                self.config['tokens'] = state['tokens']
+                self.last_timestamp = state['timestamp']
+            try:
+                yield
+            finally:
+                file.truncate(0)
+                file.write(json.dumps({'tokens': self.config['tokens'], 'timestamp': self.last_timestamp}))
+                file.flush()
+
+
+# the throttlers shared by key within the process, they live as long as an exchange uses them
+registry = weakref.WeakValueDictionary()
+
+
+def shared_throttler(key, config, loop=None, path=None):
+    """
+    returns the throttler registered under key, creating it from config on first use
+    :param str key: exchanges using the same key share their rate limit, they must run on the same event loop
+    :param dict config: the token bucket settings, only the first caller's are used
+    :param str path: a directory to keep the bucket in, shared across processes
+    """
+    throttler = registry.get(key)
+    if throttler is None:
+        if path is None:
+            throttler = Throttler(config, loop)
+        else:
+            throttler = FileThrottler(config, os.path.join(path, re.sub(r'[^\w.-]', '_', key) + '.json'), loop)
+        registry[key] = throttler
+    return throttler
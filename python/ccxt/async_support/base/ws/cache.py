@@ -1,6 +1,8 @@
 import collections
 import logging
 
+from ccxt.base.ohlcv_columns import OHLCVColumns
+
 logger = logging.getLogger(__name__)
 
 class Delegate:
@@ -31,6 +33,7 @@ class BaseCache(list):
         super(BaseCache, self).__init__()
         self.max_size = max_size
         self._deque = collections.deque([], max_size)
+        self._appended = 0  # the number of appends, for the streams following the cache
 
     def __eq__(self, other):
         return list(self) == other
@@ -86,6 +89,7 @@ class ArrayCache(BaseCache):
             return new_updates_value
 
     def append(self, item):
+        self._appended += 1
         self._deque.append(item)
         if self._clear_all_updates:
             self._clear_all_updates = False
@@ -114,6 +118,7 @@ class ArrayCacheByTimestamp(BaseCache):
         return min(self._new_updates, limit)
 
     def append(self, item):
+        self._appended += 1
         if item[0] in self.hashmap:
             reference = self.hashmap[item[0]]
             if reference != item:
@@ -130,6 +135,10 @@ class ArrayCacheByTimestamp(BaseCache):
         self._size_tracker.add(item[0])
         self._new_updates = len(self._size_tracker)
 
+    def to_columns(self, array_type='array'):
+        # the candles of the cache as OHLCVColumns, see watch_ohlcv_array
+        return OHLCVColumns.from_rows(self._deque, array_type).sort()
+
 
 class ArrayCacheBySymbolById(ArrayCache):
     def __init__(self, max_size=None):
@@ -139,6 +148,7 @@ class ArrayCacheBySymbolById(ArrayCache):
         self._index = collections.deque([], max_size)
 
     def append(self, item):
+        self._appended += 1
         by_id = self.hashmap.setdefault(item['symbol'], {})
         if item['id'] in by_id:
             reference = by_id[item['id']]
@@ -184,6 +194,7 @@ class ArrayCacheBySymbolBySide(ArrayCache):
         self._index = collections.deque([], max_size)
 
     def append(self, item):
+        self._appended += 1
         by_side = self.hashmap.setdefault(item['symbol'], {})
         if item['side'] in by_side:
             reference = by_side[item['side']]
@@ -6,18 +6,45 @@ try:
 except ImportError:
     pass
 
+import collections
 import json
+import random
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 
 from asyncio import sleep, ensure_future, wait_for, TimeoutError, BaseEventLoop, Future as asyncioFuture
 from .functions import milliseconds, iso8601, deep_extend, is_json_encoded_object
 from ccxt import NetworkError, RequestTimeout
-from ccxt.async_support.base.ws.future import Future
-from ccxt.async_support.base.ws.functions import gunzip, inflate
+from ccxt.base.instrumentation import now
+from ccxt.async_support.base.ws.future import Future, MultiFuture
+from ccxt.async_support.base.ws.functions import Decompressor, decode_frame, gunzip
 from typing import Dict
 
 from aiohttp import WSMsgType
 
 
+class Futures(dict):
+    """
+    the futures by message hash, keys() also lists the message hashes that only a pending multi future
+    waits for, so that the exchanges scanning client.futures.keys() see the watch_multiple calls too
+    """
+
+    def __init__(self, multi_futures):
+        super(Futures, self).__init__()
+        self.multi_futures = multi_futures
+
+    def keys(self):
+        result = list(self)
+        pending = set(result)
+        for multi_future in self.multi_futures.values():
+            if multi_future.pending():
+                for message_hash in multi_future.message_hashes:
+                    if message_hash not in pending:
+                        pending.add(message_hash)
+                        result.append(message_hash)
+        return result
+
+
 class Client(object):
 
     url = None
@@ -26,6 +53,9 @@ class Client(object):
     options = {}  # ws-specific options
     subscriptions = {}
     rejections = {}
+    streams = {}  # the streams attached to every message hash, see Stream
+    multi_futures = {}  # the MultiFuture of every tuple of message hashes
+    waiters = {}  # the MultiFutures of every message hash
     on_message_callback = None
     on_error_callback = None
     on_close_callback = None
@@ -46,11 +76,31 @@ class Client(object):
     verbose = False  # verbose output
     gunzip = False
     inflate = False
+    contextTakeover = False  # the inflated frames continue one deflate stream per connection
+    decompressor = None
     throttle = None
     connecting = False
     asyncio_loop: BaseEventLoop = None
     ping_looper = None
     decompressBinary = True  # decompress binary messages by default
+    # {'executor': 'thread', 'process' or an Executor, 'threshold': bytes, 'compressedThreshold': bytes}
+    # decodes the large and the compressed frames off the loop, in the order they were received
+    decoder = None
+    decoding = None  # the frames waiting for a frame decoded off the loop
+    executors = {}  # the executors shared by the clients
+    executor_clients = weakref.WeakSet()  # the clients using the shared executors, shut down after the last one closes
+    # True or {'delay': 500, 'maxDelay': 30000, 'jitter': 0.5, 'maxRetries': None} restores a lost connection,
+    # the futures stay pending and the subscriptions are sent again, see reconnect_loop
+    reconnect = None
+    reconnecting = False
+    closing = False  # closed by the user, not reconnected
+    session = None
+    subscribe_messages = {}  # the message sent for every subscribe hash, replayed after a reconnect
+    reconnect_stats = None  # {'reconnects', 'attempts', 'lastGap', 'maxGap', 'totalGap'}, the gaps in ms
+    reconnect_error = None
+    gap_started = None
+    on_reconnected_callback = None
+    instrumentation = None  # records ws.decode, see Exchange.instrumentation
 
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         defaults = {
@@ -58,6 +108,12 @@ class Client(object):
             'futures': {},
             'subscriptions': {},
             'rejections': {},
+            'streams': {},
+            'decoding': collections.deque(),
+            'multi_futures': {},
+            'waiters': {},
+            'subscribe_messages': {},
+            'reconnect_stats': {'reconnects': 0, 'attempts': 0, 'lastGap': None, 'maxGap': 0, 'totalGap': 0},
             'on_message_callback': on_message_callback,
             'on_error_callback': on_error_callback,
             'on_close_callback': on_close_callback,
@@ -71,6 +127,8 @@ class Client(object):
                 setattr(self, key, deep_extend(getattr(self, key), settings[key]))
             else:
                 setattr(self, key, settings[key])
+        self.futures = Futures(self.multi_futures)
+        self.decompressor = Decompressor(self.contextTakeover)
         # connection-related Future
         self.connected = Future()
 
@@ -83,9 +141,59 @@ class Client(object):
             del self.rejections[message_hash]
         return future
 
+    def multi_future(self, message_hashes):
+        """
+        a future resolved by the first of message_hashes, the message hashes are registered once and
+        every update resolves it in O(1), unlike racing a future per message hash
+        """
+        key = tuple(message_hashes)
+        multi_future = self.multi_futures.get(key)
+        if multi_future is None:
+            multi_future = MultiFuture(key)
+            self.multi_futures[key] = multi_future
+            for message_hash in key:
+                self.waiters.setdefault(message_hash, []).append(multi_future)
+        future = multi_future.next()
+        if self.rejections:
+            rejections = [self.rejections.pop(message_hash) for message_hash in key if message_hash in self.rejections]
+            if rejections:
+                future.reject(rejections[0])
+        return future
+
+    def remove_multi_future(self, multi_future):
+        if self.multi_futures.get(multi_future.message_hashes) is multi_future:
+            del self.multi_futures[multi_future.message_hashes]
+        for message_hash in multi_future.message_hashes:
+            waiters = self.waiters.get(message_hash)
+            if waiters is not None and multi_future in waiters:
+                waiters.remove(multi_future)
+                if not waiters:
+                    del self.waiters[message_hash]
+
+    def remove_multi_futures(self, message_hash, prefix=False):
+        """unregisters the multi futures of the unsubscribed message hash, or of the message hashes starting with it"""
+        message_hashes = [key for key in self.waiters if key.startswith(message_hash)] if prefix else [message_hash]
+        for key in message_hashes:
+            for multi_future in tuple(self.waiters.get(key, ())):
+                self.remove_multi_future(multi_future)
+
+    def pending_message_hashes(self):
+        """the message hashes of the futures and multi futures that are waiting"""
+        return self.futures.keys()
+
     def reusable_future(self, message_hash):
         return self.future(message_hash)  # only used in go
 
+    def add_stream(self, message_hash, stream):
+        self.streams.setdefault(message_hash, []).append(stream)
+
+    def remove_stream(self, message_hash, stream):
+        streams = self.streams.get(message_hash)
+        if streams is not None and stream in streams:
+            streams.remove(stream)
+            if not streams:
+                del self.streams[message_hash]
+
     def resolve(self, result, message_hash):
         if self.verbose and message_hash is None:
             self.log(iso8601(milliseconds()), 'resolve received None messageHash')
@@ -93,26 +201,56 @@ class Client(object):
             future = self.futures[message_hash]
             future.resolve(result)
             del self.futures[message_hash]
+        waiters = self.waiters.get(message_hash)
+        if waiters is not None:
+            for multi_future in tuple(waiters):
+                if multi_future.pending():
+                    multi_future.resolve(result)
+                else:
+                    # nobody waits for it anymore
+                    self.remove_multi_future(multi_future)
+        streams = self.streams.get(message_hash)
+        if streams is not None:
+            for stream in tuple(streams):
+                stream.push(result)
         return result
 
     def reject(self, result, message_hash=None):
         if message_hash is not None:
+            streams = self.streams.get(message_hash)
+            if streams is not None:
+                for stream in tuple(streams):
+                    stream.fail(result)
+            rejected = False
+            for multi_future in self.waiters.get(message_hash, ()):
+                if multi_future.pending():
+                    multi_future.reject(result)
+                    rejected = True
+                elif multi_future.rejected_by(result):
+                    # another message hash of the multi future delivered the same error
+                    rejected = True
             if message_hash in self.futures:
                 future = self.futures[message_hash]
                 future.reject(result)
                 del self.futures[message_hash]
-            else:
+            elif not rejected:
                 self.rejections[message_hash] = result
         else:
-            message_hashes = list(self.futures.keys())
+            message_hashes = list(self.futures)
             for message_hash in message_hashes:
                 self.reject(result, message_hash)
+            for multi_future in self.multi_futures.values():
+                multi_future.reject(result)
+            for streams in list(self.streams.values()):
+                for stream in tuple(streams):
+                    stream.fail(result)
         return result
 
     def receive_loop(self):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'receive loop')
         if not self.closed():
+            connection = self.connection
             # let's drain the aiohttp buffer to avoid latency
             if len(self.buffer) > 1:
                 size_delta = 0
@@ -131,6 +269,9 @@ class Client(object):
 
             def after_interrupt(resolved: asyncioFuture):
                 exception = resolved.exception()
+                if self.connection is not connection:
+                    # the loop of a connection replaced by a reconnect
+                    return
                 if exception is None:
                     self.handle_message(resolved.result())
                     self.asyncio_loop.call_soon(self.receive_loop)
@@ -138,7 +279,10 @@ class Client(object):
                     error = NetworkError(str(exception))
                     if self.verbose:
                         self.log(iso8601(milliseconds()), 'receive_loop', 'Exception', error)
-                    self.reject(error)
+                    if self.resilient():
+                        self.start_reconnect(error)
+                    else:
+                        self.reject(error)
 
             task.add_done_callback(after_interrupt)
         else:
@@ -149,12 +293,14 @@ class Client(object):
         # exponential backoff for consequent connections if necessary
         if backoff_delay:
             await sleep(backoff_delay)
+        self.session = session
         if self.verbose:
             self.log(iso8601(milliseconds()), 'connecting to', self.url, 'with timeout', self.connectionTimeout, 'ms')
         self.connectionStarted = milliseconds()
         try:
             coroutine = self.create_connection(session)
             self.connection = await wait_for(coroutine, timeout=int(self.connectionTimeout / 1000))
+            self.decompressor.reset()
             self.connecting = False
             self.connectionEstablished = milliseconds()
             self.isConnected = True
@@ -194,6 +340,10 @@ class Client(object):
     def on_error(self, error):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'on_error', error)
+        if self.resilient():
+            self.start_reconnect(error)
+            self.on_error_callback(self, error)
+            return
         self.error = error
         self.reject(error)
         self.on_error_callback(self, error)
@@ -203,11 +353,78 @@ class Client(object):
     def on_close(self, code):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'on_close', code)
+        if self.resilient():
+            self.start_reconnect(NetworkError('Connection closed by remote server, closing code ' + str(code)))
+            self.on_close_callback(self, code)
+            return
         if not self.error:
             self.reject(NetworkError('Connection closed by remote server, closing code ' + str(code)))
         self.on_close_callback(self, code)
         ensure_future(self.aiohttp_close(), loop=self.asyncio_loop)
 
+    def resilient(self):
+        return bool(self.reconnect) and not self.closing
+
+    def start_reconnect(self, error):
+        self.reconnect_error = error
+        if self.reconnecting:
+            return
+        if self.verbose:
+            self.log(iso8601(milliseconds()), 'reconnecting', self.url, error)
+        self.reconnecting = True
+        self.gap_started = milliseconds()
+        # the watch calls made during the gap wait for the new connection
+        self.connected = Future()
+        self.connecting = True
+        self.isConnected = False
+        ensure_future(self.reconnect_loop(), loop=self.asyncio_loop)
+
+    def reconnect_delay(self, attempt):
+        options = self.reconnect if isinstance(self.reconnect, dict) else {}
+        delay = min(options.get('maxDelay', 30000), options.get('delay', 500) * (2 ** attempt))
+        # the clients that lost their connections at once do not reconnect at once
+        return delay * (1 - options.get('jitter', 0.5) * random.random())
+
+    async def reconnect_loop(self):
+        # the subscriptions made before the gap, the ones made during it are sent when the connection opens
+        messages = []
+        for subscribe_hash, message in self.subscribe_messages.items():
+            if subscribe_hash in self.subscriptions and not any(message is m for m in messages):
+                messages.append(message)
+        await self.aiohttp_close()
+        options = self.reconnect if isinstance(self.reconnect, dict) else {}
+        max_retries = options.get('maxRetries')
+        attempt = 0
+        while self.resilient() and ((max_retries is None) or (attempt < max_retries)):
+            await sleep(self.reconnect_delay(attempt) / 1000)
+            if not self.resilient():
+                break
+            attempt += 1
+            self.reconnect_stats['attempts'] += 1
+            self.connection = None
+            self.lastPong = None
+            await self.open(self.session)
+            if self.isConnected and not self.closed():
+                gap = milliseconds() - self.gap_started
+                stats = self.reconnect_stats
+                stats['reconnects'] += 1
+                stats['lastGap'] = gap
+                stats['maxGap'] = max(stats['maxGap'], gap)
+                stats['totalGap'] += gap
+                self.reconnecting = False
+                if self.verbose:
+                    self.log(iso8601(milliseconds()), 'reconnected', self.url, 'after', gap, 'ms')
+                if self.on_reconnected_callback is not None:
+                    self.on_reconnected_callback(self, messages)
+                return
+        self.reconnecting = False
+        self.connecting = False
+        if not self.closing:
+            # out of retries, the futures are rejected like without reconnect
+            self.error = self.reconnect_error
+            self.reject(self.error)
+            self.on_error_callback(self, self.error)
+
     def log(self, *args):
         print(*args)
 
@@ -227,25 +444,103 @@ class Client(object):
         # decoded = json.loads(data) if is_json_encoded_object(data) else data
         decode = None
         if is_json_encoded_object(data):
+            started = None if self.instrumentation is None else now()
             if orjson is None:
                 decode = json.loads(data)
             else:
                 decode = orjson.loads(data)
+            if started is not None:
+                self.instrumentation.record('ws.decode', now() - started, {'url': self.url})
         else:
             decode = data
         self.on_message_callback(self, decode)
 
+    def decoder_executor(self):
+        executor = self.decoder.get('executor', 'thread')
+        if isinstance(executor, Executor):
+            return executor
+        if executor not in self.executors:
+            if executor == 'process':
+                self.executors[executor] = ProcessPoolExecutor()
+            else:
+                self.executors[executor] = ThreadPoolExecutor(thread_name_prefix='ccxt-ws-decoder')
+        self.executor_clients.add(self)
+        return self.executors[executor]
+
+    def release_executors(self):
+        clients = Client.executor_clients
+        if self in clients:
+            clients.discard(self)
+            if not clients:
+                for executor in Client.executors.values():
+                    executor.shutdown(wait=False)
+                Client.executors.clear()
+
+    def decoded_off_loop(self, data, binary):
+        if binary and (self.gunzip or self.inflate):
+            # zlib releases the GIL while decompressing
+            return len(data) >= self.decoder.get('compressedThreshold', 1024)
+        return len(data) >= self.decoder.get('threshold', 65536)
+
+    def handle_frame(self, data, binary=False):
+        if binary and self.inflate and self.contextTakeover and not self.gunzip:
+            # the context of the stream is needed for the frames that follow, not only this one
+            data = self.decompressor.inflate(data)
+            binary = False
+        if self.decoder is not None and (self.decoding or self.decoded_off_loop(data, binary)):
+            # the frames after a frame decoded off the loop wait for it
+            if self.decoded_off_loop(data, binary):
+                future = self.asyncio_loop.run_in_executor(self.decoder_executor(), decode_frame, data, binary, self.gunzip, self.inflate, self.decompressBinary, True)
+                future.add_done_callback(self.handle_decoded_frames)
+                self.decoding.append(future)
+            else:
+                self.decoding.append((data, binary))
+        else:
+            self.handle_frame_on_loop(data, binary)
+
+    def handle_frame_on_loop(self, data, binary=False):
+        if binary:
+            if self.gunzip:
+                data = gunzip(data)
+            elif self.inflate:
+                data = self.decompressor.inflate(data)
+        self.handle_text_or_binary_message(data)
+
+    def handle_decoded_frames(self, future=None):
+        try:
+            while self.decoding:
+                frame = self.decoding[0]
+                if not isinstance(frame, asyncioFuture):
+                    self.decoding.popleft()
+                    self.handle_frame_on_loop(*frame)
+                    continue
+                if not frame.done():
+                    return
+                self.decoding.popleft()
+                if frame.cancelled():
+                    continue
+                error = frame.exception()
+                if error is not None:
+                    self.decoding.clear()
+                    self.on_error(NetworkError(str(error)))
+                    return
+                decoded, elapsed = frame.result()
+                if elapsed is not None and self.instrumentation is not None:
+                    self.instrumentation.record('ws.decode', elapsed, {'url': self.url})
+                if self.verbose:
+                    self.log(iso8601(milliseconds()), 'message', decoded)
+                self.on_message_callback(self, decoded)
+        finally:
+            # a failing handler does not hold back the frames after it
+            if self.decoding and (not isinstance(self.decoding[0], asyncioFuture) or self.decoding[0].done()):
+                self.asyncio_loop.call_soon(self.handle_decoded_frames)
+
     def handle_message(self, message):
         # self.log(iso8601(milliseconds()), message)
         if message.type == WSMsgType.TEXT:
-            self.handle_text_or_binary_message(message.data)
+            self.handle_frame(message.data)
         elif message.type == WSMsgType.BINARY:
-            data = message.data
-            if self.gunzip:
-                data = gunzip(data)
-            elif self.inflate:
-                data = inflate(data)
-            self.handle_text_or_binary_message(data)
+            self.handle_frame(message.data, True)
         # autoping is responsible for automatically replying with pong
         # to a ping incoming from a server, we have to disable autoping
         # with aiohttp's websockets and respond with pong manually
@@ -296,8 +591,20 @@ class Client(object):
     async def close(self, code=1000):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'closing', code)
+        self.closing = True
         for future in self.futures.values():
             future.cancel()
+        for multi_future in self.multi_futures.values():
+            if multi_future.pending():
+                multi_future.future.cancel()
+        for frame in self.decoding:
+            if isinstance(frame, asyncioFuture):
+                frame.cancel()
+        self.decoding.clear()
+        self.release_executors()
+        for streams in list(self.streams.values()):
+            for stream in tuple(streams):
+                stream.close()
         await self.aiohttp_close()
 
     async def aiohttp_close(self):
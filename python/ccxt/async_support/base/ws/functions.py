@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from zlib import decompress, MAX_WBITS
+orjson = None
+try:
+    import orjson as orjson
+except ImportError:
+    pass
+
+import json
+from zlib import decompress, decompressobj, MAX_WBITS
 from base64 import b64decode
-from gzip import GzipFile
-from io import BytesIO
 import time
 import datetime
 
@@ -17,7 +22,67 @@ def inflate64(data):
 
 
 def gunzip(data):
-    return GzipFile('', 'rb', 9, BytesIO(data)).read().decode('utf-8')
+    return gunzip_bytes(data).decode('utf-8')
+
+
+def gunzip_bytes(data):
+    # zlib reads the gzip header in C, without a GzipFile and a BytesIO per frame
+    context = decompressobj(16 + MAX_WBITS)
+    result = context.decompress(data)
+    if not context.eof:
+        raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+    # the members that follow, skipping the zero padding between them, like GzipFile
+    rest = context.unused_data.lstrip(b'\x00')
+    if rest:
+        result += gunzip_bytes(rest)
+    return result
+
+
+class Decompressor(object):
+    """
+    inflates the frames of one connection, with context_takeover the inflated frames continue one
+    deflate stream, like permessage-deflate, and are decompressed with the context of the previous frames,
+    the gzip members are complete on their own and are decompressed by gunzip
+    """
+
+    # the end of a sync flush, permessage-deflate strips it from every message
+    tail = b'\x00\x00\xff\xff'
+
+    def __init__(self, context_takeover=False):
+        self.context_takeover = context_takeover
+        self.context = None
+
+    def reset(self):
+        # a new connection starts a new stream
+        self.context = None
+
+    def inflate(self, data):
+        if not self.context_takeover:
+            return inflate(data)
+        if self.context is None:
+            self.context = decompressobj(-MAX_WBITS)
+        if not data.endswith(self.tail):
+            data += self.tail
+        return self.context.decompress(data)
+
+
+def decode_frame(data, binary=False, gunzip_frames=False, inflate_frames=False, decompress_binary=True, timed=False):
+    # what Client.handle_message does with a text or binary frame before on_message_callback,
+    # a module function so that it can run in a worker thread or process, timed returns the
+    # message with the ms spent parsing its json or None, recorded as ws.decode by the client
+    if binary:
+        if gunzip_frames:
+            data = gunzip(data)
+        elif inflate_frames:
+            data = inflate(data)
+    if isinstance(data, bytes) and decompress_binary:
+        data = data.decode()
+    elapsed = None
+    if is_json_encoded_object(data):
+        started = time.perf_counter()
+        data = json.loads(data) if orjson is None else orjson.loads(data)
+        elapsed = (time.perf_counter() - started) * 1000
+    return (data, elapsed) if timed else data
 
 
 #  Tmp : added methods below to avoid circular imports between exchange.py and aiohttp.py
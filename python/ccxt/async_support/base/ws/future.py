@@ -44,3 +44,34 @@ class Future(asyncio.Future):
                 future.set_result(first_result)
         task.add_done_callback(callback)
         return future
+
+
+class MultiFuture(object):
+    """
+    a set of message hashes resolving one future, registered with the client once and reused by every
+    watch_multiple call on the same message hashes, see Client.multi_future
+    """
+
+    def __init__(self, message_hashes):
+        self.message_hashes = message_hashes
+        self.future = None
+
+    def next(self):
+        if self.future is None or self.future.done():
+            self.future = Future()
+        return self.future
+
+    def pending(self):
+        return self.future is not None and not self.future.done()
+
+    def resolve(self, result=None):
+        if self.pending():
+            self.future.set_result(result)
+
+    def reject(self, error=None):
+        if self.pending():
+            self.future.set_exception(error)
+
+    def rejected_by(self, error):
+        future = self.future
+        return future is not None and future.done() and not future.cancelled() and future.exception() is error
@@ -2,9 +2,27 @@
 
 from ccxt.async_support.base.ws import order_book_side
 from ccxt import Exchange
+from types import MappingProxyType
 import sys
 
 
+class DeltaCache(list):
+    """the deltas received before the snapshot, over max_size the oldest ones are dropped"""
+
+    def __init__(self, max_size):
+        super(DeltaCache, self).__init__()
+        self.max_size = max_size
+        self.dropped = 0
+
+    def append(self, delta):
+        if len(self) >= self.max_size:
+            # the snapshot requested later is newer than them, the nonce checks of the exchange
+            # resubscribe the book when it is not
+            del self[0]
+            self.dropped += 1
+        super(DeltaCache, self).append(delta)
+
+
 class OrderBook(dict):
     def __init__(self, snapshot={}, depth=None):
         self.cache = []
@@ -33,11 +51,9 @@ class OrderBook(dict):
         return self
 
     def reset(self, snapshot={}):
-        self['asks']._index.clear()
         self['asks'].clear()
         for ask in snapshot.get('asks', []):
             self['asks'].storeArray(ask)
-        self['bids']._index.clear()
         self['bids'].clear()
         for bid in snapshot.get('bids', []):
             self['bids'].storeArray(bid)
@@ -52,6 +68,52 @@ class OrderBook(dict):
             return self
         self.reset(snapshot)
 
+    # read api for consumers, none of these copy the sides
+
+    def best_bid(self):
+        return self['bids'].best()
+
+    def best_ask(self):
+        return self['asks'].best()
+
+    def mid(self):
+        bid = self['bids'].best()
+        ask = self['asks'].best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        bid = self['bids'].best()
+        ask = self['asks'].best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def top(self, n):
+        # live views of the first n bids and asks
+        return self['bids'].top(n), self['asks'].top(n)
+
+    def depth_at(self, price):
+        # the amount resting at a price level on either side
+        return self['bids'].volume_at(price) or self['asks'].volume_at(price)
+
+    def cumulative_volume(self, side, notional):
+        # the base amount that a quote notional fills on 'bids' (selling) or 'asks' (buying)
+        return self[side].cumulative_volume(notional)
+
+    def snapshot(self):
+        # immutable copy-on-write view, the levels are only copied if the book
+        # is updated while the snapshot is still referenced
+        return MappingProxyType({
+            'bids': self['bids'].snapshot(),
+            'asks': self['asks'].snapshot(),
+            'timestamp': self['timestamp'],
+            'datetime': self['datetime'],
+            'nonce': self['nonce'],
+            'symbol': self['symbol'],
+        })
+
 # -----------------------------------------------------------------------------
 # overwrites absolute volumes at price levels
 # or deletes price levels based on order counts (3rd value in a bidask delta)
@@ -76,3 +138,47 @@ class IndexedOrderBook(OrderBook):
             'bids': order_book_side.IndexedBids(snapshot.get('bids', []), depth),
         })
         super(IndexedOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# same books backed by the chunked sides, see options['ws']['orderBookEngine']
+
+
+class ChunkedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.ChunkedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.ChunkedBids(snapshot.get('bids', []), depth),
+        })
+        super(ChunkedOrderBook, self).__init__(copy, depth)
+
+
+class ChunkedCountedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.ChunkedCountedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.ChunkedCountedBids(snapshot.get('bids', []), depth),
+        })
+        super(ChunkedCountedOrderBook, self).__init__(copy, depth)
+
+
+class ChunkedIndexedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.ChunkedIndexedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.ChunkedIndexedBids(snapshot.get('bids', []), depth),
+        })
+        super(ChunkedIndexedOrderBook, self).__init__(copy, depth)
+
+
+engines = {
+    'bisect': {
+        'order_book': OrderBook,
+        'counted_order_book': CountedOrderBook,
+        'indexed_order_book': IndexedOrderBook,
+    },
+    'chunked': {
+        'order_book': ChunkedOrderBook,
+        'counted_order_book': ChunkedCountedOrderBook,
+        'indexed_order_book': ChunkedIndexedOrderBook,
+    },
+}
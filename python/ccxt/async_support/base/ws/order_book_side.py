@@ -2,6 +2,9 @@
 
 import sys
 import bisect
+import itertools
+import weakref
+from collections.abc import Sequence
 
 """Author: Carlo Revelli"""
 """Fast bisect bindings"""
@@ -11,6 +14,8 @@ import bisect
 
 class OrderBookSide(list):
     side = None  # set to True for bids and False for asks
+    count_type = None  # converts the 3rd value of the deltas passed to apply_deltas
+    _snapshot = None  # weak reference to the last snapshot that still reads through this side
 
     def __init__(self, deltas=[], depth=None):
         super(OrderBookSide, self).__init__()
@@ -25,6 +30,8 @@ class OrderBookSide(list):
         return self.storeArray(delta)
 
     def storeArray(self, delta):
+        if self._snapshot is not None:
+            self._detach_snapshot()
         price = delta[0]
         size = delta[1]
         index_price = -price if self.side else price
@@ -42,8 +49,81 @@ class OrderBookSide(list):
     def store(self, price, size):
         self.storeArray([price, size])
 
+    def _rows(self, prices, sizes, counts_or_ids, number):
+        if number is not None:
+            prices = map(number, prices)
+            sizes = map(number, sizes)
+        if counts_or_ids is None:
+            return list(zip(prices, sizes))
+        if self.count_type is not None:
+            counts_or_ids = map(self.count_type, counts_or_ids)
+        return list(zip(prices, sizes, counts_or_ids))
+
+    def apply_deltas(self, prices, sizes, counts_or_ids=None, number=float):
+        # applies all the deltas of a message at once, the raw values are converted in one pass,
+        # the batch is sorted once and merged into the side with a single forward sweep
+        if self._snapshot is not None:
+            self._detach_snapshot()
+        rows = self._rows(prices, sizes, counts_or_ids, number)
+        # the last delta for a price wins, like with consecutive storeArray calls
+        if self.side:
+            batch = {-row[0]: row for row in rows}
+        else:
+            batch = {row[0]: row for row in rows}
+        keys = sorted(batch)
+        index = self._index
+        if len(keys) > len(index) // 2:
+            self._rebuild(batch, keys)
+            return
+        counted = counts_or_ids is not None
+        bisect_left = bisect.bisect_left
+        get_level = list.__getitem__
+        insert_level = list.insert
+        delete_level = list.__delitem__
+        lo = 0
+        for key in keys:
+            row = batch[key]
+            alive = row[1] and row[-1]
+            position = bisect_left(index, key, lo)
+            if position < len(index) and index[position] == key:
+                if alive:
+                    level = get_level(self, position)
+                    level[1] = row[1]
+                    if counted:
+                        level[2] = row[2]
+                    lo = position + 1
+                else:
+                    del index[position]
+                    delete_level(self, position)
+                    lo = position
+            elif alive:
+                index.insert(position, key)
+                insert_level(self, position, list(row))
+                lo = position + 1
+            else:
+                lo = position
+
+    def _rebuild(self, batch, keys):
+        # a large batch relative to the side, rebuilding is cheaper than shifting per level
+        levels = dict(zip(self._index, list.__iter__(self)))
+        for key in keys:
+            row = batch[key]
+            if row[1] and row[-1]:
+                level = levels.get(key)
+                if level is None:
+                    levels[key] = list(row)
+                else:
+                    level[1:len(row)] = row[1:]
+            else:
+                levels.pop(key, None)
+        index = sorted(levels)
+        self._index = index
+        list.__setitem__(self, slice(None), [levels[key] for key in index])
+
     def limit(self):
         difference = len(self) - self._depth
+        if difference > 0 and self._snapshot is not None:
+            self._detach_snapshot()
         for _ in range(difference):
             self.remove_index(self.pop())
             self._index.pop()
@@ -51,6 +131,54 @@ class OrderBookSide(list):
     def remove_index(self, order):
         pass
 
+    # read api, none of these copy the side
+
+    def best(self):
+        return self[0] if len(self) else None
+
+    def top(self, n):
+        return OrderBookSideView(self, n)
+
+    def volume_at(self, price):
+        index_price = -price if self.side else price
+        index = bisect.bisect_left(self._index, index_price)
+        if index < len(self._index) and self._index[index] == index_price:
+            return self[index][1]
+        return 0
+
+    def cumulative_volume(self, notional):
+        # the base amount that can be filled against this side for a quote notional
+        volume = 0
+        remaining = notional
+        for level in self:
+            cost = level[0] * level[1]
+            if cost >= remaining:
+                return volume + remaining / level[0]
+            volume += level[1]
+            remaining -= cost
+        return volume
+
+    def snapshot(self):
+        # copy-on-write, the snapshot reads through the side until the side is modified
+        # and it is shared by all the callers in between
+        snapshot = None if self._snapshot is None else self._snapshot()
+        if snapshot is None:
+            snapshot = OrderBookSideSnapshot(self)
+            self._snapshot = weakref.ref(snapshot)
+        return snapshot
+
+    def _detach_snapshot(self):
+        snapshot = self._snapshot()
+        self._snapshot = None
+        if snapshot is not None:
+            snapshot._detach()
+
+    def clear(self):
+        if self._snapshot is not None:
+            self._detach_snapshot()
+        self._index.clear()
+        super(OrderBookSide, self).clear()
+
     def __len__(self):
         length = super(OrderBookSide, self).__len__()
         return min(length, self._n)
@@ -77,10 +205,14 @@ class OrderBookSide(list):
 
 
 class CountedOrderBookSide(OrderBookSide):
+    count_type = int
+
     def __init__(self, deltas=[], depth=None):
         super(CountedOrderBookSide, self).__init__(deltas, depth)
 
     def storeArray(self, delta):
+        if self._snapshot is not None:
+            self._detach_snapshot()
         price = delta[0]
         size = delta[1]
         count = delta[2]
@@ -110,6 +242,8 @@ class IndexedOrderBookSide(OrderBookSide):
         super(IndexedOrderBookSide, self).__init__(deltas, depth)
 
     def storeArray(self, delta):
+        if self._snapshot is not None:
+            self._detach_snapshot()
         price = delta[0]
         if price is not None:
             index_price = -price if self.side else price
@@ -155,14 +289,343 @@ class IndexedOrderBookSide(OrderBookSide):
             del self[index]
             del self._hashmap[order_id]
 
+    def apply_deltas(self, prices, sizes, order_ids, number=float):
+        # orders can move between price levels, so they are applied one by one
+        for price, size, order_id in zip(prices, sizes, order_ids):
+            if number is not None:
+                price = None if price is None else number(price)
+                size = number(size)
+            self.storeArray([price, size, order_id])
+
+    def remove_index(self, order):
+        order_id = order[2]
+        if order_id in self._hashmap:
+            del self._hashmap[order_id]
+
+    def volume_at(self, price):
+        # several orders can rest at the same price
+        index_price = -price if self.side else price
+        start = bisect.bisect_left(self._index, index_price)
+        end = bisect.bisect_right(self._index, index_price, start)
+        return sum(self[index][1] for index in range(start, end))
+
+    def store(self, price, size, order_id):
+        self.storeArray([price, size, order_id])
+
+# -----------------------------------------------------------------------------
+# alternative engine for deep books, see options['ws']['orderBookEngine']
+# price levels are kept in sorted chunks of bounded size and in a hashmap by key,
+# so updates of existing levels are O(1) and inserts or deletes only shift one
+# chunk instead of the whole side, the flat list is rebuilt from the chunks in a
+# single pass on the next read after levels were added or removed
+
+
+class ChunkedOrderBookSide(OrderBookSide):
+    chunk_size = 256
+
+    def __init__(self, deltas=[], depth=None):
+        self._levels = {}
+        self._keys = []  # sorted chunks of index keys
+        self._chunks = []  # levels, parallel to self._keys
+        self._maxes = []  # the last key of every chunk
+        self._dirty = False
+        super(ChunkedOrderBookSide, self).__init__(deltas, depth)
+
+    def storeArray(self, delta):
+        if self._snapshot is not None:
+            self._detach_snapshot()
+        price = delta[0]
+        size = delta[1]
+        index_price = -price if self.side else price
+        level = self._levels.get(index_price)
+        if size:
+            if level is not None:
+                level[1] = size
+            else:
+                self._insert_level(index_price, delta)
+        elif level is not None:
+            self._remove_level(index_price)
+
+    def apply_deltas(self, prices, sizes, counts_or_ids=None, number=float):
+        # inserts only shift a single chunk here, so there is nothing to gain from sorting the batch
+        for row in self._rows(prices, sizes, counts_or_ids, number):
+            self.storeArray(list(row))
+
+    def _insert_level(self, key, delta):
+        self._levels[key] = delta
+        maxes = self._maxes
+        if not maxes:
+            self._keys.append([key])
+            self._chunks.append([delta])
+            maxes.append(key)
+        else:
+            i = bisect.bisect_left(maxes, key)
+            if i == len(maxes):
+                i -= 1
+                keys = self._keys[i]
+                keys.append(key)
+                self._chunks[i].append(delta)
+                maxes[i] = key
+            else:
+                keys = self._keys[i]
+                j = bisect.bisect_left(keys, key)
+                keys.insert(j, key)
+                self._chunks[i].insert(j, delta)
+            if len(keys) > self.chunk_size * 2:
+                chunk = self._chunks[i]
+                half = self.chunk_size
+                self._keys[i:i + 1] = [keys[:half], keys[half:]]
+                self._chunks[i:i + 1] = [chunk[:half], chunk[half:]]
+                maxes[i:i + 1] = [keys[half - 1], keys[-1]]
+        self._dirty = True
+
+    def _locate(self, key):
+        i = bisect.bisect_left(self._maxes, key)
+        return i, bisect.bisect_left(self._keys[i], key)
+
+    def _remove_level(self, key):
+        del self._levels[key]
+        i, j = self._locate(key)
+        keys = self._keys[i]
+        del keys[j]
+        del self._chunks[i][j]
+        if not keys:
+            del self._keys[i]
+            del self._chunks[i]
+            del self._maxes[i]
+        elif j == len(keys):
+            self._maxes[i] = keys[-1]
+        self._dirty = True
+
+    def volume_at(self, price):
+        level = self._levels.get(-price if self.side else price)
+        return 0 if level is None else level[1]
+
+    def materialize(self):
+        if self._dirty:
+            # extending chunk by chunk copies pointers in bulk, much faster than chaining
+            list.clear(self)
+            for chunk in self._chunks:
+                list.extend(self, chunk)
+            self._dirty = False
+
+    def limit(self):
+        difference = len(self._levels) - self._depth
+        if difference > 0 and self._snapshot is not None:
+            self._detach_snapshot()
+        for _ in range(difference):
+            keys = self._keys[-1]
+            del self._levels[keys.pop()]
+            self.remove_index(self._chunks[-1].pop())
+            if keys:
+                self._maxes[-1] = keys[-1]
+            else:
+                self._keys.pop()
+                self._chunks.pop()
+                self._maxes.pop()
+            self._dirty = True
+        self.materialize()
+
+    def clear(self):
+        if self._snapshot is not None:
+            self._detach_snapshot()
+        self._levels.clear()
+        self._keys.clear()
+        self._chunks.clear()
+        self._maxes.clear()
+        self._dirty = False
+        super(ChunkedOrderBookSide, self).clear()
+
+    def __len__(self):
+        return min(len(self._levels), self._n)
+
+    def __getitem__(self, item):
+        self.materialize()
+        return super(ChunkedOrderBookSide, self).__getitem__(item)
+
+    def __iter__(self):
+        self.materialize()
+        return super(ChunkedOrderBookSide, self).__iter__()
+
+    def __reversed__(self):
+        self.materialize()
+        return super(ChunkedOrderBookSide, self).__reversed__()
+
+    def __contains__(self, item):
+        self.materialize()
+        return super(ChunkedOrderBookSide, self).__contains__(item)
+
+
+class ChunkedCountedOrderBookSide(ChunkedOrderBookSide):
+    count_type = int
+
+    def storeArray(self, delta):
+        if self._snapshot is not None:
+            self._detach_snapshot()
+        price = delta[0]
+        size = delta[1]
+        count = delta[2]
+        index_price = -price if self.side else price
+        level = self._levels.get(index_price)
+        if size and count:
+            if level is not None:
+                level[1] = size
+                level[2] = count
+            else:
+                self._insert_level(index_price, delta)
+        elif level is not None:
+            self._remove_level(index_price)
+
+    def store(self, price, size, count):
+        self.storeArray([price, size, count])
+
+
+class ChunkedIndexedOrderBookSide(ChunkedOrderBookSide):
+    # levels are keyed by (index_price, order_id) to keep the ordering of IndexedOrderBookSide
+    def __init__(self, deltas=[], depth=None):
+        self._hashmap = {}
+        super(ChunkedIndexedOrderBookSide, self).__init__(deltas, depth)
+
+    def storeArray(self, delta):
+        if self._snapshot is not None:
+            self._detach_snapshot()
+        price = delta[0]
+        if price is not None:
+            index_price = -price if self.side else price
+        else:
+            index_price = None
+        size = delta[1]
+        order_id = delta[2]
+        if size:
+            if order_id in self._hashmap:
+                old_price = self._hashmap[order_id]
+                index_price = index_price or old_price
+                # in case the price is not defined
+                delta[0] = abs(index_price)
+                key = (old_price, order_id)
+                if index_price == old_price:
+                    # just overwrite the old level
+                    i, j = self._locate(key)
+                    self._chunks[i][j] = delta
+                    self._levels[key] = delta
+                    self._dirty = True
+                    return
+                self._remove_level(key)
+            self._hashmap[order_id] = index_price
+            self._insert_level((index_price, order_id), delta)
+        elif order_id in self._hashmap:
+            self._remove_level((self._hashmap.pop(order_id), order_id))
+
+    def apply_deltas(self, prices, sizes, order_ids, number=float):
+        for price, size, order_id in zip(prices, sizes, order_ids):
+            if number is not None:
+                price = None if price is None else number(price)
+                size = number(size)
+            self.storeArray([price, size, order_id])
+
     def remove_index(self, order):
         order_id = order[2]
         if order_id in self._hashmap:
             del self._hashmap[order_id]
 
+    def volume_at(self, price):
+        # (index_price,) sorts before every (index_price, order_id) key, so the orders
+        # resting at a price are found with a bisect and read in a single forward pass
+        index_price = -price if self.side else price
+        i = bisect.bisect_left(self._maxes, (index_price,))
+        if i == len(self._maxes):
+            return 0
+        j = bisect.bisect_left(self._keys[i], (index_price,))
+        volume = 0
+        while i < len(self._keys):
+            keys = self._keys[i]
+            chunk = self._chunks[i]
+            while j < len(keys):
+                if keys[j][0] != index_price:
+                    return volume
+                volume += chunk[j][1]
+                j += 1
+            i += 1
+            j = 0
+        return volume
+
+    def clear(self):
+        self._hashmap.clear()
+        super(ChunkedIndexedOrderBookSide, self).clear()
+
     def store(self, price, size, order_id):
         self.storeArray([price, size, order_id])
 
+# -----------------------------------------------------------------------------
+# read-only views that do not copy the levels
+
+
+class OrderBookSideView(Sequence):
+    # the first n levels of a side, reads are live
+    __slots__ = ('_side', '_n')
+
+    def __init__(self, side, n):
+        self._side = side
+        self._n = n
+
+    def __len__(self):
+        return min(len(self._side), self._n)
+
+    def __getitem__(self, item):
+        length = len(self)
+        if isinstance(item, slice):
+            return [self._side[i] for i in range(*item.indices(length))]
+        if item < 0:
+            item += length
+        if item < 0 or item >= length:
+            raise IndexError('order book side view index out of range')
+        return self._side[item]
+
+    def __iter__(self):
+        return itertools.islice(iter(self._side), self._n)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return str(list(self))
+
+
+class OrderBookSideSnapshot(Sequence):
+    # immutable levels of a side as of OrderBookSide.snapshot(), the levels are only
+    # copied if the side is modified while the snapshot is still referenced
+    __slots__ = ('_side', '_levels', '__weakref__')
+
+    def __init__(self, side):
+        self._side = side
+        self._levels = None
+
+    def _detach(self):
+        self._levels = tuple(tuple(level) for level in self._side)
+        self._side = None
+
+    def __len__(self):
+        return len(self._side) if self._levels is None else len(self._levels)
+
+    def __getitem__(self, item):
+        if self._levels is not None:
+            return self._levels[item]
+        if isinstance(item, slice):
+            return tuple(tuple(level) for level in self._side[item])
+        return tuple(self._side[item])
+
+    def __iter__(self):
+        if self._levels is not None:
+            return iter(self._levels)
+        return (tuple(level) for level in self._side)
+
+    def __eq__(self, other):
+        return list(map(list, self)) == list(map(list, other))
+
+    def __repr__(self):
+        return str(list(map(list, self)))
+
+
 # -----------------------------------------------------------------------------
 # a more elegant syntax is possible here, but native inheritance is portable
 
@@ -172,3 +635,9 @@ class CountedAsks(CountedOrderBookSide): side = False                       # no
 class CountedBids(CountedOrderBookSide): side = True                        # noqa
 class IndexedAsks(IndexedOrderBookSide): side = False                       # noqa
 class IndexedBids(IndexedOrderBookSide): side = True                        # noqa
+class ChunkedAsks(ChunkedOrderBookSide): side = False                       # noqa
+class ChunkedBids(ChunkedOrderBookSide): side = True                        # noqa
+class ChunkedCountedAsks(ChunkedCountedOrderBookSide): side = False         # noqa
+class ChunkedCountedBids(ChunkedCountedOrderBookSide): side = True          # noqa
+class ChunkedIndexedAsks(ChunkedIndexedOrderBookSide): side = False         # noqa
+class ChunkedIndexedBids(ChunkedIndexedOrderBookSide): side = True          # noqa
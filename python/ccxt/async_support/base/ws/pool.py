@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+
+class ConnectionPool(object):
+    """
+    shards the subscriptions to one endpoint over up to max_connections connections of up to max_subscriptions
+    subscriptions each, the subscriptions that start with a pinned prefix get a connection of their own,
+    the connections are told apart by the fragment of their url, which is not sent to the server
+    """
+
+    def __init__(self, url, max_subscriptions=None, max_connections=None, pinned=None):
+        self.url = url
+        self.max_subscriptions = max_subscriptions
+        self.max_connections = max_connections
+        self.pinned = {} if pinned is None else pinned  # {subscribe hash prefix: connection name}
+        self.assigned = {}  # {subscribe hash: url}
+
+    def connection_url(self, index):
+        return self.url if index == 0 else self.url + '#' + str(index)
+
+    def pin(self, prefix, name=None):
+        self.pinned[prefix] = prefix if name is None else name
+
+    def pinned_url(self, subscribe_hash):
+        if isinstance(subscribe_hash, str):
+            for prefix, name in self.pinned.items():
+                if subscribe_hash.startswith(prefix):
+                    return self.url + '#' + name
+        return None
+
+    def is_pinned(self, url):
+        return any(url == self.url + '#' + name for name in self.pinned.values())
+
+    @staticmethod
+    def load(url, clients):
+        # the subscriptions of a closed connection are gone with its client
+        return len(clients[url].subscriptions) if url in clients else 0
+
+    def has_room(self, url, count, clients):
+        return (self.max_subscriptions is None) or (self.load(url, clients) + count <= self.max_subscriptions)
+
+    def select(self, subscribe_hashes, clients):
+        """
+        the connection that subscribe_hashes are subscribed over, they stay on it until it closes
+        :param str[] subscribe_hashes: the subscriptions of one subscribe message
+        :param dict clients: the clients of the exchange by url
+        :returns str|None: the url of the connection, None when every connection is full
+        """
+        url = None
+        missing = []
+        for subscribe_hash in subscribe_hashes:
+            assigned = self.assigned.get(subscribe_hash)
+            if (assigned is not None) and (assigned in clients):
+                if url is None:
+                    url = assigned
+            else:
+                missing.append(subscribe_hash)
+        if not missing:
+            return url
+        pinned = self.pinned_url(missing[0])
+        if pinned is not None:
+            url = pinned
+        elif (url is None) or self.is_pinned(url) or not self.has_room(url, len(missing), clients):
+            url = self.least_loaded(len(missing), clients)
+            if url is None:
+                return None
+        for subscribe_hash in missing:
+            self.assigned[subscribe_hash] = url
+        return url
+
+    def least_loaded(self, count, clients):
+        # the open connection with the fewest subscriptions, a new one when they are full
+        result = None
+        result_load = None
+        closed = None
+        limit = len(clients) + 1 if self.max_connections is None else self.max_connections
+        for index in range(0, limit):
+            url = self.connection_url(index)
+            if url not in clients:
+                if closed is None:
+                    closed = url
+                continue
+            load = self.load(url, clients)
+            if self.has_room(url, count, clients) and ((result is None) or (load < result_load)):
+                result = url
+                result_load = load
+        return closed if result is None else result
+
+    def connections(self, clients):
+        """the load of the open connections of the pool, {url: number of subscriptions}"""
+        prefix = self.url + '#'
+        return {url: len(client.subscriptions) for url, client in clients.items() if url == self.url or url.startswith(prefix)}
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import heapq
+from ccxt.async_support.base.ws.functions import milliseconds
+
+
+class SnapshotScheduler(object):
+    """
+    runs the order book snapshot requests of an exchange, at most concurrency of them at once, the others wait
+    in the order of the priority of their symbol, lower first, then in the order they were made
+    """
+
+    def __init__(self, concurrency=5, priorities=None):
+        self.concurrency = concurrency
+        # {symbol: priority} or a list of the symbols to fetch first, the other symbols come after them
+        self.priorities = {} if priorities is None else priorities
+        self.running = 0
+        self.queue = []  # a heap of [priority, sequence, future]
+        self.sequence = 0
+        # {symbol: {'requested', 'snapshots', 'waited', 'fetched', 'firstBook'}}, the durations in ms,
+        # firstBook is the time from the first request to the first snapshot of the symbol
+        self.stats = {}
+
+    def priority(self, symbol):
+        if isinstance(self.priorities, dict):
+            return self.priorities.get(symbol, 0)
+        return self.priorities.index(symbol) - len(self.priorities) if symbol in self.priorities else 0
+
+    async def fetch(self, symbol, method, *args):
+        requested = milliseconds()
+        stats = self.stats.get(symbol)
+        if stats is None:
+            stats = {'requested': requested, 'snapshots': 0, 'waited': None, 'fetched': None, 'firstBook': None}
+            self.stats[symbol] = stats
+        if (self.concurrency is None) or ((self.running < self.concurrency) and not self.queue):
+            self.running += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self.queue, [self.priority(symbol), self.sequence, future])
+            self.sequence += 1
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # cancelled after it was given a slot
+                    self.release()
+                raise
+        started = milliseconds()
+        try:
+            result = await method(*args)
+        finally:
+            self.release()
+        finished = milliseconds()
+        stats['snapshots'] += 1
+        stats['waited'] = started - requested
+        stats['fetched'] = finished - started
+        if stats['firstBook'] is None:
+            stats['firstBook'] = finished - stats['requested']
+        return result
+
+    def release(self):
+        self.running -= 1
+        while self.queue and ((self.concurrency is None) or (self.running < self.concurrency)):
+            future = heapq.heappop(self.queue)[2]
+            if not future.done():
+                self.running += 1
+                future.set_result(None)
+
+    def pending(self):
+        return len(self.queue)
@@ -0,0 +1,135 @@
+import asyncio
+import collections
+import contextvars
+
+from ccxt.async_support.base.ws.cache import BaseCache
+from ccxt.async_support.base.ws.order_book import OrderBook
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_stream.py
+
+# the stream that the watch calls of the current task subscribe, see Exchange.stream_updates
+current_stream = contextvars.ContextVar('ccxt_current_stream', default=None)
+
+
+class Stream(object):
+    """
+    receives every update resolved on the message hashes it is attached to, without a future per update,
+    updates are queued up to max_size and consumed with async for, or passed to the callback right away
+    overflow policies: 'dropOldest' drops the oldest queued update, 'dropNewest' drops the incoming update,
+    'raise' closes the stream with a RuntimeError
+    order books are delivered as copy-on-write snapshots, see OrderBook.snapshot, so every queued
+    update keeps the levels it was resolved with while the live book goes on updating
+    """
+
+    overflow_policies = ('dropOldest', 'dropNewest', 'raise')
+
+    def __init__(self, max_size=1000, overflow='dropOldest', callback=None):
+        if overflow not in self.overflow_policies:
+            raise ValueError('stream overflow must be one of ' + ', '.join(self.overflow_policies))
+        self.max_size = max_size
+        self.overflow = overflow
+        self.callback = callback
+        self.queue = collections.deque()
+        self.waiter = None
+        self.dropped = 0
+        self.error = None
+        self.closed = False
+        self.task = None  # the watch call that subscribed
+        self.subscriptions = []  # (client, message_hash)
+        self.appended = {}  # the appended count of the caches at their last update
+
+    def attach(self, client, message_hash):
+        if not self.closed:
+            client.add_stream(message_hash, self)
+            self.subscriptions.append((client, message_hash))
+
+    def subscribed(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            self.fail(task.exception())
+
+    def updates(self, value):
+        # a cache yields the entries appended since its last update
+        appended = value._appended
+        count = min(appended - self.appended.get(id(value), 0), len(value))
+        self.appended[id(value)] = appended
+        return value[len(value) - count:] if count > 0 else None
+
+    def push(self, value):
+        if self.closed:
+            return
+        if isinstance(value, BaseCache):
+            value = self.updates(value)
+            if value is None:
+                return
+        elif isinstance(value, OrderBook):
+            value = value.snapshot()
+        if self.callback is not None:
+            try:
+                self.callback(value)
+            except Exception as e:
+                self.fail(e)
+            return
+        if len(self.queue) >= self.max_size:
+            self.dropped += 1
+            if self.overflow == 'dropNewest':
+                return
+            elif self.overflow == 'raise':
+                self.fail(RuntimeError('stream queue is over max_size ' + str(self.max_size)))
+                return
+            self.queue.popleft()
+        self.queue.append(value)
+        self.wake()
+
+    def fail(self, error):
+        if not self.closed:
+            self.error = error
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for client, message_hash in self.subscriptions:
+            client.remove_stream(message_hash, self)
+        self.subscriptions = []
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+        self.wake()
+
+    def wake(self):
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    async def wait(self):
+        self.waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self.waiter
+        finally:
+            self.waiter = None
+
+    async def join(self):
+        """waits until the stream is closed, raises the error that closed it"""
+        while not self.closed:
+            await self.wait()
+        self.raise_error()
+
+    def raise_error(self):
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self.queue:
+            if self.closed:
+                self.raise_error()
+                raise StopAsyncIteration
+            await self.wait()
+        return self.queue.popleft()
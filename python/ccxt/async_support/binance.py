@@ -46,6 +46,24 @@ class binance(Exchange, ImplicitAPI):
             'name': 'Binance',
             'countries': [],  # Japan
             'rateLimit': 50,
+            'rateLimitHeaders': [
+                # used weight reported per fixed 1m window, see the api costs below for the limits
+                {'url': '/sapi/', 'used': 'x-sapi-used-ip-weight-1m', 'limit': 12000, 'window': 60000, 'bucket': 'sapi'},
+                {'url': '/fapi/', 'used': 'x-mbx-used-weight-1m', 'limit': 2400, 'window': 60000, 'cost': 1, 'bucket': 'fapi'},
+                {'url': '/dapi/', 'used': 'x-mbx-used-weight-1m', 'limit': 2400, 'window': 60000, 'cost': 1, 'bucket': 'dapi'},
+                {'url': '/api/', 'used': 'x-mbx-used-weight-1m', 'limit': 6000, 'window': 60000},
+                {'url': '/api/', 'used': 'x-mbx-order-count-10s', 'limit': 100, 'window': 10000, 'bucket': 'orders'},
+            ],
+            'rateLimitBuckets': {
+                # the sapi, fapi and dapi weights are counted apart from the spot weight,
+                # the apis starting with their names spend their own bucket
+                'sapi': {'api': 'sapi'},
+                'fapi': {'api': 'fapi'},
+                'dapi': {'api': 'dapi'},
+                # spot order rate limit of 100 per 10 seconds, the order endpoints below
+                # also cost the number of orders they place
+                'orders': {'refillRate': 100 / 10000},
+            },
             'certified': True,
             'pro': True,
             # new metainfo2 interface
@@ -1081,14 +1099,14 @@ class binance(Exchange, ImplicitAPI):
                         'account/commission': 4,
                     },
                     'post': {
-                        'order/oco': 0.2,
-                        'orderList/oco': 0.2,
-                        'orderList/oto': 0.2,
-                        'orderList/otoco': 0.2,
-                        'sor/order': 0.2,
+                        'order/oco': {'cost': 0.2, 'orders': 2},
+                        'orderList/oco': {'cost': 0.2, 'orders': 2},
+                        'orderList/oto': {'cost': 0.2, 'orders': 2},
+                        'orderList/otoco': {'cost': 0.2, 'orders': 3},
+                        'sor/order': {'cost': 0.2, 'orders': 1},
                         'sor/order/test': 0.2,
-                        'order': 0.2,
-                        'order/cancelReplace': 0.2,
+                        'order': {'cost': 0.2, 'orders': 1},
+                        'order/cancelReplace': {'cost': 0.2, 'orders': 1},
                         'order/test': 0.2,
                     },
                     'delete': {
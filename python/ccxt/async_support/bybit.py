@@ -40,6 +40,13 @@ class bybit(Exchange, ImplicitAPI):
             'version': 'v5',
             'userAgent': None,
             'rateLimit': 20,
+            'rateLimitHeaders': {
+                # per endpoint and uid limits
+                'remaining': 'X-Bapi-Limit-Status',
+                'limit': 'X-Bapi-Limit',
+                'resetTimestamp': 'X-Bapi-Limit-Reset-Timestamp',
+                'endpoint': True,
+            },
             'hostname': 'bybit.com',  # bybit.com, bytick.com, bybit.nl, bybit.com.hk
             'pro': True,
             'certified': True,
@@ -14,6 +14,8 @@ __all__ = [
     'NO_PADDING',
     'PAD_WITH_ZERO',
     'decimal_to_precision',
+    'precision_formatter',
+    'compiled_decimal_to_precision',
 ]
 
 
@@ -169,6 +171,120 @@ def decimal_to_precision(n, rounding_mode=ROUND, precision=None, counting_mode=D
             return precise
 
 
+# the plain decimal numbers rounded by the compiled formatters, the others go through decimal_to_precision
+number_pattern = re.compile(r'([-+]?)(\d*)(?:\.(\d*))?(?:[eE]([-+]?\d+))?')
+# the formatters by rounding mode, precision, type of precision, counting mode and padding mode
+formatters = {}
+max_formatters = 10000
+
+
+def precision_formatter(rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
+    """
+    :returns callable: formatter(n) returning decimal_to_precision(n, rounding_mode, precision, counting_mode, padding_mode),
+    compiled once for the arguments, the numbers of up to 26 digits are rounded to their tick as integers
+    """
+    key = (rounding_mode, precision, type(precision), counting_mode, padding_mode)
+    formatter = formatters.get(key)
+    if formatter is None:
+        if len(formatters) >= max_formatters:
+            formatters.clear()
+        formatter = compile_formatter(rounding_mode, precision, counting_mode, padding_mode)
+        formatters[key] = formatter
+    return formatter
+
+
+def compiled_decimal_to_precision(n, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
+    return precision_formatter(rounding_mode, precision, counting_mode, padding_mode)(n)
+
+
+def parse_tick(precision):
+    # (units, scale) of the tick precision = units * 10 ** -scale, without the trailing zeros of units
+    match = number_pattern.fullmatch(str(precision))
+    if match is None:
+        return None
+    sign, integer, fraction, exponent = match.groups()
+    if sign == '-' or not (integer or fraction):
+        return None
+    fraction = fraction or ''
+    units = int((integer or '') + fraction)
+    scale = len(fraction) - (int(exponent) if exponent else 0)
+    if units == 0:
+        return None
+    while scale > 0 and units % 10 == 0:
+        units //= 10
+        scale -= 1
+    if scale == 0 and units % 10 == 0:
+        # the ticks of 10 and more are rounded to negative decimal places
+        return None
+    return units, scale
+
+
+def compile_formatter(rounding_mode, precision, counting_mode, padding_mode):
+    def generic(n):
+        return decimal_to_precision(n, rounding_mode, precision, counting_mode, padding_mode)
+
+    if rounding_mode not in (TRUNCATE, ROUND) or padding_mode not in (NO_PADDING, PAD_WITH_ZERO) or isinstance(precision, bool):
+        return generic
+    tick = None
+    if counting_mode == DECIMAL_PLACES:
+        if isinstance(precision, numbers.Integral) and 0 <= precision <= 18:
+            tick = (1, int(precision))
+    elif counting_mode == TICK_SIZE:
+        if isinstance(precision, str):
+            precision = float(precision)
+        if isinstance(precision, (float, decimal.Decimal, numbers.Integral)) and precision > 0:
+            tick = parse_tick(precision)
+    # SIGNIFICANT_DIGITS counts the digits of n
+    if tick is None or tick[1] < 0 or tick[1] > 18:
+        return generic
+    tick_units, places = tick
+    round_half_up = rounding_mode == ROUND
+    pad = padding_mode == PAD_WITH_ZERO
+    # the results of decimal up to its precision of 28 digits
+    limit = 10 ** 26
+    fullmatch = number_pattern.fullmatch
+
+    def formatter(n):
+        match = fullmatch(n if isinstance(n, str) else str(n))
+        if match is None:
+            return generic(n)
+        sign, integer, fraction, exponent = match.groups()
+        if fraction is None:
+            fraction = ''
+        digits = integer + fraction
+        if not digits or (exponent is not None and len(exponent) > 3):
+            return generic(n)
+        value = int(digits)
+        scale = len(fraction) - (int(exponent) if exponent else 0)
+        if scale <= places:
+            value *= 10 ** (places - scale)
+            units = tick_units
+            scale = places
+        else:
+            units = tick_units * 10 ** (scale - places)
+        missing = value % units
+        if missing:
+            value -= missing
+            if round_half_up and missing * 2 >= units:
+                value += units
+        if value >= limit:
+            return generic(n)
+        if scale > places:
+            value //= 10 ** (scale - places)
+        string = str(value)
+        if places:
+            if len(string) <= places:
+                string = '0' * (places + 1 - len(string)) + string
+            string = string[:-places] + '.' + string[-places:]
+            if not pad:
+                string = string.rstrip('0').rstrip('.')
+        if value and sign == '-':
+            return '-' + string
+        return string
+
+    return formatter
+
+
 def number_to_string(x):
     # avoids scientific notation for too large and too small numbers
     if x is None:
@@ -29,10 +29,15 @@ from ccxt.base.errors import UnsubscribeError
 
 # -----------------------------------------------------------------------------
 
-from ccxt.base.decimal_to_precision import decimal_to_precision
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE, NO_PADDING, TRUNCATE, ROUND, ROUND_UP, ROUND_DOWN, SIGNIFICANT_DIGITS
 from ccxt.base.decimal_to_precision import number_to_string
+from ccxt.base.decimal_to_precision import precision_formatter, compiled_decimal_to_precision
 from ccxt.base.precise import Precise
+from ccxt.base.instrumentation import Instrumentation
+from ccxt.base.json_stream import JsonItemStream
+from ccxt.base.number_backends import number_backend
+from ccxt.base.ohlcv_columns import OHLCVColumns, OHLCVCBuilder, build_ohlcvc_columns, ohlcv_array_type, ohlcv_pages
+from ccxt.base.market_cache import MarketCache, MemoryMarketCache, FileMarketCache
 from ccxt.base.types import ConstructorArgs, BalanceAccount, Currency, IndexType, OrderSide, OrderType, Trade, OrderRequest, Market, MarketType, Str, Num, Strings, CancellationRequest, Bool
 
 # -----------------------------------------------------------------------------
@@ -92,7 +97,6 @@ from email.utils import parsedate
 import gzip
 import hashlib
 import hmac
-import io
 
 # load orjson if available, otherwise default to json
 orjson = None
@@ -145,6 +149,10 @@ class Exchange(object):
     # rate limiter settings
     enableRateLimit = True
     rateLimit = 2000  # milliseconds = seconds * 1000
+    rateLimitHeaders = None  # response headers reporting the server-side rate limit state
+    rateLimitBuckets = None  # extra token buckets that api configs can name next to the cost of the main one, see bucket_rate_limiter_cost
+    rate_limit_backoff_until = 0
+    rate_limit_timestamps = None
     timeout = 10000   # milliseconds = seconds * 1000
     asyncio_loop = None
     aiohttp_proxy = None
@@ -162,6 +170,13 @@ class Exchange(object):
     logger = None  # logging.getLogger(__name__) by default
     verbose = False
     markets = None
+    marketsCache = None  # a MarketCache or {'type': 'memory' or 'file', 'ttl': ms, 'path': directory, 'key': str, 'refresh': bool}
+    markets_indexes = None  # the indexes of markets_by, valid while markets_indexes_source is markets
+    markets_indexes_source = None
+    incrementalMarketsReload = False  # reloads update the loaded markets in place, see update_markets
+    markets_listeners = None
+    precision_formatters = None  # the compiled decimal_to_precision of every market, see market_formatters
+    instrumentation = None  # True or an Instrumentation to record the timings of the requests and messages
     symbols = None
     codes = None
     timeframes = {}
@@ -230,6 +245,7 @@ class Exchange(object):
     }
     headers = None
     returnResponseHeaders = False
+    streamChunkSize = 65536  # the size of the chunks of the bodies read by fetch_items
     origin = '*'  # CORS origin
     MAX_VALUE = float('inf')
     #
@@ -340,7 +356,9 @@ class Exchange(object):
     minFundingAddressLength = 1  # used in check_address
     substituteCommonCurrencyCodes = True
     quoteJsonNumbers = True
-    number: Num = float  # or str (a pointer to a class)
+    number: Num = float  # or str (a pointer to a class), or 'float', 'str', 'decimal', 'scaled', see number_backend
+    numberScale = 8  # the decimals of the 'scaled' numbers
+    decimalContext = None  # the decimal.Context of the 'decimal' numbers
     handleContentTypeApplicationZip = False
     # whether fees should be summed by currency code
     reduceFees = True
@@ -393,8 +411,16 @@ class Exchange(object):
         self.liquidations = dict() if self.liquidations is None else self.liquidations
         self.myLiquidations = dict() if self.myLiquidations is None else self.myLiquidations
         self.currencies = dict() if self.currencies is None else self.currencies
+        self.rate_limit_timestamps = dict()
+        self.markets_listeners = list()
+        self.precision_formatters = dict()
         self.options = self.get_default_options() if self.options is None else self.options  # Python does not allow to define properties in run-time with setattr
-        self.decimal_to_precision = decimal_to_precision
+        self.decimal_to_precision = compiled_decimal_to_precision
+        if type(self).safe_deterministic_call is Exchange.safe_deterministic_call:
+            # the pages of fetch_ohlcv_array are kept as columns, see safe_deterministic_page
+            self.safe_deterministic_call = self.safeDeterministicCall = self.safe_deterministic_page
+        if type(self).set_markets is Exchange.set_markets:
+            self.set_markets = self.setMarkets = self.set_markets_fast
         self.number_to_string = number_to_string
 
         # version = '.'.join(map(str, sys.version_info[:3]))
@@ -436,6 +462,20 @@ class Exchange(object):
                     else:
                         setattr(self, camelcase, attr)
 
+        number = number_backend(self.number, self.numberScale, self.decimalContext)
+        if number is None:
+            raise NotSupported(self.id + ' number must be float, str, decimal, scaled or a callable, got ' + str(self.number))
+        self.number = number
+
+        if self.rateLimitBuckets:
+            # the requests also spend the buckets their api config names
+            self.calculate_rate_limiter_cost = self.calculateRateLimiterCost = self.bucket_rate_limiter_cost
+
+        if self.instrumentation is True:
+            self.instrumentation = Instrumentation()
+        if self.instrumentation is not None:
+            self.instrumentation.instrument(self)
+
         if not self.session and self.synchronous:
             self.session = Session()
             self.session.trust_env = self.requests_trust_env
@@ -460,6 +500,26 @@ class Exchange(object):
 
     def throttle(self, cost=None):
         now = float(self.milliseconds())
+        if now < self.rate_limit_backoff_until:
+            time.sleep((self.rate_limit_backoff_until - now) / 1000.0)
+            now = float(self.milliseconds())
+        if isinstance(cost, dict):
+            # {'default': 5, 'orders': 1} waits for every named bucket, the names
+            # not declared in rateLimitBuckets are charged to the main one
+            delay = 0
+            buckets = self.rateLimitBuckets or {}
+            for name in cost:
+                if name in buckets:
+                    elapsed = now - self.rate_limit_timestamps.get(name, 0)
+                    delay = max(delay, cost[name] / self.rate_limit_refill_rate(name) - elapsed)
+                else:
+                    delay = max(delay, self.rateLimit * cost[name] - (now - self.lastRestRequestTimestamp))
+            if delay > 0:
+                time.sleep(delay / 1000.0)
+            for name in cost:
+                if name in buckets:
+                    self.rate_limit_timestamps[name] = now + delay
+            return
         elapsed = now - self.lastRestRequestTimestamp
         cost = 1 if cost is None else cost
         sleep_time = self.rateLimit * cost
@@ -467,6 +527,113 @@ class Exchange(object):
             delay = sleep_time - elapsed
             time.sleep(delay / 1000.0)
 
+    def rate_limit_refill_rate(self, name=None):
+        # the buckets of rateLimitBuckets inherit the settings of tokenBucket
+        bucket = (self.rateLimitBuckets or {}).get(name, {})
+        return bucket.get('refillRate', self.tokenBucket['refillRate'])
+
+    def bucket_rate_limiter_cost(self, api, method, path, params, config={}):
+        """
+        the cost of calculate_rate_limiter_cost, with the buckets of rateLimitBuckets that the api config names,
+        the cost of the apis starting with the 'api' of a bucket is charged to that bucket instead of the main one
+        :returns float|dict: the cost, or {'default': cost of the main bucket, name: cost of the bucket} when it spends a named bucket, {'cost': 0.2, 'orders': 1} costs {'default': 0.2, 'orders': 1}
+        """
+        cost = type(self).calculate_rate_limiter_cost(self, api, method, path, params, config)
+        main = 'default'
+        api_name = '/'.join(api) if isinstance(api, list) else str(api)
+        for name, bucket in self.rateLimitBuckets.items():
+            if 'api' in bucket and api_name.startswith(bucket['api']):
+                main = name
+                break
+        names = [name for name in self.rateLimitBuckets if name in config]
+        if main == 'default' and not names:
+            return cost
+        result = {main: cost}
+        for name in names:
+            result[name] = config[name]
+        return result
+
+    def parse_rate_limit_headers(self, url, code, headers):
+        """
+        reads the rate limit state reported by the server from the response headers
+        :param str url: the request url, rules with a 'url' key only apply to urls containing it
+        :param int code: the http status code
+        :param dict headers: the response headers
+        :returns dict[]: one {'bucket': name or None for the main bucket, 'remaining': tokens left until the window resets, 'reset': milliseconds until it resets} per reported bucket
+        """
+        result = []
+        if not headers:
+            return result
+        lowercase = {}
+        for key in headers:
+            lowercase[key.lower()] = headers[key]
+        if code == 429 or code == 418:
+            retry_after = lowercase.get('retry-after')
+            if retry_after is not None:
+                try:
+                    delay = float(retry_after) * 1000
+                except ValueError:
+                    date = parsedate(retry_after)
+                    delay = None if date is None else calendar.timegm(date) * 1000 - self.milliseconds()
+                if delay is not None:
+                    result.append({'bucket': None, 'remaining': 0, 'reset': max(delay, 0)})
+                    return result
+        rules = self.rateLimitHeaders
+        if not rules:
+            return result
+        if isinstance(rules, dict):
+            rules = [rules]
+        reported = set()
+        for rule in rules:
+            bucket = rule.get('bucket')
+            if bucket in reported or ('url' in rule and rule['url'] not in url):
+                continue
+            limit = rule.get('limit')
+            if isinstance(limit, str):
+                limit = self.safe_float(lowercase, limit.lower())
+            if 'remaining' in rule:
+                remaining = self.safe_float(lowercase, rule['remaining'].lower())
+            else:
+                used = self.safe_float(lowercase, rule['used'].lower())
+                remaining = None if (used is None or limit is None) else limit - used
+            if remaining is None:
+                continue
+            reported.add(bucket)
+            reset = None
+            window = rule.get('window')
+            if 'resetTimestamp' in rule:
+                timestamp = self.safe_float(lowercase, rule['resetTimestamp'].lower())
+                if timestamp is not None:
+                    reset = max(timestamp - self.milliseconds(), 0)
+            elif window is not None:
+                # fixed windows aligned to the epoch
+                reset = window - self.milliseconds() % window
+            if rule.get('endpoint'):
+                # the header describes one endpoint only, it tells nothing about the
+                # shared bucket until that endpoint runs out
+                if remaining <= 0:
+                    result.append({'bucket': bucket, 'remaining': 0, 'reset': reset})
+                continue
+            cost = rule.get('cost')
+            if cost is None:
+                cost = 1
+                if window is not None and limit:
+                    # the whole window budget of the bucket maps onto the server limit
+                    cost = self.rate_limit_refill_rate(bucket) * window / limit
+            result.append({'bucket': bucket, 'remaining': remaining * cost, 'reset': reset})
+        return result
+
+    def handle_rate_limit_headers(self, url, code, headers, spent=None):
+        if not self.enableRateLimit:
+            return
+        for feedback in self.parse_rate_limit_headers(url, code, headers):
+            if feedback['remaining'] <= 0 and feedback['reset']:
+                until = self.milliseconds() + feedback['reset']
+                if feedback['bucket'] is None:
+                    self.rate_limit_backoff_until = max(self.rate_limit_backoff_until, until)
+                else:
+                    self.rate_limit_timestamps[feedback['bucket']] = max(self.rate_limit_timestamps.get(feedback['bucket'], 0), until)
+
     @staticmethod
     def gzip_deflate(response, text):
         encoding = response.info().get('Content-Encoding')
@@ -474,7 +641,7 @@ class Exchange(object):
             if encoding == 'deflate':
                 return zlib.decompress(text, -zlib.MAX_WBITS)
             else:
-                return gzip.GzipFile('', 'rb', 9, io.BytesIO(text)).read()
+                return gzip.decompress(text)
         return text
 
     def prepare_request_headers(self, headers=None):
@@ -505,9 +672,8 @@ class Exchange(object):
                 return orjson.loads(response_body)
             return json.loads(response_body)
 
-    def fetch(self, url, method='GET', headers=None, body=None):
-        """Perform a HTTP request and return decoded JSON data"""
-
+    def prepare_fetch(self, url, method='GET', headers=None, body=None):
+        """:returns tuple: the url, headers and proxies of the request, after the proxy settings"""
         # ##### PROXY & HEADERS #####
         request_headers = self.prepare_request_headers(headers)
         # proxy-url
@@ -541,7 +707,11 @@ class Exchange(object):
             self.log("\nfetch Request:", self.id, method, url, "RequestHeaders:", request_headers, "RequestBody:", body)
         self.logger.debug("%s %s, Request: %s %s", method, url, request_headers, body)
         # end of proxies & headers
+        return url, request_headers, proxies
 
+    def fetch(self, url, method='GET', headers=None, body=None):
+        """Perform a HTTP request and return decoded JSON data"""
+        url, request_headers, proxies = self.prepare_fetch(url, method, headers, body)
         request_body = body
         if body:
             body = body.encode()
@@ -567,6 +737,7 @@ class Exchange(object):
             headers = response.headers
             http_status_code = response.status_code
             http_status_text = response.reason
+            self.handle_rate_limit_headers(url, http_status_code, headers)
             http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, response.text, request_headers, request_body)
             json_response = self.parse_json(http_response)
             # FIXME remove last_x_responses from subclasses
@@ -635,6 +806,185 @@ class Exchange(object):
                 return response.content.decode('utf8')
             return response.content
 
+    def json_item_stream(self, items=[]):
+        if self.quoteJsonNumbers and orjson is None:
+            # the numbers as on_json_response decodes them
+            return JsonItemStream(items, str, str)
+        return JsonItemStream(items)
+
+    def check_item_stream(self, stream, code, reason, url, method, headers, request_headers, request_body):
+        # the errors in the fields of the response around the items
+        envelope = stream.envelope
+        if self.enableLastJsonResponse:
+            self.last_json_response = envelope
+        self.handle_errors(code, reason, url, method, headers, self.json(envelope), envelope, request_headers, request_body)
+
+    def fetch_items(self, url, method='GET', headers=None, body=None, items=[]):
+        """
+        a generator of the items of the array at the path items of the JSON response, decoded from the chunks of
+        the body as they are received, see JsonItemStream, the response without the items is checked with
+        handle_errors before the first item and kept as last_json_response
+        """
+        url, request_headers, proxies = self.prepare_fetch(url, method, headers, body)
+        request_body = body
+        if body:
+            body = body.encode()
+        self.session.cookies.clear()
+        stream = self.json_item_stream(items)
+        checked = False
+        response = None
+        try:
+            response = self.session.request(
+                method,
+                url,
+                data=body,
+                headers=request_headers,
+                timeout=(self.timeout / 1000),
+                proxies=proxies,
+                verify=self.verify and self.validateServerSsl,
+                stream=True
+            )
+            headers = response.headers
+            http_status_code = response.status_code
+            http_status_text = response.reason
+            self.handle_rate_limit_headers(url, http_status_code, headers)
+            if self.enableLastHttpResponse:
+                self.last_http_response = None
+            if self.enableLastResponseHeaders:
+                self.last_response_headers = headers
+            if http_status_code >= 400:
+                response.encoding = 'utf-8'
+                http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, response.text, request_headers, request_body)
+                json_response = self.parse_json(http_response)
+                self.handle_errors(http_status_code, http_status_text, url, method, headers, http_response, json_response, request_headers, request_body)
+                self.handle_http_status_code(http_status_code, http_status_text, url, method, http_response)
+                raise ExchangeError(' '.join([self.id, method, url, str(http_status_code), http_response]))
+            for chunk in response.iter_content(self.streamChunkSize):
+                try:
+                    parsed = stream.feed(chunk)
+                except ValueError as e:
+                    raise BadResponse(self.id + ' ' + method + ' ' + url + ' returned invalid JSON') from e
+                if stream.found and not checked:
+                    checked = True
+                    self.check_item_stream(stream, http_status_code, http_status_text, url, method, headers, request_headers, request_body)
+                yield from parsed
+            try:
+                parsed = stream.close()
+            except ValueError as e:
+                raise BadResponse(self.id + ' ' + method + ' ' + url + ' returned invalid JSON') from e
+            if not checked:
+                self.check_item_stream(stream, http_status_code, http_status_text, url, method, headers, request_headers, request_body)
+            yield from parsed
+            if self.verbose:
+                self.log("\nfetch Response:", self.id, method, url, http_status_code, "ResponseHeaders:", headers, "ResponseBody:", stream.envelope, "Items:", stream.count)
+
+        except Timeout as e:
+            details = ' '.join([self.id, method, url])
+            raise RequestTimeout(details) from e
+
+        except (requestsConnectionError, ConnectionResetError) as e:
+            details = ' '.join([self.id, method, url])
+            raise NetworkError(details) from e
+
+        except RequestException as e:  # base exception class
+            details = ' '.join([self.id, method, url])
+            raise ExchangeError(details) from e
+
+        finally:
+            if response is not None:
+                response.close()
+
+    def fetch2_items(self, path, api: Any = 'public', method='GET', params={}, headers: Any = None, body: Any = None, config={}, items=[]):
+        """
+        fetch2 for the responses too large to be decoded whole, a generator of the items of the array at the path
+        items of the response, e.g. fetch2_items('exchangeInfo', 'public', 'GET', {}, items=['symbols']), the
+        requests are not retried since the items may have been consumed already
+        """
+        if self.enableRateLimit:
+            cost = self.calculate_rate_limiter_cost(api, method, path, params, config)
+            self.throttle(cost)
+        self.lastRestRequestTimestamp = self.milliseconds()
+        request = self.sign(path, api, method, params, headers, body)
+        self.last_request_headers = request['headers']
+        self.last_request_body = request['body']
+        self.last_request_url = request['url']
+        yield from self.fetch_items(request['url'], request['method'], request['headers'], request['body'], items)
+
+    def parse_items(self, items, parse, *args):
+        """the generator of parse(item, *args) of each item of the generator items as it comes"""
+        for item in items:
+            yield parse(item, *args)
+
+    def parse_ohlcvs_columns(self, ohlcvs, market=None, timeframe='1m', since: Int = None, limit: Int = None, tail=False, arrayType='array'):
+        """
+        parse_ohlcvs into OHLCVColumns, the raw [timestamp, open, high, low, close, volume] lists of the exchanges
+        that do not override parse_ohlcv are read straight into the columns without the rows of parse_ohlcv
+        :param str arrayType: 'array' for array.array columns or 'numpy' for numpy arrays
+        :returns OHLCVColumns: the candles sorted by timestamp and filtered like parse_ohlcvs
+        """
+        columns = None
+        if type(self).parse_ohlcv is Exchange.parse_ohlcv:
+            try:
+                columns = OHLCVColumns.from_rows(ohlcvs, arrayType)
+            except (TypeError, ValueError, IndexError, KeyError):
+                # the values that are not plain numbers are left to parse_ohlcv
+                pass
+        if columns is None:
+            columns = OHLCVColumns.from_rows([self.parse_ohlcv(ohlcv, market) for ohlcv in ohlcvs], arrayType)
+        return columns.sort().filter_by_since_limit(since, limit, tail)
+
+    def fetch_ohlcv_array(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None, params={}):
+        """
+        fetch_ohlcv returning OHLCVColumns, the pages of the paginated calls are kept as columns until they are concatenated
+        :param dict [params]: the params of fetch_ohlcv, arrayType 'array' (default) or 'numpy', also options['fetchOHLCVArray']['arrayType']
+        :returns OHLCVColumns: the candles as int64 timestamps and float64 open, high, low, close and volume columns
+        """
+        arrayType, params = self.handle_option_and_params(params, 'fetchOHLCVArray', 'arrayType', 'array')
+        OHLCVColumns(None, arrayType)  # raises NotSupported for the unknown array types and for numpy if it is not installed
+        pages = []
+        token = ohlcv_array_type.set(arrayType)
+        pagesToken = ohlcv_pages.set(pages)
+        try:
+            ohlcvs = self.fetch_ohlcv(symbol, timeframe, since, limit, params)
+        finally:
+            ohlcv_pages.reset(pagesToken)
+            ohlcv_array_type.reset(token)
+        if pages:
+            # the pages of the paginated call, concatenated as columns in the order of their since
+            pages.sort(key=lambda page: page[0])
+            return OHLCVColumns.concat([page[1] for page in pages], arrayType).filter_by_since_limit(since, limit)
+        return OHLCVColumns.from_rows(ohlcvs, arrayType)
+
+    def build_ohlcvc_columns(self, timestamps, prices, amounts, timeframe='1m', since=0, limit=2147483647, arrayType='array'):
+        """
+        build_ohlcvc over the columns of trades sorted by timestamp, with a grouped reduction per candle
+        :param [int] timestamps: the timestamps of the trades, with their prices and amounts in the same order
+        :param str arrayType: 'array' for array.array columns or 'numpy' for numpy arrays
+        :returns OHLCVColumns: the candles of build_ohlcvc as columns, with the count column
+        """
+        options = self.safe_dict(self.options, 'buildOHLCVC', {})
+        skipZeroPrices = self.safe_bool(options, 'skipZeroPrices', True)
+        return build_ohlcvc_columns(timestamps, prices, amounts, self.parse_timeframe(timeframe) * 1000, since, limit, skipZeroPrices, arrayType)
+
+    def ohlcvc_builder(self, timeframe='1m', since=0):
+        """
+        :returns OHLCVCBuilder: the candles built incrementally from the trades passed to its update, update_trades or
+        update_from_cache(self.trades[symbol]) methods, only the last candle is updated by the new trades
+        """
+        options = self.safe_dict(self.options, 'buildOHLCVC', {})
+        skipZeroPrices = self.safe_bool(options, 'skipZeroPrices', True)
+        return OHLCVCBuilder(self.parse_timeframe(timeframe) * 1000, since, skipZeroPrices)
+
+    def safe_deterministic_page(self, method, symbol: Str = None, since: Int = None, limit: Int = None, timeframe: Str = None, params={}):
+        # safe_deterministic_call, the pages of the paginated calls of fetch_ohlcv_array are collected as columns
+        # instead of being returned to fetch_paginated_call_deterministic to be concatenated as rows
+        pages = ohlcv_pages.get()
+        page = Exchange.safe_deterministic_call(self, method, symbol, since, limit, timeframe, params)
+        if pages is None or method != 'fetchOHLCV':
+            return page
+        pages.append((since, OHLCVColumns.from_rows(page, ohlcv_array_type.get())))
+        return []
+
     def parse_json(self, http_response):
         try:
             if Exchange.is_json_encoded_object(http_response):
@@ -938,6 +1288,21 @@ class Exchange(object):
                 result = arg
         return result
 
+    @staticmethod
+    def deep_extend_dicts(base, update):
+        # deep_extend(base, update) for two dicts, without a call per leaf
+        result = dict(base)
+        for key, value in base.items():
+            if isinstance(value, dict) and key not in update:
+                result[key] = Exchange.deep_extend_dicts(value, {})
+        for key, value in update.items():
+            if isinstance(value, dict):
+                current = result.get(key)
+                result[key] = Exchange.deep_extend_dicts(current if isinstance(current, dict) else {}, value)
+            else:
+                result[key] = value
+        return result
+
     @staticmethod
     def filter_by(array, key, value=None):
         array = Exchange.to_array(array)
@@ -1545,6 +1910,343 @@ class Exchange(object):
     def safe_map_to_map(self, dictionary):
         return dictionary  # wrapper for go
 
+    def markets_by(self, key, value):
+        """
+        returns the markets having value under key, like filter_by over the markets but
+        through an index that is built on first use for every set of markets
+        :param str key: a market key, e.g. 'base', 'quote', 'type', 'settle' or 'expiry'
+        :param value: the value to look up
+        :returns dict[]: the matching markets, in the order of self.markets
+        """
+        markets = self.markets or {}
+        # rebuilt for new markets and for markets added in place
+        if self.markets_indexes_source is not markets or self.markets_indexes['length'] != len(markets):
+            self.markets_indexes = {'length': len(markets)}
+            self.markets_indexes_source = markets
+        index = self.markets_indexes.get('by_' + key)
+        if index is None:
+            index = {}
+            for market in markets.values():
+                index.setdefault(market.get(key), []).append(market)
+            self.markets_indexes['by_' + key] = index
+        return list(index.get(value, []))
+
+    def market_formatters(self, market):
+        """
+        the decimal_to_precision of the price, amount, cost and fee of market, compiled once per precision and
+        mode, see precision_formatter, they are rebuilt if the precision of the market changes
+        :param dict market: a market
+        :returns dict: {'price': formatter, 'amount': formatter, 'cost': formatter, 'fee': formatter}
+        """
+        precision = market['precision']
+        formatters = self.precision_formatters.get(market['symbol'])
+        if formatters is None or formatters['precision'] != (precision['price'], precision['amount'], self.precisionMode, self.paddingMode):
+            formatters = {
+                'precision': (precision['price'], precision['amount'], self.precisionMode, self.paddingMode),
+                'price': precision_formatter(ROUND, precision['price'], self.precisionMode, self.paddingMode),
+                'amount': precision_formatter(TRUNCATE, precision['amount'], self.precisionMode, self.paddingMode),
+                'cost': precision_formatter(TRUNCATE, precision['price'], self.precisionMode, self.paddingMode),
+                'fee': precision_formatter(ROUND, precision['price'], self.precisionMode, self.paddingMode),
+            }
+            self.precision_formatters[market['symbol']] = formatters
+        return formatters
+
+    def set_precision_formatters(self, markets):
+        self.precision_formatters = {}
+        for market in markets:
+            precision = market.get('precision')
+            if market.get('symbol') is not None and isinstance(precision, dict) and 'price' in precision and 'amount' in precision:
+                self.market_formatters(market)
+
+    def prices_to_precision(self, symbol: str, prices):
+        """
+        price_to_precision of every price, for the prices of many orders of a market at once
+        :param str symbol: unified market symbol
+        :param float[]|str[] prices: the prices
+        :returns str[]: the rounded prices, None for None
+        """
+        market = self.market(symbol)
+        formatter = self.market_formatters(market)['price']
+        results = [None if price is None else formatter(price) for price in prices]
+        if '0' in results:
+            raise InvalidOrder(self.id + ' price of ' + market['symbol'] + ' must be greater than minimum price precision of ' + self.number_to_string(market['precision']['price']))
+        return results
+
+    def amounts_to_precision(self, symbol: str, amounts):
+        """
+        amount_to_precision of every amount, for the amounts of many orders of a market at once
+        :param str symbol: unified market symbol
+        :param float[]|str[] amounts: the amounts
+        :returns str[]: the truncated amounts, None for None
+        """
+        market = self.market(symbol)
+        formatter = self.market_formatters(market)['amount']
+        results = [None if amount is None else formatter(amount) for amount in amounts]
+        if '0' in results:
+            raise InvalidOrder(self.id + ' amount of ' + market['symbol'] + ' must be greater than minimum amount precision of ' + self.number_to_string(market['precision']['amount']))
+        return results
+
+    def add_markets_listener(self, callback):
+        """
+        calls callback(changes) after every incremental reload that listed, delisted or changed markets, see update_markets
+        """
+        self.markets_listeners.append(callback)
+
+    def remove_markets_listener(self, callback):
+        if callback in self.markets_listeners:
+            self.markets_listeners.remove(callback)
+
+    def set_markets_fast(self, markets, currencies=None):
+        """
+        set_markets with the defaults of the markets merged once and only the currencies that end up in the
+        result built, the markets, symbols, ids and currencies are the same as the ones of set_markets
+        """
+        values, self.markets_by_id = self.build_markets(markets)
+        self.markets = self.map_to_safe_map(self.index_by(values, 'symbol'))
+        self.symbols = sorted(self.markets.keys())
+        self.ids = sorted(self.markets_by_id.keys())
+        self.set_markets_currencies(values, currencies)
+        self.set_precision_formatters(values)
+        return self.markets
+
+    def build_markets(self, markets, previous=None):
+        """
+        :param dict|dict[] markets: the markets as returned by fetch_markets
+        :param dict [previous]: (raw market, market) by symbol, the markets whose raw market did not change are reused as is
+        :returns [dict[], dict]: the markets, spot markets first, and the raw markets by id
+        """
+        values = []
+        marketsById = self.create_safe_dictionary()
+        # handle marketId conflicts
+        # we insert spot markets first
+        marketValues = self.sort_by(self.to_array(markets), 'spot', True, True)
+        # the defaults are merged once, every market is merged on top of them
+        template = self.deep_extend(self.safe_market_structure(), {
+            'precision': self.precision,
+            'limits': self.limits,
+        }, self.fees['trading'])
+        for value in marketValues:
+            marketsByIdArray = marketsById.get(value['id'])
+            if marketsByIdArray is None:
+                marketsById[value['id']] = [value]
+            else:
+                marketsByIdArray.append(value)
+            if previous is not None:
+                entry = previous.get(value.get('symbol'))
+                if entry is not None and entry[0] == value:
+                    values.append(entry[1])
+                    continue
+            market = self.deep_extend_dicts(template, value)
+            if market['linear']:
+                market['subType'] = 'linear'
+            elif market['inverse']:
+                market['subType'] = 'inverse'
+            else:
+                market['subType'] = None
+            values.append(market)
+        return [values, marketsById]
+
+    def set_markets_currencies(self, values, currencies=None):
+        numCurrencies = 0
+        if currencies is not None:
+            keys = list(currencies.keys())
+            numCurrencies = len(keys)
+        if numCurrencies > 0:
+            # currencies is always None when called in constructor but not when called from loadMarkets
+            self.currencies = self.map_to_safe_map(self.deep_extend(self.currencies, currencies))
+        else:
+            # the markets of every base and quote code, in order, only the currencies
+            # that end up in the result are built
+            defaultCurrencyPrecision = 8 if (self.precisionMode == DECIMAL_PLACES) else self.parse_number('1e-8')
+            entries = {'base': {}, 'quote': {}}
+            for market in values:
+                marketPrecision = self.safe_dict(market, 'precision', {})
+                for side, precisionKey in (('base', 'amount'), ('quote', 'price')):
+                    if side in market:
+                        code = self.safe_string(market, side)
+                        if code is not None:
+                            precision = self.safe_value_2(marketPrecision, side, precisionKey, defaultCurrencyPrecision)
+                            entries[side].setdefault(code, []).append((market, precision))
+            baseCodes = sorted(entries['base'].keys())
+            quoteCodes = sorted(entries['quote'].keys())
+            self.baseCurrencies = self.map_to_safe_map({code: self.market_currency_structure('base', *entries['base'][code][-1]) for code in baseCodes})
+            self.quoteCurrencies = self.map_to_safe_map({code: self.market_currency_structure('quote', *entries['quote'][code][-1]) for code in quoteCodes})
+            resultingCurrencies = {}
+            for code in sorted(set(baseCodes).union(quoteCodes)):
+                candidates = [('base',) + entry for entry in entries['base'].get(code, [])] + [('quote',) + entry for entry in entries['quote'].get(code, [])]
+                highestPrecisionCurrency = candidates[0]
+                for j in range(1, len(candidates)):
+                    currentCurrency = candidates[j]
+                    if self.precisionMode == TICK_SIZE:
+                        highestPrecisionCurrency = currentCurrency if (currentCurrency[2] < highestPrecisionCurrency[2]) else highestPrecisionCurrency
+                    else:
+                        highestPrecisionCurrency = currentCurrency if (currentCurrency[2] > highestPrecisionCurrency[2]) else highestPrecisionCurrency
+                resultingCurrencies[code] = self.market_currency_structure(*highestPrecisionCurrency)
+            self.currencies = self.map_to_safe_map(self.deep_extend(self.currencies, resultingCurrencies))
+        self.currencies_by_id = self.index_by_safe(self.currencies, 'id')
+        self.codes = sorted(self.currencies.keys())
+
+    def market_currency_structure(self, side, market, precision):
+        return self.safe_currency_structure({
+            'id': self.safe_string_2(market, side + 'Id', side),
+            'numericId': self.safe_integer(market, side + 'NumericId'),
+            'code': self.safe_string(market, side),
+            'precision': precision,
+        })
+
+    def update_markets(self, markets, currencies=None):
+        """
+        like set_markets, but diffs the markets against the loaded ones and updates the loaded
+        markets, currencies and their containers in place, so that the references held elsewhere
+        stay valid, the markets whose raw market did not change are not rebuilt
+        :param dict|dict[] markets: the markets as returned by fetch_markets
+        :param dict [currencies]: the currencies as returned by fetch_currencies
+        :returns dict: the markets
+        """
+        if not self.markets or not self.markets_by_id or type(self).set_markets is not Exchange.set_markets:
+            # the exchanges overriding set_markets are reloaded through it
+            return self.set_markets(markets, currencies)
+        previousMarkets = self.markets
+        previous = {}
+        for raws in self.markets_by_id.values():
+            for raw in raws:
+                market = previousMarkets.get(raw.get('symbol'))
+                if market is not None:
+                    previous[raw['symbol']] = (raw, market)
+        values, marketsById = self.build_markets(markets, previous)
+        listed = []
+        changed = {}
+        result = {}
+        for market in values:
+            symbol = market['symbol']
+            current = previousMarkets.get(symbol)
+            if current is None:
+                listed.append(symbol)
+            elif current is not market:
+                keys = [key for key in sorted(set(current).union(market)) if key != 'info' and current.get(key) != market.get(key)]
+                if keys:
+                    changed[symbol] = keys
+                self.replace_in_place(current, market)
+                market = current
+            result[symbol] = market
+        delisted = [symbol for symbol in previousMarkets if symbol not in result]
+        self.replace_in_place(previousMarkets, result)
+        self.replace_in_place(self.markets_by_id, marketsById)
+        self.symbols[:] = sorted(result.keys())
+        self.ids[:] = sorted(marketsById.keys())
+        previousCurrencies = {
+            'currencies': self.currencies,
+            'baseCurrencies': self.baseCurrencies,
+            'quoteCurrencies': self.quoteCurrencies,
+        }
+        codes = self.codes
+        self.set_markets_currencies(values, currencies)
+        for key, container in previousCurrencies.items():
+            current = getattr(self, key)
+            if container is None or container is current:
+                continue
+            for code, currency in current.items():
+                if isinstance(container.get(code), dict) and container[code] is not currency:
+                    current[code] = self.replace_in_place(container[code], currency)
+            setattr(self, key, self.replace_in_place(container, current))
+        self.currencies_by_id = self.index_by_safe(self.currencies, 'id')
+        if codes is not None:
+            codes[:] = self.codes
+            self.codes = codes
+        # the markets are updated in place, the indexes of markets_by are rebuilt on next use
+        self.markets_indexes_source = None
+        if listed or delisted or changed:
+            changes = {
+                'timestamp': self.milliseconds(),
+                'listed': listed,
+                'delisted': delisted,
+                'changed': changed,
+            }
+            for callback in list(self.markets_listeners):
+                try:
+                    callback(changes)
+                except Exception as e:
+                    self.logger.warning('%s markets listener failed: %s', self.id, e)
+        return self.markets
+
+    @staticmethod
+    def replace_in_place(target, source):
+        if target is not source:
+            target.clear()
+            target.update(source)
+        return target
+
+    def get_markets_cache(self):
+        cache = self.marketsCache
+        if cache is None or isinstance(cache, MarketCache):
+            return cache
+        type = self.safe_string(cache, 'type', 'memory')
+        if type == 'memory':
+            return MemoryMarketCache()
+        elif type == 'file':
+            return FileMarketCache(self.safe_string(cache, 'path'))
+        raise NotSupported(self.id + ' marketsCache type ' + type + ' is not supported, use memory or file')
+
+    def get_markets_cache_option(self, key, default_value=None):
+        return self.safe_value(self.marketsCache, key, default_value) if isinstance(self.marketsCache, dict) else default_value
+
+    def get_markets_cache_key(self):
+        key = self.get_markets_cache_option('key')
+        if key is None:
+            key = self.id + (':sandbox' if self.isSandboxModeEnabled else '')
+        return key
+
+    def get_cached_markets(self):
+        """
+        :returns dict|None: the cached markets entry, with a 'stale' flag set once it is older than the ttl
+        """
+        cache = self.get_markets_cache()
+        if cache is None:
+            return None
+        entry = cache.get(self.get_markets_cache_key())
+        if entry is None:
+            return None
+        ttl = self.get_markets_cache_option('ttl', 3600000)
+        entry = self.extend(entry)
+        entry['stale'] = self.milliseconds() - entry['timestamp'] > ttl
+        return entry
+
+    def cache_markets(self):
+        cache = self.get_markets_cache()
+        if cache is None or not self.markets:
+            return
+        helpers = self.safe_list(self.options, 'marketHelperProps', [])
+        options = {'marketHelperProps': helpers}
+        for i in range(0, len(helpers)):
+            options[helpers[i]] = self.safe_value(self.options, helpers[i])
+        cache.set(self.get_markets_cache_key(), {
+            'timestamp': self.milliseconds(),
+            'markets': self.markets,
+            'markets_by_id': self.markets_by_id,
+            'symbols': self.symbols,
+            'ids': self.ids,
+            'currencies': self.currencies,
+            'baseCurrencies': self.baseCurrencies,
+            'quoteCurrencies': self.quoteCurrencies,
+            'codes': self.codes,
+            'options': options,
+        })
+
+    def set_markets_from_cache(self, entry=None):
+        """
+        sets the markets from the cache without fetching nor rebuilding them
+        :param dict [entry]: a cached entry, read from marketsCache by default
+        :returns dict|None: the markets, None if nothing is cached
+        """
+        if entry is None:
+            entry = self.get_cached_markets()
+            if entry is None:
+                return None
+        source = types.SimpleNamespace(id=self.id, **{key: value for key, value in entry.items() if key not in ('timestamp', 'stale')})
+        self.set_markets_from_exchange(source)
+        self.currencies_by_id = self.index_by_safe(self.currencies, 'id')
+        return self.markets
+
     def load_markets(self, reload=False, params={}):
         """
         Loads and prepares the markets for trading.
@@ -1570,6 +2272,9 @@ class Exchange(object):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+            cached = self.get_cached_markets()
+            if cached is not None and not cached['stale']:
+                return self.set_markets_from_cache(cached)
         currencies = None
         if self.has['fetchCurrencies'] is True:
             currencies = self.fetch_currencies()
@@ -1577,7 +2282,12 @@ class Exchange(object):
         markets = self.fetch_markets(params)
         if 'cachedCurrencies' in self.options:
             del self.options['cachedCurrencies']
-        return self.set_markets(markets, currencies)
+        if self.incrementalMarketsReload:
+            result = self.update_markets(markets, currencies)
+        else:
+            result = self.set_markets(markets, currencies)
+        self.cache_markets()
+        return result
 
     def fetch_markets(self, params={}):
         # markets are returned as a list
@@ -2354,6 +3064,12 @@ class Exchange(object):
             bidAsk = self.parse_bid_ask(deltas[i], priceKey, amountKey, countOrIdKey)
             bookSide.storeArray(bidAsk)
 
+    def handle_bid_ask_deltas(self, bookSide: Any, deltas, priceKey: IndexType = 0, amountKey: IndexType = 1):
+        # the price and amount deltas of a message, python applies them to the side in a single batch
+        for i in range(0, len(deltas)):
+            delta = deltas[i]
+            bookSide.store(self.safe_number(delta, priceKey), self.safe_number(delta, amountKey))
+
     def get_cache_index(self, orderbook, deltas):
         # return the first index of the cache that can be applied to the orderbook or -1 if not possible
         return -1
@@ -2506,6 +3222,23 @@ class Exchange(object):
                 result.append(messageHash)
         return result
 
+    def message_handlers(self):
+        # the routing tables of handleMessage, { table: { key: name of the handler method }}
+        return {}
+
+    def message_handler(self, table: str, key: Str, find: bool = False):
+        # the name of the method handling the messages with key in a table of messageHandlers
+        # with find and no exact key, the first key of the table contained in key routes the message
+        handlers = self.safe_dict(self.message_handlers(), table, {})
+        handler = self.safe_string(handlers, key)
+        if (handler is not None) or not find or (key is None):
+            return handler
+        keys = list(handlers.keys())
+        for i in range(0, len(keys)):
+            if key.find(keys[i]) >= 0:
+                return handlers[keys[i]]
+        return None
+
     def filter_by_limit(self, array: List[object], limit: Int = None, key: IndexType = 'timestamp', fromStart: bool = False):
         if self.value_is_defined(limit):
             arrayLength = len(array)
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import contextvars
+import functools
+import inspect
+import time
+
+from ccxt.base.errors import NotSupported
+
+otel_metrics = None
+try:
+    from opentelemetry import metrics as otel_metrics
+except ImportError:
+    pass
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'Histogram',
+    'Instrumentation',
+    'OpenTelemetryExporter',
+]
+
+# the time spent in requests by the unified method being called, see Instrumentation.instrument
+request_time = contextvars.ContextVar('ccxt_request_time', default=None)
+# the labels of the request being made and the time spent decoding its response
+current_request = contextvars.ContextVar('ccxt_current_request', default=None)
+
+
+def now():
+    return time.perf_counter() * 1000
+
+
+class Histogram(object):
+    """the count, sum, min, max and bucket counts of the values recorded, in ms for the durations"""
+
+    buckets = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def record(self, value):
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+
+    def percentile(self, q):
+        # the upper bound of the bucket of the q-th value, the max for the last bucket
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+        }
+
+
+class Instrumentation(object):
+    """
+    the opt-in metrics of an exchange, set with {'instrumentation': True} or an Instrumentation shared by exchanges
+
+        rest.throttle, rest.sign, rest.network, rest.decode, rest.request  {exchange, api, path}  ms
+        method.request, method.parse                                       {exchange, method}     ms
+        ws.messages                                                        {exchange, url}        count
+        ws.handle                                                          {exchange, url}        ms
+        ws.decode                                                          {url}                  ms
+        ws.handler                                                         {exchange, table, key} ms
+        ws.reconnects, ws.gap                                              {exchange, url}        count, ms
+        throttler.queue                                                    {exchange, bucket}     gauge
+
+    every value is also passed to the listeners, listener(kind, name, value, labels) with the kind
+    'histogram', 'counter' or 'gauge', e.g. to export them with OpenTelemetryExporter
+    """
+
+    # the unified methods timed by instrument, the time outside of their requests is method.parse
+    methods = [
+        'fetch_ticker', 'fetch_tickers', 'fetch_order_book', 'fetch_trades', 'fetch_ohlcv', 'fetch_balance',
+        'fetch_order', 'fetch_orders', 'fetch_open_orders', 'fetch_closed_orders', 'fetch_my_trades',
+        'fetch_positions', 'fetch_funding_rate', 'fetch_funding_rates', 'fetch_markets', 'fetch_currencies',
+        'create_order', 'edit_order', 'cancel_order', 'cancel_all_orders',
+    ]
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.listeners = []
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    @staticmethod
+    def key(name, labels):
+        return (name, tuple(sorted(labels.items())))
+
+    def record(self, name, value, labels):
+        key = self.key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = Histogram()
+            self.histograms[key] = histogram
+        histogram.record(value)
+        for listener in self.listeners:
+            listener('histogram', name, value, labels)
+
+    def increment(self, name, labels, value=1):
+        key = self.key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+        for listener in self.listeners:
+            listener('counter', name, value, labels)
+
+    def gauge(self, name, value, labels):
+        self.gauges[self.key(name, labels)] = value
+        for listener in self.listeners:
+            listener('gauge', name, value, labels)
+
+    def snapshot(self):
+        """
+        :returns dict: {'histograms': [...], 'counters': [...], 'gauges': [...]}, every entry has the name, labels and values of a metric
+        """
+        return {
+            'histograms': [{'name': name, 'labels': dict(labels), **histogram.to_dict()} for (name, labels), histogram in self.histograms.items()],
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in self.counters.items()],
+            'gauges': [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in self.gauges.items()],
+        }
+
+    def reset(self):
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+
+    def add_request_time(self, elapsed):
+        spent = request_time.get()
+        if spent is not None:
+            spent[0] += elapsed
+
+    def method_labels(self, exchange, name):
+        labels = {'exchange': exchange.id, 'method': name}
+
+        def before(*args):
+            return (request_time.set([0]), labels)
+
+        def after(elapsed, state):
+            token, labels = state
+            spent = request_time.get()[0]
+            request_time.reset(token)
+            # the requests of a unified method called by another one are requests of both
+            self.add_request_time(spent)
+            self.record('method.request', spent, labels)
+            self.record('method.parse', elapsed - spent, labels)
+
+        return before, after
+
+    def timed_handler(self, handler, labels, name='ws.handle', messages=None):
+        """handler(client, message) recording its time as name, and counting the messages as messages"""
+        def before(*args):
+            if messages is not None:
+                self.increment(messages, labels)
+
+        return timed(handler, before, lambda elapsed, state: self.record(name, elapsed, labels))
+
+    def instrument(self, exchange):
+        """
+        replaces the methods of the REST pipeline and the unified methods of exchange with timed ones,
+        only on the instance, the exchanges without instrumentation run the methods of their class
+        """
+        exchange_id = exchange.id
+
+        def request_before(path=None, api='public', *args):
+            labels = {'exchange': exchange_id, 'api': '/'.join(api) if isinstance(api, list) else str(api), 'path': path}
+            return (current_request.set({'labels': labels, 'decode': 0}), labels)
+
+        def request_after(elapsed, state):
+            token, labels = state
+            current_request.reset(token)
+            self.add_request_time(elapsed)
+            self.record('rest.request', elapsed, labels)
+
+        def throttle_before(*args):
+            throttler = getattr(exchange, 'throttler', None)
+            if throttler is not None and hasattr(throttler, 'queue'):
+                self.gauge('throttler.queue', len(throttler.queue), {'exchange': exchange_id, 'bucket': 'default'})
+                for name, bucket in getattr(exchange, 'throttlers', {}).items():
+                    self.gauge('throttler.queue', len(bucket.queue), {'exchange': exchange_id, 'bucket': name})
+            return current_request.get()
+
+        def stage_after(name):
+            def after(elapsed, state):
+                if state is not None:
+                    self.record(name, elapsed, state['labels'])
+            return after
+
+        def fetch_before(*args):
+            state = current_request.get()
+            if state is not None:
+                state['decode'] = 0
+            return state
+
+        def fetch_after(elapsed, state):
+            if state is not None:
+                self.record('rest.network', elapsed - state['decode'], state['labels'])
+                self.record('rest.decode', state['decode'], state['labels'])
+
+        def decode_after(elapsed, state):
+            if state is not None:
+                state['decode'] += elapsed
+
+        stages = {
+            'fetch2': (request_before, request_after),
+            'throttle': (throttle_before, stage_after('rest.throttle')),
+            'sign': (lambda *args: current_request.get(), stage_after('rest.sign')),
+            'fetch': (fetch_before, fetch_after),
+            'parse_json': (lambda *args: current_request.get(), decode_after),
+        }
+        for name, (before, after) in stages.items():
+            setattr(exchange, name, timed(getattr(exchange, name), before, after))
+        for name in self.methods:
+            if hasattr(exchange, name):
+                before, after = self.method_labels(exchange, name)
+                method = timed(getattr(exchange, name), before, after)
+                setattr(exchange, name, method)
+                setattr(exchange, camelcase(name), method)
+
+
+def camelcase(name):
+    parts = name.split('_')
+    return parts[0] + ''.join('OHLCV' if part == 'ohlcv' else part.capitalize() for part in parts[1:])
+
+
+def timed(method, before, after):
+    """method calling before(*args) first and after(elapsed ms, what before returned) once it returns or raises"""
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def timed_method(*args, **kwargs):
+            state = before(*args)
+            started = now()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                after(now() - started, state)
+    else:
+        @functools.wraps(method)
+        def timed_method(*args, **kwargs):
+            state = before(*args)
+            started = now()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                after(now() - started, state)
+    return timed_method
+
+
+class OpenTelemetryExporter(object):
+    """
+    a listener of Instrumentation that records the metrics with the OpenTelemetry instruments of meter, the
+    names are prefixed with ccxt., it needs the opentelemetry-api package
+    """
+
+    def __init__(self, meter=None):
+        if otel_metrics is None:
+            raise NotSupported('OpenTelemetryExporter requires opentelemetry, please install it with `pip install opentelemetry-api`')
+        self.meter = otel_metrics.get_meter('ccxt') if meter is None else meter
+        self.instruments = {}
+        self.gauges = {}
+
+    def instrument(self, kind, name):
+        instrument = self.instruments.get(name)
+        if instrument is None:
+            if kind == 'histogram':
+                instrument = self.meter.create_histogram('ccxt.' + name, unit='ms')
+            elif kind == 'counter':
+                instrument = self.meter.create_counter('ccxt.' + name)
+            else:
+                instrument = self.meter.create_up_down_counter('ccxt.' + name)
+            self.instruments[name] = instrument
+        return instrument
+
+    def __call__(self, kind, name, value, labels):
+        instrument = self.instrument(kind, name)
+        if kind == 'histogram':
+            instrument.record(value, labels)
+        elif kind == 'counter':
+            instrument.add(value, labels)
+        else:
+            # the change of the gauge since its last value
+            key = Instrumentation.key(name, labels)
+            instrument.add(value - self.gauges.get(key, 0), labels)
+            self.gauges[key] = value
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+import codecs
+import json
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'JsonItemStream',
+]
+
+
+class Incomplete(Exception):
+    """the value at the position goes on in the chunks not fed yet"""
+    pass
+
+
+class JsonItemStream(object):
+    """
+    parses a JSON document fed in chunks of bytes and returns the items of the array at path as soon as they
+    are complete, e.g. JsonItemStream(['symbols']) for {"timezone": "UTC", "symbols": [{...}, {...}]} returns
+    each symbol, the entries of an object at path are returned as (key, value) tuples
+
+    the rest of the document is kept in envelope with an empty array or object in place of the items, the
+    body is never held whole, only the part of it that was not parsed yet
+    """
+
+    whitespace = ' \t\n\r'
+    delimiters = whitespace + ',]}'
+    number_start = '-0123456789'
+
+    def __init__(self, path=[], parse_float=None, parse_int=None):
+        self.path = list(path)
+        self.decoder = json.JSONDecoder(parse_float=parse_float, parse_int=parse_int)
+        self.text = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.buffer = ''
+        self.position = 0
+        self.ended = False
+        self.envelope = None
+        # the objects entered on the way to the items
+        self.stack = []
+        self.key = None
+        # value, members, items, entries or end
+        self.state = 'value'
+        # the items have started, there are no more of them
+        self.found = False
+        self.done = False
+        self.count = 0
+
+    def feed(self, chunk):
+        """:returns list: the items completed by chunk"""
+        self.buffer += self.text.decode(chunk)
+        return self.parse()
+
+    def close(self):
+        """:returns list: the last items, raises ValueError if the document is not complete"""
+        self.buffer += self.text.decode(b'', True)
+        self.ended = True
+        items = self.parse()
+        if self.state != 'end':
+            raise ValueError('incomplete JSON document')
+        return items
+
+    def parse(self):
+        items = []
+        try:
+            while self.state != 'end':
+                self.step(items)
+        except Incomplete:
+            if self.ended:
+                raise ValueError('incomplete JSON document')
+        self.buffer = self.buffer[self.position:]
+        self.position = 0
+        return items
+
+    def skip(self, position):
+        buffer = self.buffer
+        length = len(buffer)
+        while position < length and buffer[position] in self.whitespace:
+            position += 1
+        if position == length:
+            raise Incomplete()
+        return position
+
+    def decode(self, position):
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, position)
+        except json.JSONDecodeError:
+            if self.ended:
+                raise
+            raise Incomplete()
+        if not self.ended and self.buffer[position] in self.number_start and (end == len(self.buffer) or self.buffer[end] not in self.delimiters):
+            # a number goes on in the next chunk unless a delimiter follows it, 12345. | 678 or 1.5 | e-7
+            raise Incomplete()
+        return value, end
+
+    def decode_key(self, position):
+        if self.buffer[position] != '"':
+            raise ValueError('expecting a property name at ' + str(position))
+        key, position = self.decode(position)
+        position = self.skip(position)
+        if self.buffer[position] != ':':
+            raise ValueError('expecting : at ' + str(position))
+        return key, self.skip(position + 1)
+
+    def place(self, value):
+        if self.stack:
+            self.stack[-1][self.key] = value
+        else:
+            self.envelope = value
+
+    def close_value(self):
+        self.state = 'members' if self.stack else 'end'
+
+    def step(self, items):
+        position = self.skip(self.position)
+        char = self.buffer[position]
+        state = self.state
+        if state == 'value':
+            target = len(self.stack) == len(self.path)
+            if target and (char == '[' or char == '{'):
+                self.place([] if char == '[' else {})
+                self.state = 'items' if char == '[' else 'entries'
+                self.found = True
+                position += 1
+            elif not target and char == '{':
+                value = {}
+                self.place(value)
+                self.stack.append(value)
+                self.state = 'members'
+                position += 1
+            else:
+                # not on the path, the items are not in the document
+                value, position = self.decode(position)
+                self.place(value)
+                self.done = True
+                self.close_value()
+        elif state == 'members':
+            if char == '}':
+                # the keys that follow in the parent objects are past the path
+                self.stack.pop()
+                self.done = True
+                self.close_value()
+                position += 1
+            elif char == ',':
+                position += 1
+            else:
+                key, position = self.decode_key(position)
+                if not self.done and key == self.path[len(self.stack) - 1]:
+                    self.key = key
+                    self.state = 'value'
+                else:
+                    value, position = self.decode(position)
+                    self.stack[-1][key] = value
+        elif (char == ']' and state == 'items') or (char == '}' and state == 'entries'):
+            self.done = True
+            self.close_value()
+            position += 1
+        elif char == ',':
+            position += 1
+        elif state == 'items':
+            item, position = self.decode(position)
+            items.append(item)
+            self.count += 1
+        else:
+            key, position = self.decode_key(position)
+            value, position = self.decode(position)
+            items.append((key, value))
+            self.count += 1
+        self.position = position
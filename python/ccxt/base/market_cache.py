@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import abc
+import marshal
+import os
+import re
+import stat
+import sys
+import tempfile
+import zlib
+
+
+class MarketCache(abc.ABC):
+    """stores loaded markets by key, see Exchange.marketsCache"""
+
+    @abc.abstractmethod
+    def get(self, key):
+        pass
+
+    @abc.abstractmethod
+    def set(self, key, entry):
+        pass
+
+
+class MemoryMarketCache(MarketCache):
+    """keeps the markets in memory, shared by every exchange instance in the process"""
+
+    entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, entry):
+        self.entries[key] = entry
+
+
+class FileMarketCache(MarketCache):
+    """
+    keeps the markets in a compressed marshal file per key, the marshal format depends on the
+    python version so the files written by another version are ignored, the default directory
+    belongs to the current user, on posix the directory and the files that are not owned by the
+    current user or are writable by others are ignored since marshal.loads trusts its input
+    """
+
+    header = ('ccxt-markets:%d:%d.%d\n' % ((marshal.version,) + sys.version_info[:2])).encode()
+
+    def __init__(self, path=None):
+        if path is None:
+            # the temporary directory is shared by every user, the markets go to a directory of the current user in it
+            path = os.path.join(tempfile.gettempdir(), 'ccxt-markets' + ('-' + str(os.getuid()) if hasattr(os, 'getuid') else ''))
+        self.path = path
+
+    @staticmethod
+    def trusted(status):
+        if not hasattr(os, 'getuid'):
+            return True
+        return status.st_uid == os.getuid() and not (status.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+
+    def filename(self, key):
+        return os.path.join(self.path, re.sub(r'[^\w.-]', '_', key) + '.bin')
+
+    def get(self, key):
+        try:
+            if not self.trusted(os.stat(self.path)):
+                return None
+            with open(self.filename(key), 'rb') as file:
+                if not self.trusted(os.fstat(file.fileno())):
+                    return None
+                data = file.read()
+        except OSError:
+            return None
+        if not data.startswith(self.header):
+            return None
+        try:
+            return marshal.loads(zlib.decompress(data[len(self.header):]))
+        except (ValueError, EOFError, TypeError, zlib.error):
+            return None
+
+    def set(self, key, entry):
+        try:
+            data = self.header + zlib.compress(marshal.dumps(entry), 1)
+        except ValueError:
+            # unmarshallable values like Decimal are not cached
+            return
+        os.makedirs(self.path, 0o700, exist_ok=True)
+        if not self.trusted(os.stat(self.path)):
+            # the files written there could be replaced by others
+            return
+        filename = self.filename(key)
+        temporary = filename + '.' + str(os.getpid())
+        with open(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as file:
+            file.write(data)
+        os.replace(temporary, filename)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import decimal
+
+from ccxt.base import precise
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'ScaledInt',
+    'number_backend',
+    'scaled_number',
+]
+
+
+class ScaledInt(int):
+    """
+    an exact number held as the integer count of 10 ** -scale units, e.g. '0.1234' is ScaledInt(12340000)
+    with the scale 8, the sums, differences and comparisons of the numbers of the same scale are the int
+    operations and their results are plain ints of the same units, str() is the decimal string of the number
+    so that the strings read back from the unified structures parse to the same value
+
+    json.dumps() writes the int, the count of units, not the decimal number, convert the values with str()
+    or float() before serializing them
+    """
+
+    __slots__ = ()
+    scale = 8
+
+    @classmethod
+    def parse(cls, value):
+        """:returns ScaledInt: the number of the string, int or float value, rounded half to even at scale decimals"""
+        if isinstance(value, ScaledInt):
+            return value if value.scale == cls.scale else cls.parse(str(value))
+        if isinstance(value, float):
+            value = repr(value)
+        elif not isinstance(value, str):
+            value = str(value)
+        integer, decimals = precise.parse(value)
+        shift = cls.scale - decimals
+        if shift >= 0:
+            return cls(integer * 10 ** shift)
+        quotient, remainder = divmod(integer, 10 ** -shift)
+        double = 2 * remainder
+        half = 10 ** -shift
+        if double > half or (double == half and quotient % 2):
+            quotient += 1
+        return cls(quotient)
+
+    def __str__(self):
+        return precise.to_string(int(self), self.scale)
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + str(self) + ')'
+
+    def __float__(self):
+        return int(self) / 10 ** self.scale
+
+    def to_decimal(self):
+        return decimal.Decimal(int(self)).scaleb(-self.scale)
+
+
+# the subclasses of ScaledInt by scale
+scaled_numbers = {}
+
+
+def scaled_number(scale):
+    """:returns type: the ScaledInt of the numbers with scale decimals, the same class for the same scale"""
+    cls = scaled_numbers.get(scale)
+    if cls is None:
+        cls = type('ScaledInt' + str(scale), (ScaledInt,), {'scale': scale, '__slots__': ()})
+        scaled_numbers[scale] = cls
+    return cls
+
+
+def number_backend(number, scale=8, context=None):
+    """
+    :param str|callable number: 'float', 'str', 'decimal', 'scaled' or the callable converting the number strings
+    :param int scale: the decimals of the 'scaled' numbers
+    :param decimal.Context context: the context of the 'decimal' numbers, shared by the exchanges given the same one
+    :returns callable: the converter of the number strings parsed by parse_number, safe_number, parse_bid_ask and the order books, None for an unknown number
+    """
+    if number is None or number == 'float':
+        return float
+    if number == 'str' or number == 'string':
+        return str
+    if number == 'decimal' or number is decimal.Decimal:
+        return decimal.Decimal if context is None else context.create_decimal
+    if number == 'scaled':
+        return scaled_number(scale).parse
+    if callable(number):
+        return number
+    return None
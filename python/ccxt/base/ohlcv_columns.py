@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+
+import array
+import bisect
+import contextvars
+
+from ccxt.base.errors import NotSupported
+
+np = None
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'OHLCVColumns',
+    'OHLCVCBuilder',
+    'build_ohlcvc_columns',
+]
+
+# the array type of the candles fetched by fetch_ohlcv_array, the pages of its paginated calls are kept as columns
+ohlcv_array_type = contextvars.ContextVar('ccxt_ohlcv_array_type', default=None)
+# the (since, columns) of the pages of the paginated calls of fetch_ohlcv_array, see Exchange.safe_deterministic_page
+ohlcv_pages = contextvars.ContextVar('ccxt_ohlcv_pages', default=None)
+
+nan = float('nan')
+
+
+def to_float(value):
+    return nan if value is None else float(value)
+
+
+class OHLCVColumns(object):
+    """
+    the candles as columns instead of a list of rows, the timestamps are int64 and the open, high, low, close
+    and volume are float64 with nan for the missing values, in array.array or with array_type='numpy' in numpy
+    arrays, 8 bytes per value instead of the ~100 bytes of the rows
+
+    the columns are sorted by timestamp, len() is the number of candles and the candles can still be read as rows,
+    columns[i] is [timestamp, open, high, low, close, volume], columns[i:j] are the columns of the candles i to j,
+    the candles of build_ohlcvc_columns have a seventh int64 column, the count of their trades, None otherwise
+    """
+
+    names = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'count']
+
+    def __init__(self, columns=None, array_type='array', counted=False):
+        if array_type == 'numpy':
+            if np is None:
+                raise NotSupported('OHLCVColumns requires numpy for the numpy array type, please install it with `pip install numpy`')
+        elif array_type != 'array':
+            raise NotSupported('OHLCVColumns array type must be array or numpy, got ' + str(array_type))
+        self.array_type = array_type
+        if columns is None:
+            columns = [self.column(i, []) for i in range(7 if counted else 6)]
+        self.columns = columns
+
+    def column(self, index, values, count=-1):
+        """the column of the values, int64 for the timestamps at index 0 and the counts at index 6, float64 for the others"""
+        integer = index == 0 or index == 6
+        if self.array_type == 'numpy':
+            return np.fromiter(values, np.int64 if integer else np.float64, count)
+        return array.array('q' if integer else 'd', values)
+
+    @property
+    def columns(self):
+        columns = [self.timestamp, self.open, self.high, self.low, self.close, self.volume]
+        if self.count is not None:
+            columns.append(self.count)
+        return columns
+
+    @columns.setter
+    def columns(self, columns):
+        self.timestamp, self.open, self.high, self.low, self.close, self.volume = columns[:6]
+        self.count = columns[6] if len(columns) > 6 else None
+
+    @classmethod
+    def from_rows(cls, rows, array_type='array'):
+        """
+        :param [[int|float|str]]|OHLCVColumns rows: the [timestamp, open, high, low, close, volume, count?] candles, the ones without a timestamp are left out
+        :returns OHLCVColumns: the columns of the rows in their order
+        """
+        if isinstance(rows, OHLCVColumns):
+            return rows if rows.array_type == array_type else cls(rows.columns, array_type).convert()
+        rows = [row for row in rows if row[0] is not None]
+        result = cls(None, array_type)
+        count = len(rows)
+        columns = [result.column(0, (int(row[0]) for row in rows), count)]
+        for index in range(1, 6):
+            columns.append(result.column(index, (to_float(row[index]) if len(row) > index else nan for row in rows), count))
+        if count and len(rows[0]) > 6:
+            columns.append(result.column(6, (int(row[6]) for row in rows), count))
+        result.columns = columns
+        return result
+
+    def convert(self):
+        # the columns of another array type
+        self.columns = [self.column(i, column, len(column)) for i, column in enumerate(self.columns)]
+        return self
+
+    @classmethod
+    def concat(cls, parts, array_type='array'):
+        """
+        :param [OHLCVColumns|[list]] parts: the candles of the pages of a paginated call
+        :returns OHLCVColumns: the sorted candles of all the parts, the first candle of the parts wins for a repeated timestamp
+        """
+        parts = [cls.from_rows(part, array_type) for part in parts]
+        result = cls(None, array_type, bool(parts) and all(part.count is not None for part in parts))
+        if array_type == 'numpy':
+            if parts:
+                result.columns = [np.concatenate([part.columns[i] for part in parts]) for i in range(len(result.columns))]
+        else:
+            for part in parts:
+                for column, values in zip(result.columns, part.columns):
+                    column.extend(values)
+        return result.sort(True)
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return OHLCVColumns([column[index] for column in self.columns], self.array_type)
+        row = [int(self.timestamp[index]), float(self.open[index]), float(self.high[index]), float(self.low[index]), float(self.close[index]), float(self.volume[index])]
+        if self.count is not None:
+            row.append(int(self.count[index]))
+        return row
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, OHLCVColumns):
+            other = other.to_list()
+        return isinstance(other, list) and self.to_list() == other
+
+    def __repr__(self):
+        return 'OHLCVColumns(' + str(len(self)) + ' candles, ' + self.array_type + ')'
+
+    def to_list(self):
+        """:returns [[int|float]]: the candles as rows, like parse_ohlcvs and build_ohlcvc"""
+        return [self[i] for i in range(len(self))]
+
+    def to_dict(self):
+        """:returns dict: the columns by name"""
+        return dict(zip(self.names, self.columns))
+
+    def take(self, indices):
+        """:returns OHLCVColumns: the candles at the indices"""
+        if self.array_type == 'numpy':
+            return OHLCVColumns([column[indices] for column in self.columns], self.array_type)
+        return OHLCVColumns([self.column(i, map(column.__getitem__, indices)) for i, column in enumerate(self.columns)], self.array_type)
+
+    def sort(self, unique=False):
+        """:returns OHLCVColumns: the candles sorted by timestamp, only the first candle of each timestamp if unique"""
+        timestamps = self.timestamp
+        length = len(timestamps)
+        if self.array_type == 'numpy':
+            order = np.argsort(timestamps, kind='stable')
+            if unique and length:
+                ordered = timestamps[order]
+                order = order[np.concatenate(([True], ordered[1:] != ordered[:-1]))]
+            return self if len(order) == length and bool(np.all(order == np.arange(length))) else self.take(order)
+        ascending = all(timestamps[i] < timestamps[i + 1] for i in range(length - 1))
+        if ascending:
+            return self
+        order = sorted(range(length), key=timestamps.__getitem__)
+        if unique:
+            order = [index for i, index in enumerate(order) if i == 0 or timestamps[index] != timestamps[order[i - 1]]]
+        return self.take(order)
+
+    def filter_by_since_limit(self, since=None, limit=None, tail=False):
+        """:returns OHLCVColumns: the sorted candles from since, the first limit of them with since and the last limit of them otherwise, like filter_by_since_limit"""
+        start = 0
+        if since is not None:
+            if self.array_type == 'numpy':
+                start = int(np.searchsorted(self.timestamp, since))
+            else:
+                start = bisect.bisect_left(self.timestamp, since)
+        end = len(self)
+        if limit is not None:
+            if since is not None and not tail:
+                end = min(end, start + limit)
+            else:
+                start = max(start, end - limit)
+        if start == 0 and end == len(self):
+            return self
+        return self[start:end]
+
+
+def build_ohlcvc_columns(timestamps, prices, amounts, ms, since=0, limit=None, skip_zero_prices=True, array_type='array'):
+    """
+    build_ohlcvc over the columns of the trades sorted by timestamp, the trades are grouped by the opening time of
+    their candle and each group is reduced at once, the max and min of its prices and the sum of its amounts,
+    instead of updating the candle trade by trade
+    :param int ms: the duration of the candles
+    :param int limit: the number of the first trades to build the candles of, all of them by default
+    :returns OHLCVColumns: the candles with the count column
+    """
+    if limit is not None and limit < len(timestamps):
+        timestamps = timestamps[:limit]
+        prices = prices[:limit]
+        amounts = amounts[:limit]
+    since = since or 0
+    if array_type == 'numpy':
+        if np is None:
+            # raises NotSupported
+            OHLCVColumns(None, array_type)
+        timestamps = np.asarray(timestamps, np.int64)
+        prices = np.asarray(prices, np.float64)
+        amounts = np.asarray(amounts, np.float64)
+        openings = timestamps - timestamps % ms
+        selected = openings >= since
+        if skip_zero_prices:
+            selected &= (prices > 0) | (prices < 0)
+        if not selected.all():
+            openings = openings[selected]
+            prices = prices[selected]
+            amounts = amounts[selected]
+        length = len(openings)
+        if length == 0:
+            return OHLCVColumns(None, array_type, True)
+        starts = np.flatnonzero(np.concatenate(([True], openings[1:] != openings[:-1])))
+        ends = np.append(starts[1:], length)
+        return OHLCVColumns([
+            openings[starts],
+            prices[starts],
+            np.maximum.reduceat(prices, starts),
+            np.minimum.reduceat(prices, starts),
+            prices[ends - 1],
+            np.add.reduceat(amounts, starts),
+            ends - starts,
+        ], array_type)
+    openings = [int(timestamp // ms) * ms for timestamp in timestamps]
+    length = len(openings)
+    if skip_zero_prices:
+        selected = [i for i in range(length) if openings[i] >= since and (prices[i] > 0 or prices[i] < 0)]
+    elif since > 0:
+        selected = [i for i in range(length) if openings[i] >= since]
+    else:
+        selected = None
+    if selected is not None and len(selected) < length:
+        openings = [openings[i] for i in selected]
+        prices = [prices[i] for i in selected]
+        amounts = [amounts[i] for i in selected]
+        length = len(selected)
+    starts = [i for i in range(length) if i == 0 or openings[i] != openings[i - 1]]
+    ends = starts[1:] + [length] if starts else []
+    result = OHLCVColumns(None, array_type, True)
+    result.columns = [
+        result.column(0, [openings[start] for start in starts]),
+        result.column(1, [prices[start] for start in starts]),
+        result.column(2, [max(prices[start:end]) for start, end in zip(starts, ends)]),
+        result.column(3, [min(prices[start:end]) for start, end in zip(starts, ends)]),
+        result.column(4, [prices[end - 1] for end in ends]),
+        result.column(5, [sum(amounts[start:end]) for start, end in zip(starts, ends)]),
+        result.column(6, [end - start for start, end in zip(starts, ends)]),
+    ]
+    return result
+
+
+class OHLCVCBuilder(object):
+    """
+    the incremental build_ohlcvc_columns, the trades passed to update are folded into the last candle or start the
+    next ones, the candles before the last one are never built again, the trades of the candles before the last
+    one come too late and are only counted in late
+    """
+
+    def __init__(self, ms, since=0, skip_zero_prices=True):
+        self.ms = ms
+        self.since = since
+        self.skip_zero_prices = skip_zero_prices
+        self.candles = OHLCVColumns(None, 'array', True)
+        self.late = 0
+        self.appended = 0  # the appended count of the trades cache at its last update
+
+    def update(self, timestamps, prices, amounts):
+        """
+        :param [int] timestamps: the timestamps of the new trades sorted by timestamp, with their prices and amounts
+        :returns int: the number of the candles updated or added
+        """
+        built = build_ohlcvc_columns(timestamps, prices, amounts, self.ms, self.since, None, self.skip_zero_prices)
+        candles = self.candles
+        length = len(built)
+        start = 0
+        if len(candles) and length:
+            last = candles.timestamp[-1]
+            while start < length and built.timestamp[start] < last:
+                self.late += built.count[start]
+                start += 1
+            if start < length and built.timestamp[start] == last:
+                candles.high[-1] = max(candles.high[-1], built.high[start])
+                candles.low[-1] = min(candles.low[-1], built.low[start])
+                candles.close[-1] = built.close[start]
+                candles.volume[-1] += built.volume[start]
+                candles.count[-1] += built.count[start]
+                start += 1
+                for column, values in zip(candles.columns, built.columns):
+                    column.extend(values[start:])
+                return length - start + 1
+        for column, values in zip(candles.columns, built.columns):
+            column.extend(values[start:])
+        return length - start
+
+    def update_trades(self, trades):
+        """folds the unified trades"""
+        return self.update([trade['timestamp'] for trade in trades], [trade['price'] for trade in trades], [trade['amount'] for trade in trades])
+
+    def update_from_cache(self, cache):
+        """folds the trades appended to the ArrayCache of a watch_trades since the last call, like Stream.updates"""
+        appended = cache._appended
+        count = min(appended - self.appended, len(cache))
+        self.appended = appended
+        if count <= 0:
+            return 0
+        return self.update_trades(cache[len(cache) - count:])
+
+    def columns(self, array_type='array'):
+        """:returns OHLCVColumns: the candles built so far"""
+        return OHLCVColumns.from_rows(self.candles, array_type)
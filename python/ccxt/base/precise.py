@@ -10,23 +10,99 @@
 #
 # (╯°□°）╯︵ ┻━┻
 
+import ast
+
+# the (integer, decimals) of the strings parsed, most of them are prices and amounts seen again and again
+parsed_strings = {}
+max_parsed_strings = 100000
+
+
+def parse(number):
+    """:returns tuple: (integer, decimals) of the string number, number = integer * 10 ** -decimals"""
+    parsed = parsed_strings.get(number)
+    if parsed is not None:
+        return parsed
+    string = number
+    modifier = 0
+    number = number.lower()
+    if 'e' in number:
+        number, modifier = number.split('e')
+        modifier = int(modifier)
+    decimal_index = number.find('.')
+    if decimal_index > -1:
+        decimals = len(number) - decimal_index - 1
+        integer = int(number.replace('.', ''))
+    else:
+        decimals = 0
+        integer = int(number)
+    parsed = (integer, decimals - modifier)
+    if len(parsed_strings) >= max_parsed_strings:
+        parsed_strings.clear()
+    parsed_strings[string] = parsed
+    return parsed
+
+
+def to_string(integer, decimals):
+    """the string of integer * 10 ** -decimals without trailing zeros, as str(Precise(integer, decimals))"""
+    if integer == 0:
+        return '0'
+    if integer < 0:
+        sign = '-'
+        digits = str(-integer)
+    else:
+        sign = ''
+        digits = str(integer)
+    if digits[-1] == '0':
+        stripped = digits.rstrip('0')
+        decimals -= len(digits) - len(stripped)
+        digits = stripped
+    if decimals <= 0:
+        return sign + digits + '0' * -decimals
+    if len(digits) <= decimals:
+        return sign + '0.' + '0' * (decimals - len(digits)) + digits
+    return sign + digits[:-decimals] + '.' + digits[-decimals:]
+
+
+def add(integer1, decimals1, integer2, decimals2):
+    if decimals1 == decimals2:
+        return integer1 + integer2, decimals1
+    elif decimals1 > decimals2:
+        return integer1 + integer2 * 10 ** (decimals1 - decimals2), decimals1
+    return integer1 * 10 ** (decimals2 - decimals1) + integer2, decimals2
+
+
+def compare(integer1, decimals1, integer2, decimals2):
+    """:returns int: the sign of the difference of the numbers"""
+    difference = add(integer1, decimals1, -integer2, decimals2)[0]
+    return (difference > 0) - (difference < 0)
+
+
+def div(integer1, decimals1, integer2, decimals2, precision=18):
+    distance = precision - decimals1 + decimals2
+    if distance == 0:
+        numerator = integer1
+    elif distance < 0:
+        numerator = integer1 // 10 ** -distance
+    else:
+        numerator = integer1 * 10 ** distance
+    result, mod = divmod(numerator, integer2)
+    # python floors negative numbers down instead of truncating
+    # if mod is zero it will be floored to itself so we do not add one
+    return (result + 1 if result < 0 and mod else result), precision
+
+
+def mod(integer1, decimals1, integer2, decimals2):
+    rationizerNumberator = max(-decimals1 + decimals2, 0)
+    numerator = integer1 * (10 ** rationizerNumberator)
+    rationizerDenominator = max(-decimals2 + decimals1, 0)
+    denominator = integer2 * (10 ** rationizerDenominator)
+    return numerator % denominator, rationizerDenominator + decimals2
+
 
 class Precise:
     def __init__(self, number, decimals=None):
         if decimals is None:
-            modifier = 0
-            number = number.lower()
-            if 'e' in number:
-                number, modifier = number.split('e')
-                modifier = int(modifier)
-            decimal_index = number.find('.')
-            if decimal_index > -1:
-                self.decimals = len(number) - decimal_index - 1
-                self.integer = int(number.replace('.', ''))
-            else:
-                self.decimals = 0
-                self.integer = int(number)
-            self.decimals = self.decimals - modifier
+            self.integer, self.decimals = parse(number)
         else:
             self.integer = number
             self.decimals = decimals
@@ -82,35 +158,13 @@ class Precise:
         return Precise(integer_result, self.decimals + other.decimals)
 
     def div(self, other, precision=18):
-        distance = precision - self.decimals + other.decimals
-        if distance == 0:
-            numerator = self.integer
-        elif distance < 0:
-            exponent = self.base ** -distance
-            numerator = self.integer // exponent
-        else:
-            exponent = self.base ** distance
-            numerator = self.integer * exponent
-        result, mod = divmod(numerator, other.integer)
-        # python floors negative numbers down instead of truncating
-        # if mod is zero it will be floored to itself so we do not add one
-        result = result + 1 if result < 0 and mod else result
-        return Precise(result, precision)
+        return Precise(*div(self.integer, self.decimals, other.integer, other.decimals, precision))
 
     def add(self, other):
-        if self.decimals == other.decimals:
-            integer_result = self.integer + other.integer
-            return Precise(integer_result, self.decimals)
-        else:
-            smaller, bigger = [other, self] if self.decimals > other.decimals else [self, other]
-            exponent = bigger.decimals - smaller.decimals
-            normalised = smaller.integer * (self.base ** exponent)
-            result = normalised + bigger.integer
-            return Precise(result, bigger.decimals)
+        return Precise(*add(self.integer, self.decimals, other.integer, other.decimals))
 
     def sub(self, other):
-        negative = Precise(-other.integer, other.decimals)
-        return self.add(negative)
+        return Precise(*add(self.integer, self.decimals, -other.integer, other.decimals))
 
     def abs(self):
         return Precise(abs(self.integer), self.decimals)
@@ -119,12 +173,7 @@ class Precise:
         return Precise(-self.integer, self.decimals)
 
     def mod(self, other):
-        rationizerNumberator = max(-self.decimals + other.decimals, 0)
-        numerator = self.integer * (self.base ** rationizerNumberator)
-        rationizerDenominator = max(-other.decimals + self.decimals, 0)
-        denominator = other.integer * (self.base ** rationizerDenominator)
-        result = numerator % denominator
-        return Precise(result, rationizerDenominator + other.decimals)
+        return Precise(*mod(self.integer, self.decimals, other.integer, other.decimals))
 
     def orn(self, other):
         integer_result = self.integer | other.integer
@@ -137,12 +186,10 @@ class Precise:
         return self if self.gt(other) else other
 
     def gt(self, other):
-        add = self.sub(other)
-        return add.integer > 0
+        return compare(self.integer, self.decimals, other.integer, other.decimals) > 0
 
     def ge(self, other):
-        add = self.sub(other)
-        return add.integer >= 0
+        return compare(self.integer, self.decimals, other.integer, other.decimals) >= 0
 
     def lt(self, other):
         return other.gt(self)
@@ -151,20 +198,15 @@ class Precise:
         return other.ge(self)
 
     def reduce(self):
-        string = str(self.integer)
-        start = len(string) - 1
-        if start == 0:
-            if string == "0":
-                self.decimals = 0
-            return self
-        for i in range(start, -1, -1):
-            if string[i] != '0':
-                break
-        difference = start - i
-        if difference == 0:
+        if self.integer == 0:
+            self.decimals = 0
             return self
-        self.decimals -= difference
-        self.integer = int(string[:i + 1])
+        string = str(self.integer)
+        if string[-1] == '0':
+            stripped = string.rstrip('0')
+            self.decimals -= len(string) - len(stripped)
+            self.integer = int(stripped)
+        return self
 
     def equals(self, other):
         self.reduce()
@@ -173,19 +215,7 @@ class Precise:
 
     def __str__(self):
         self.reduce()
-        sign = '-' if self.integer < 0 else ''
-        integer_array = list(str(abs(self.integer)).rjust(self.decimals, '0'))
-        index = len(integer_array) - self.decimals
-        if index == 0:
-            item = '0.'
-        elif self.decimals < 0:
-            item = '0' * (-self.decimals)
-        elif self.decimals == 0:
-            item = ''
-        else:
-            item = '.'
-        integer_array.insert(index, item)
-        return sign + ''.join(integer_array)
+        return to_string(self.integer, self.decimals)
 
     def __repr__(self):
         return "Precise(" + str(self) + ")"
@@ -197,16 +227,19 @@ class Precise:
     def string_mul(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return str(Precise(string1).mul(Precise(string2)))
+        integer1, decimals1 = parse(string1)
+        integer2, decimals2 = parse(string2)
+        return to_string(integer1 * integer2, decimals1 + decimals2)
 
     @staticmethod
     def string_div(string1, string2, precision=18):
         if string1 is None or string2 is None:
             return None
-        string2_precise = Precise(string2)
-        if string2_precise.integer == 0:
+        integer2, decimals2 = parse(string2)
+        if integer2 == 0:
             return None
-        return str(Precise(string1).div(string2_precise, precision))
+        integer1, decimals1 = parse(string1)
+        return to_string(*div(integer1, decimals1, integer2, decimals2, precision))
 
     @staticmethod
     def string_add(string1, string2):
@@ -216,31 +249,39 @@ class Precise:
             return string2
         elif string2 is None:
             return string1
-        return str(Precise(string1).add(Precise(string2)))
+        integer1, decimals1 = parse(string1)
+        integer2, decimals2 = parse(string2)
+        return to_string(*add(integer1, decimals1, integer2, decimals2))
 
     @staticmethod
     def string_sub(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return str(Precise(string1).sub(Precise(string2)))
+        integer1, decimals1 = parse(string1)
+        integer2, decimals2 = parse(string2)
+        return to_string(*add(integer1, decimals1, -integer2, decimals2))
 
     @staticmethod
     def string_abs(string):
         if string is None:
             return None
-        return str(Precise(string).abs())
+        integer, decimals = parse(string)
+        return to_string(abs(integer), decimals)
 
     @staticmethod
     def string_neg(string):
         if string is None:
             return None
-        return str(Precise(string).neg())
+        integer, decimals = parse(string)
+        return to_string(-integer, decimals)
 
     @staticmethod
     def string_mod(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return str(Precise(string1).mod(Precise(string2)))
+        integer1, decimals1 = parse(string1)
+        integer2, decimals2 = parse(string2)
+        return to_string(*mod(integer1, decimals1, integer2, decimals2))
 
     @staticmethod
     def string_or(string1, string2):
@@ -252,46 +293,156 @@ class Precise:
     def string_equals(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return Precise(string1).equals(Precise(string2))
+        return compare(*parse(string1), *parse(string2)) == 0
 
     @staticmethod
     def string_eq(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return Precise(string1).equals(Precise(string2))
+        return compare(*parse(string1), *parse(string2)) == 0
 
     @staticmethod
     def string_min(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return str(Precise(string1).min(Precise(string2)))
+        parsed1 = parse(string1)
+        parsed2 = parse(string2)
+        return to_string(*(parsed1 if compare(*parsed2, *parsed1) > 0 else parsed2))
 
     @staticmethod
     def string_max(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return str(Precise(string1).max(Precise(string2)))
+        parsed1 = parse(string1)
+        parsed2 = parse(string2)
+        return to_string(*(parsed1 if compare(*parsed1, *parsed2) > 0 else parsed2))
 
     @staticmethod
     def string_gt(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return Precise(string1).gt(Precise(string2))
+        return compare(*parse(string1), *parse(string2)) > 0
 
     @staticmethod
     def string_ge(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return Precise(string1).ge(Precise(string2))
+        return compare(*parse(string1), *parse(string2)) >= 0
 
     @staticmethod
     def string_lt(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return Precise(string1).lt(Precise(string2))
+        return compare(*parse(string1), *parse(string2)) < 0
 
     @staticmethod
     def string_le(string1, string2):
         if string1 is None or string2 is None:
             return None
-        return Precise(string1).le(Precise(string2))
+        return compare(*parse(string1), *parse(string2)) <= 0
+
+
+class PreciseExpr:
+    """
+    a formula of Precise numbers compiled once and evaluated in one pass over the scaled integers of its
+    values, without the strings of the intermediate results, e.g.
+
+        fee = PreciseExpr('abs(price * amount) * rate')
+        fee.evaluate(price='73369.84', amount='-0.5', rate='0.001') == '36.68492'
+
+    the formulas have names, numbers, +, -, *, /, %, abs, min and max, the result is the same as the one
+    of the matching chain of Precise.string_* calls, None if a value is None or for a division by zero
+    """
+
+    operators = {
+        ast.Add: lambda a, b, precision: add(a[0], a[1], b[0], b[1]),
+        ast.Sub: lambda a, b, precision: add(a[0], a[1], -b[0], b[1]),
+        ast.Mult: lambda a, b, precision: (a[0] * b[0], a[1] + b[1]),
+        ast.Div: lambda a, b, precision: None if b[0] == 0 else div(a[0], a[1], b[0], b[1], precision),
+        ast.Mod: lambda a, b, precision: mod(a[0], a[1], b[0], b[1]),
+    }
+
+    def __init__(self, formula, precision=18):
+        self.formula = formula.strip()
+        # the number of decimals of the divisions, as in Precise.string_div
+        self.precision = precision
+        self.names = []
+        self.function = self.compile(ast.parse(self.formula, mode='eval').body)
+
+    def compile(self, node):
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name not in self.names:
+                self.names.append(name)
+            return lambda values: values[name]
+        if isinstance(node, ast.Constant) and not isinstance(node.value, bool) and isinstance(node.value, (int, float, str)):
+            # the literal as written, 0.1 is not the float 0.1
+            value = parse(node.value if isinstance(node.value, str) else ast.get_source_segment(self.formula, node))
+            return lambda values: value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self.compile(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+
+            def negative(values):
+                value = operand(values)
+                return None if value is None else (-value[0], value[1])
+            return negative
+        if isinstance(node, ast.BinOp) and type(node.op) in self.operators:
+            left = self.compile(node.left)
+            right = self.compile(node.right)
+            operator = self.operators[type(node.op)]
+            precision = self.precision
+
+            def binary(values):
+                a = left(values)
+                if a is None:
+                    return None
+                b = right(values)
+                if b is None:
+                    return None
+                return operator(a, b, precision)
+            return binary
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            name = node.func.id
+            args = [self.compile(arg) for arg in node.args]
+            if name == 'abs' and len(args) == 1:
+                def absolute(values):
+                    value = args[0](values)
+                    return None if value is None else (abs(value[0]), value[1])
+                return absolute
+            if name in ('min', 'max') and len(args) == 2:
+                sign = 1 if name == 'max' else -1
+
+                def extreme(values):
+                    a = args[0](values)
+                    b = args[1](values)
+                    if a is None or b is None:
+                        return None
+                    return a if compare(a[0], a[1], b[0], b[1]) * sign > 0 else b
+                return extreme
+        raise ValueError('PreciseExpr does not support ' + ast.get_source_segment(self.formula, node) + ' in ' + self.formula)
+
+    def evaluate(self, values=None, **kwargs):
+        """
+        :param dict [values]: the strings of the names of the formula, or as keyword arguments
+        :returns str|None: the result
+        """
+        if values is None:
+            values = kwargs
+        elif kwargs:
+            values = dict(values, **kwargs)
+        parsed = {}
+        for name in self.names:
+            value = values[name]
+            if value is None:
+                return None
+            parsed[name] = parse(value if isinstance(value, str) else str(value))
+        result = self.function(parsed)
+        return None if result is None else to_string(*result)
+
+    def __call__(self, values=None, **kwargs):
+        return self.evaluate(values, **kwargs)
+
+    def __repr__(self):
+        return 'PreciseExpr(' + self.formula + ')'
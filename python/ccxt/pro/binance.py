@@ -854,8 +854,7 @@ class binance(ccxt.async_support.binance):
         bookside.store(price, amount)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        self.handle_bid_ask_deltas(bookside, deltas, 0, 1)
 
     def handle_order_book_message(self, client: Client, message, orderbook):
         u = self.safe_integer(message, 'u')
@@ -4115,6 +4114,39 @@ class binance(ccxt.async_support.binance):
             del client.subscriptions[accountType]
             client.reject(message, accountType)
 
+    def message_handlers(self):
+        return {
+            'event': {
+                'depthUpdate': 'handleOrderBook',
+                'trade': 'handleTrade',
+                'aggTrade': 'handleTrade',
+                'kline': 'handleOHLCV',
+                'markPrice_kline': 'handleOHLCV',
+                'indexPrice_kline': 'handleOHLCV',
+                '1hTicker@arr': 'handleTickers',
+                '4hTicker@arr': 'handleTickers',
+                '1dTicker@arr': 'handleTickers',
+                '24hrTicker@arr': 'handleTickers',
+                '24hrMiniTicker@arr': 'handleTickers',
+                '1hTicker': 'handleTickers',
+                '4hTicker': 'handleTickers',
+                '1dTicker': 'handleTickers',
+                '24hrTicker': 'handleTickers',
+                '24hrMiniTicker': 'handleTickers',
+                'markPriceUpdate': 'handleTickers',
+                'markPriceUpdate@arr': 'handleTickers',
+                'bookTicker': 'handleBidsAsks',  # there is no "bookTicker@arr" endpoint
+                'outboundAccountPosition': 'handleBalance',
+                'balanceUpdate': 'handleBalance',
+                'ACCOUNT_UPDATE': 'handleAcountUpdate',
+                'executionReport': 'handleOrderUpdate',
+                'ORDER_TRADE_UPDATE': 'handleOrderUpdate',
+                'forceOrder': 'handleLiquidation',
+                'eventStreamTerminated': 'handleEventStreamTerminated',
+                'externalLockUpdate': 'handleBalance',
+            },
+        }
+
     def handle_message(self, client: Client, message):
         # handle WebSocketAPI
         eventMsg = self.safe_dict(message, 'event')
@@ -4133,41 +4165,12 @@ class binance(ccxt.async_support.binance):
             method(client, message)
             return
         # handle other APIs
-        methods: dict = {
-            'depthUpdate': self.handle_order_book,
-            'trade': self.handle_trade,
-            'aggTrade': self.handle_trade,
-            'kline': self.handle_ohlcv,
-            'markPrice_kline': self.handle_ohlcv,
-            'indexPrice_kline': self.handle_ohlcv,
-            '1hTicker@arr': self.handle_tickers,
-            '4hTicker@arr': self.handle_tickers,
-            '1dTicker@arr': self.handle_tickers,
-            '24hrTicker@arr': self.handle_tickers,
-            '24hrMiniTicker@arr': self.handle_tickers,
-            '1hTicker': self.handle_tickers,
-            '4hTicker': self.handle_tickers,
-            '1dTicker': self.handle_tickers,
-            '24hrTicker': self.handle_tickers,
-            '24hrMiniTicker': self.handle_tickers,
-            'markPriceUpdate': self.handle_tickers,
-            'markPriceUpdate@arr': self.handle_tickers,
-            'bookTicker': self.handle_bids_asks,  # there is no "bookTicker@arr" endpoint
-            'outboundAccountPosition': self.handle_balance,
-            'balanceUpdate': self.handle_balance,
-            'ACCOUNT_UPDATE': self.handle_acount_update,
-            'executionReport': self.handle_order_update,
-            'ORDER_TRADE_UPDATE': self.handle_order_update,
-            'forceOrder': self.handle_liquidation,
-            'eventStreamTerminated': self.handle_event_stream_terminated,
-            'externalLockUpdate': self.handle_balance,
-        }
         event = self.safe_string(message, 'e')
         if isinstance(message, list):
             data = message[0]
             event = self.safe_string(data, 'e') + '@arr'
-        method = self.safe_value(methods, event)
-        if method is None:
+        handler = self.message_handler('event', event)
+        if handler is None:
             requestId = self.safe_string(message, 'id')
             if requestId is not None:
                 self.handle_subscription_status(client, message)
@@ -4186,4 +4189,4 @@ class binance(ccxt.async_support.binance):
             if event is None and ('a' in message) and ('b' in message):
                 self.handle_bids_asks(client, message)
         else:
-            method(client, message)
+            getattr(self, handler)(client, message)
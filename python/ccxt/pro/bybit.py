@@ -993,8 +993,7 @@ class bybit(ccxt.async_support.bybit):
         bookside.storeArray(bidAsk)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        self.handle_bid_ask_deltas(bookside, deltas, 0, 1)
 
     async def watch_trades(self, symbol: str, since: Int = None, limit: Int = None, params={}) -> List[Trade]:
         """
@@ -2266,6 +2265,35 @@ class bybit(ccxt.async_support.bybit):
                 client.reject(error, messageHash)
             return True
 
+    def message_handlers(self):
+        return {
+            'topic': {
+                'orderbook': 'handleOrderBook',
+                'kline': 'handleOHLCV',
+                'order': 'handleOrder',
+                'stopOrder': 'handleOrder',
+                'ticker': 'handleTicker',
+                'trade': 'handleTrades',
+                'publicTrade': 'handleTrades',
+                'depth': 'handleOrderBook',
+                'wallet': 'handleBalance',
+                'outboundAccountInfo': 'handleBalance',
+                'execution': 'handleMyTrades',
+                'execution.fast': 'handleMyTrades',
+                'ticketInfo': 'handleMyTrades',
+                'user.openapi.perp.trade': 'handleMyTrades',
+                'position': 'handlePositions',
+                'liquidation': 'handleLiquidation',
+                'allLiquidation': 'handleLiquidation',
+                'pong': 'handlePong',
+                'order.create': 'handleOrderWs',
+                'order.amend': 'handleOrderWs',
+                'order.cancel': 'handleOrderWs',
+                'auth': 'handleAuthenticate',
+                'unsubscribe': 'handleUnSubscribe',
+            },
+        }
+
     def handle_message(self, client: Client, message):
         topic = self.safe_string_2(message, 'topic', 'op', '')
         if self.handle_error_message(client, message):
@@ -2285,42 +2313,11 @@ class bybit(ccxt.async_support.bybit):
         if event == 'sub' or (topic == 'subscribe'):
             self.handle_subscription_status(client, message)
             return
-        methods: dict = {
-            'orderbook': self.handle_order_book,
-            'kline': self.handle_ohlcv,
-            'order': self.handle_order,
-            'stopOrder': self.handle_order,
-            'ticker': self.handle_ticker,
-            'trade': self.handle_trades,
-            'publicTrade': self.handle_trades,
-            'depth': self.handle_order_book,
-            'wallet': self.handle_balance,
-            'outboundAccountInfo': self.handle_balance,
-            'execution': self.handle_my_trades,
-            'execution.fast': self.handle_my_trades,
-            'ticketInfo': self.handle_my_trades,
-            'user.openapi.perp.trade': self.handle_my_trades,
-            'position': self.handle_positions,
-            'liquidation': self.handle_liquidation,
-            'allLiquidation': self.handle_liquidation,
-            'pong': self.handle_pong,
-            'order.create': self.handle_order_ws,
-            'order.amend': self.handle_order_ws,
-            'order.cancel': self.handle_order_ws,
-            'auth': self.handle_authenticate,
-            'unsubscribe': self.handle_un_subscribe,
-        }
-        exacMethod = self.safe_value(methods, topic)
-        if exacMethod is not None:
-            exacMethod(client, message)
+        # an exact topic or the first topic it contains
+        handler = self.message_handler('topic', topic, True)
+        if handler is not None:
+            getattr(self, handler)(client, message)
             return
-        keys = list(methods.keys())
-        for i in range(0, len(keys)):
-            key = keys[i]
-            if topic.find(keys[i]) >= 0:
-                method = methods[key]
-                method(client, message)
-                return
         # unified auth acknowledgement
         type = self.safe_string(message, 'type')
         if type == 'AUTH_RESP':
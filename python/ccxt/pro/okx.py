@@ -1224,8 +1224,7 @@ class okx(ccxt.async_support.okx):
         bookside.store(price, amount)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        self.handle_bid_ask_deltas(bookside, deltas, 0, 1)
 
     def handle_order_book_message(self, client: Client, message, orderbook, messageHash, market=None):
         #
@@ -2213,6 +2212,45 @@ class okx(ccxt.async_support.okx):
             return False
         return True
 
+    def message_handlers(self):
+        return {
+            'event': {
+                # 'info': self.handleSystemStatus,
+                # 'book': 'handleOrderBook',
+                'login': 'handleAuthenticate',
+                'subscribe': 'handleSubscriptionStatus',
+                'unsubscribe': 'handleUnsubscription',
+                'order': 'handlePlaceOrders',
+                'batch-orders': 'handlePlaceOrders',
+                'amend-order': 'handlePlaceOrders',
+                'batch-amend-orders': 'handlePlaceOrders',
+                'cancel-order': 'handlePlaceOrders',
+                'mass-cancel': 'handleCancelAllOrders',
+            },
+            'channel': {
+                'bbo-tbt': 'handleOrderBook',  # newly added channel that sends tick-by-tick Level 1 data, all API users can subscribe, public depth channel, verification not required
+                'books': 'handleOrderBook',  # all API users can subscribe, public depth channel, verification not required
+                'books5': 'handleOrderBook',  # all API users can subscribe, public depth channel, verification not required, data feeds will be delivered every 100ms(vs. every 200ms now)
+                'books50-l2-tbt': 'handleOrderBook',  # only users who're VIP4 and above can subscribe, identity verification required before subscription
+                'books-l2-tbt': 'handleOrderBook',  # only users who're VIP5 and above can subscribe, identity verification required before subscription
+                'tickers': 'handleTicker',
+                'mark-price': 'handleTicker',
+                'positions': 'handlePositions',
+                'index-tickers': 'handleTicker',
+                'sprd-tickers': 'handleTicker',
+                'block-tickers': 'handleTicker',
+                'trades': 'handleTrades',
+                'trades-all': 'handleTrades',
+                'account': 'handleBalance',
+                'funding-rate': 'handleFundingRate',
+                # 'margin_account': self.handle_balance,
+                'orders': 'handleOrders',
+                'orders-algo': 'handleOrders',
+                'liquidation-orders': 'handleLiquidation',
+                'balance_and_position': 'handleBalanceAndPosition',
+            },
+        }
+
     def handle_message(self, client: Client, message):
         if not self.handle_error_message(client, message):
             return
@@ -2262,53 +2300,18 @@ class okx(ccxt.async_support.okx):
         # if table is None:
         event = self.safe_string_2(message, 'event', 'op')
         if event is not None:
-            methods: dict = {
-                # 'info': self.handleSystemStatus,
-                # 'book': 'handleOrderBook',
-                'login': self.handle_authenticate,
-                'subscribe': self.handle_subscription_status,
-                'unsubscribe': self.handle_unsubscription,
-                'order': self.handle_place_orders,
-                'batch-orders': self.handle_place_orders,
-                'amend-order': self.handle_place_orders,
-                'batch-amend-orders': self.handle_place_orders,
-                'cancel-order': self.handle_place_orders,
-                'mass-cancel': self.handle_cancel_all_orders,
-            }
-            method = self.safe_value(methods, event)
-            if method is not None:
-                method(client, message)
+            handler = self.message_handler('event', event)
+            if handler is not None:
+                getattr(self, handler)(client, message)
         else:
             arg = self.safe_value(message, 'arg', {})
             channel = self.safe_string(arg, 'channel')
-            methods: dict = {
-                'bbo-tbt': self.handle_order_book,  # newly added channel that sends tick-by-tick Level 1 data, all API users can subscribe, public depth channel, verification not required
-                'books': self.handle_order_book,  # all API users can subscribe, public depth channel, verification not required
-                'books5': self.handle_order_book,  # all API users can subscribe, public depth channel, verification not required, data feeds will be delivered every 100ms(vs. every 200ms now)
-                'books50-l2-tbt': self.handle_order_book,  # only users who're VIP4 and above can subscribe, identity verification required before subscription
-                'books-l2-tbt': self.handle_order_book,  # only users who're VIP5 and above can subscribe, identity verification required before subscription
-                'tickers': self.handle_ticker,
-                'mark-price': self.handle_ticker,
-                'positions': self.handle_positions,
-                'index-tickers': self.handle_ticker,
-                'sprd-tickers': self.handle_ticker,
-                'block-tickers': self.handle_ticker,
-                'trades': self.handle_trades,
-                'trades-all': self.handle_trades,
-                'account': self.handle_balance,
-                'funding-rate': self.handle_funding_rate,
-                # 'margin_account': self.handle_balance,
-                'orders': self.handle_orders,
-                'orders-algo': self.handle_orders,
-                'liquidation-orders': self.handle_liquidation,
-                'balance_and_position': self.handle_balance_and_position,
-            }
-            method = self.safe_value(methods, channel)
-            if method is None:
+            handler = self.message_handler('channel', channel)
+            if handler is None:
                 if channel.find('candle') == 0:
                     self.handle_ohlcv(client, message)
             else:
-                method(client, message)
+                getattr(self, handler)(client, message)
 
     def handle_un_subscription_trades(self, client: Client, symbol: str, channel: str):
         subMessageHash = channel + ':' + symbol
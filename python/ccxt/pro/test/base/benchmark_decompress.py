@@ -0,0 +1,92 @@
+import base64
+import gzip
+import io
+import json
+import os
+import sys
+import time
+import zlib
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.functions import Decompressor, gunzip, inflate  # noqa: E402
+
+# Benchmarks the decompression of compressed frames, run by:
+# - python python/ccxt/pro/test/base/benchmark_decompress.py [gunzip|inflate] [frames.txt] [repeat]
+# the frames file has one base64-encoded binary frame per line, as received from the exchange,
+# without a file the frames are built from depth and trade updates like the ones of htx and bitmart,
+# the inflated frames are also compressed as one stream and decompressed with the context takeover
+
+
+def sample_messages(count=200):
+    messages = []
+    for i in range(count):
+        if i % 2:
+            messages.append({'ch': 'market.btcusdt.trade.detail', 'ts': 1700000000000 + i, 'tick': {'id': i, 'data': [{'id': i, 'price': 37000 + i / 100, 'amount': 0.001 * i, 'direction': 'buy', 'ts': 1700000000000 + i}]}})
+        else:
+            messages.append({'ch': 'market.btcusdt.depth.step0', 'ts': 1700000000000 + i, 'tick': {'bids': [[37000 - j / 10, 1.5 + j] for j in range(20)], 'asks': [[37000 + j / 10, 1.5 + j] for j in range(20)]}})
+    return [json.dumps(message).encode() for message in messages]
+
+
+def deflate(message):
+    context = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return context.compress(message) + context.flush()
+
+
+def deflate_stream(messages):
+    context = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return [(context.compress(message) + context.flush(zlib.Z_SYNC_FLUSH))[:-4] for message in messages]
+
+
+def load_frames(method, filename=None):
+    if filename is not None:
+        with open(filename) as file:
+            return [base64.b64decode(line) for line in file if line.strip()], None
+    messages = sample_messages()
+    if method == 'gunzip':
+        return [gzip.compress(message) for message in messages], None
+    return [deflate(message) for message in messages], deflate_stream(messages)
+
+
+def gzip_file(data):
+    # the decompression of every frame before the zlib one
+    return gzip.GzipFile('', 'rb', 9, io.BytesIO(data)).read().decode('utf-8')
+
+
+def measure(decompress, frames, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            decompress(frame)
+    return (time.perf_counter() - start) / (repeat * len(frames)) * 1000000
+
+
+def measure_stream(frames, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        # every repetition is a new connection
+        decompressor = Decompressor(True)
+        for frame in frames:
+            decompressor.inflate(frame)
+    return (time.perf_counter() - start) / (repeat * len(frames)) * 1000000
+
+
+def main():
+    methods = [sys.argv[1]] if len(sys.argv) > 1 else ['gunzip', 'inflate']
+    filename = sys.argv[2] if len(sys.argv) > 2 else None
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    for method in methods:
+        frames, stream = load_frames(method, filename)
+        size = sum(len(frame) for frame in frames) / len(frames)
+        if method == 'gunzip':
+            print('gunzip  %5d frames %7.0f bytes  GzipFile %6.2f us  zlib %6.2f us' % (len(frames), size, measure(gzip_file, frames, repeat), measure(gunzip, frames, repeat)))
+        else:
+            result = 'inflate %5d frames %7.0f bytes  per frame %6.2f us' % (len(frames), size, measure(inflate, frames, repeat))
+            if stream is not None:
+                result += '  context takeover %6.2f us, %.0f bytes' % (measure_stream(stream, repeat), sum(len(frame) for frame in stream) / len(stream))
+            print(result)
+
+
+if __name__ == '__main__':
+    main()
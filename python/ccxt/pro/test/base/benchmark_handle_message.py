@@ -0,0 +1,82 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+import ccxt.pro as ccxtpro  # noqa: E402
+
+# Replays recorded messages through handle_message, run by:
+# - python python/ccxt/pro/test/base/benchmark_handle_message.py [exchange] [messages.jsonl] [repeat]
+# the messages file has one decoded message per line, as passed to handle_message, without a file
+# the samples below are replayed, the markets come from ts/src/test/static/markets
+# the routing alone is measured with the handlers of the samples replaced by a no-op
+
+static = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static', 'markets')
+
+samples = {
+    'binance': [
+        {'e': 'trade', 'E': 1700000000000, 's': 'BTCUSDT', 't': 1, 'p': '37000.00', 'q': '0.001', 'T': 1700000000000, 'm': True, 'M': True},
+        {'e': 'aggTrade', 'E': 1700000000000, 's': 'ETHUSDT', 'a': 2, 'p': '2000.00', 'q': '0.1', 'f': 1, 'l': 1, 'T': 1700000000000, 'm': False, 'M': True},
+        {'e': '24hrTicker', 'E': 1700000000000, 's': 'BTCUSDT', 'p': '100.0', 'P': '0.3', 'w': '36950', 'x': '36900', 'c': '37000', 'Q': '0.01', 'b': '36999.9', 'B': '1', 'a': '37000', 'A': '2', 'o': '36900', 'h': '37100', 'l': '36800', 'v': '1000', 'q': '37000000', 'O': 1699913600000, 'C': 1700000000000, 'F': 1, 'L': 100, 'n': 100},
+        {'e': 'kline', 'E': 1700000000000, 's': 'BTCUSDT', 'k': {'t': 1699999980000, 'T': 1700000039999, 's': 'BTCUSDT', 'i': '1m', 'o': '37000', 'c': '37001', 'h': '37002', 'l': '36999', 'v': '10', 'x': False}},
+        {'u': 400900217, 's': 'BTCUSDT', 'b': '36999.99', 'B': '31.2', 'a': '37000.00', 'A': '40.6'},
+    ],
+    'bybit': [
+        {'topic': 'publicTrade.BTCUSDT', 'type': 'snapshot', 'ts': 1700000000000, 'data': [{'T': 1700000000000, 's': 'BTCUSDT', 'S': 'Buy', 'v': '0.001', 'p': '37000.00', 'L': 'PlusTick', 'i': 'a', 'BT': False}]},
+        {'topic': 'tickers.BTCUSDT', 'type': 'snapshot', 'ts': 1700000000000, 'cs': 1, 'data': {'symbol': 'BTCUSDT', 'lastPrice': '37000', 'highPrice24h': '37100', 'lowPrice24h': '36800', 'prevPrice24h': '36900', 'volume24h': '1000', 'turnover24h': '37000000', 'price24hPcnt': '0.003', 'usdIndexPrice': '37000'}},
+    ],
+    'okx': [
+        {'arg': {'channel': 'trades', 'instId': 'BTC-USDT'}, 'data': [{'instId': 'BTC-USDT', 'tradeId': '1', 'px': '37000', 'sz': '0.001', 'side': 'buy', 'ts': '1700000000000'}]},
+        {'arg': {'channel': 'tickers', 'instId': 'BTC-USDT'}, 'data': [{'instType': 'SPOT', 'instId': 'BTC-USDT', 'last': '37000', 'lastSz': '0.001', 'askPx': '37000.1', 'askSz': '1', 'bidPx': '37000', 'bidSz': '2', 'open24h': '36900', 'high24h': '37100', 'low24h': '36800', 'volCcy24h': '37000000', 'vol24h': '1000', 'ts': '1700000000000'}]},
+    ],
+}
+
+
+def load_messages(exchange_id, filename=None):
+    if filename is None:
+        return samples[exchange_id]
+    with open(filename) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def noop(client, message):
+    pass
+
+
+async def replay(exchange_id, messages, repeat, routing=False):
+    exchange = getattr(ccxtpro, exchange_id)()
+    with open(os.path.join(static, exchange_id + '.json')) as file:
+        exchange.set_markets(list(json.load(file).values()))
+    if routing:
+        for name in ['handleTrade', 'handleTrades', 'handleTickers', 'handleTicker', 'handleOHLCV', 'handle_bids_asks']:
+            setattr(exchange, name, noop)
+    client = exchange.client('wss://replay')
+    handle_message = exchange.handle_message
+    for message in messages:
+        handle_message(client, message)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            handle_message(client, message)
+    elapsed = time.perf_counter() - start
+    await exchange.close()
+    return elapsed / (repeat * len(messages)) * 1000000
+
+
+async def main():
+    exchange_ids = [sys.argv[1]] if len(sys.argv) > 1 else list(samples.keys())
+    filename = sys.argv[2] if len(sys.argv) > 2 else None
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    for exchange_id in exchange_ids:
+        messages = load_messages(exchange_id, filename)
+        total = await replay(exchange_id, messages, repeat)
+        routing = await replay(exchange_id, messages, repeat, True)
+        print('%-10s %6d messages %8.2f us per message, %6.2f us routing' % (exchange_id, len(messages), total, routing))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
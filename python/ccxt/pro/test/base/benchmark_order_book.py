@@ -0,0 +1,98 @@
+import json
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.order_book import engines  # noqa: E402
+
+# Compares the order book engines and apply_deltas() to storeArray() on a delta stream, run with:
+# - python python/ccxt/pro/test/base/benchmark_order_book.py [recorded.jsonl] [depth]
+# a recorded stream has one message per line: {"bids": [["price", "size"], ...], "asks": [...]}
+# the first line is used as the snapshot
+
+
+def synthetic_stream(messages=2000, levels=1000, levels_per_message=100, seed=1):
+    rng = random.Random(seed)
+    tick = 0.01
+    mid = 30000.0
+    snapshot = {
+        'bids': [[round(mid - i * tick, 2), rng.randint(1, 100) / 10] for i in range(1, levels + 1)],
+        'asks': [[round(mid + i * tick, 2), rng.randint(1, 100) / 10] for i in range(1, levels + 1)],
+    }
+    stream = [snapshot]
+    for _ in range(messages):
+        mid += rng.randint(-2, 2) * tick
+        message = {'bids': [], 'asks': []}
+        for _ in range(levels_per_message):
+            distance = int(rng.expovariate(1 / (levels / 4))) + 1
+            size = 0 if rng.random() < 0.2 else rng.randint(1, 100) / 10
+            # exchanges send prices and sizes as strings
+            if rng.random() < 0.5:
+                message['bids'].append([str(round(mid - distance * tick, 2)), str(size)])
+            else:
+                message['asks'].append([str(round(mid + distance * tick, 2)), str(size)])
+        stream.append(message)
+    return stream
+
+
+def load_stream(path):
+    stream = []
+    with open(path) as file:
+        for line in file:
+            message = json.loads(line)
+            stream.append({
+                'bids': [[str(bid[0]), str(bid[1])] for bid in message.get('bids', [])],
+                'asks': [[str(ask[0]), str(ask[1])] for ask in message.get('asks', [])],
+            })
+    return stream
+
+
+def run(engine, stream, depth, batched=False):
+    snapshot = {
+        'bids': [[float(bid[0]), float(bid[1])] for bid in stream[0]['bids']],
+        'asks': [[float(ask[0]), float(ask[1])] for ask in stream[0]['asks']],
+    }
+    book = engines[engine]['order_book'](snapshot, depth)
+    start = time.perf_counter()
+    for message in stream[1:]:
+        bids = book['bids']
+        asks = book['asks']
+        if batched:
+            bids.apply_deltas([bid[0] for bid in message['bids']], [bid[1] for bid in message['bids']])
+            asks.apply_deltas([ask[0] for ask in message['asks']], [ask[1] for ask in message['asks']])
+        else:
+            for bid in message['bids']:
+                bids.storeArray([float(bid[0]), float(bid[1])])
+            for ask in message['asks']:
+                asks.storeArray([float(ask[0]), float(ask[1])])
+        book.limit()
+        # consumers typically read the top of the book after each update
+        bids[0:10]
+        asks[0:10]
+    elapsed = time.perf_counter() - start
+    return elapsed, book
+
+
+def main():
+    stream = load_stream(sys.argv[1]) if len(sys.argv) > 1 else synthetic_stream()
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    deltas = sum(len(message['bids']) + len(message['asks']) for message in stream[1:])
+    results = {}
+    for engine in engines:
+        for batched in [False, True]:
+            name = engine + (' apply_deltas' if batched else ' storeArray')
+            # best of three to reduce the noise
+            results[name] = min((run(engine, stream, depth, batched) for _ in range(3)), key=lambda result: result[0])
+            elapsed = results[name][0]
+            print(name.ljust(24), str(round(elapsed * 1000, 1)).rjust(10), 'ms', str(round(elapsed / deltas * 1e9)).rjust(8), 'ns/delta')
+    books = [result[1] for result in results.values()]
+    assert all(book == books[0] for book in books), 'order book engines disagree'
+    print(len(stream) - 1, 'messages', deltas, 'deltas')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.client import Client  # noqa: E402
+from ccxt.async_support.base.ws.future import Future  # noqa: E402
+
+# Benchmarks the per-update cost of waiting on many message hashes, run by:
+# - python python/ccxt/pro/test/base/benchmark_watch_multiple.py [updates]
+# every iteration waits on all the message hashes like a watch_tickers loop and gets one update,
+# racing a future per message hash costs O(symbols), a registered multi future costs O(1)
+
+
+def create_client():
+    def callback(*args):
+        pass
+    return Client('wss://benchmark', callback, callback, callback, callback)
+
+
+async def race(client, message_hashes, updates):
+    for i in range(updates):
+        future = Future.race([client.future(message_hash) for message_hash in message_hashes])
+        client.resolve(i, message_hashes[i % len(message_hashes)])
+        await future
+
+
+async def multi_future(client, message_hashes, updates):
+    for i in range(updates):
+        future = client.multi_future(message_hashes)
+        client.resolve(i, message_hashes[i % len(message_hashes)])
+        await future
+
+
+async def measure(method, symbols, updates):
+    client = create_client()
+    message_hashes = ['ticker:' + str(i) for i in range(symbols)]
+    start = time.perf_counter()
+    await method(client, message_hashes, updates)
+    return (time.perf_counter() - start) / updates * 1000000
+
+
+async def main():
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print('%8s %12s %12s' % ('symbols', 'race us', 'multi us'))
+    for symbols in [1, 10, 100, 200, 500, 1000]:
+        print('%8d %12.1f %12.1f' % (symbols, await measure(race, symbols, updates), await measure(multi_future, symbols, updates)))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt import ExchangeError  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_connection_pool.py
+
+url = 'wss://pool.test/ws'
+
+
+def subscribe(exchange, subscribe_hashes):
+    # what watch and watch_multiple do before connecting
+    client = exchange.client(exchange.connection_url(url, subscribe_hashes))
+    for subscribe_hash in subscribe_hashes:
+        client.subscriptions[subscribe_hash] = True
+    return client.url
+
+
+async def test_connection_pool():
+    exchange = Exchange()
+    assert exchange.connection_pool(url) is None
+    assert exchange.connection_url(url, ['ticker:BTC/USDT']) == url
+    exchange = Exchange({'id': 'pooltest', 'options': {'ws': {'pool': {
+        'maxSubscriptions': 3,
+        'maxConnections': 3,
+        'pinned': {'balance': 'private'},
+    }}}})
+    # the first connection is filled before the next one is opened
+    urls = [subscribe(exchange, ['ticker:' + str(i)]) for i in range(5)]
+    assert urls == [url, url, url, url + '#1', url + '#1']
+    assert subscribe(exchange, ['ticker:0']) == url
+    # the subscriptions of one message share a connection
+    assert subscribe(exchange, ['trades:0', 'trades:1']) == url + '#2'
+    assert subscribe(exchange, ['trades:2']) == url + '#1'
+    assert exchange.connection_pool(url).connections(exchange.clients) == {url: 3, url + '#1': 3, url + '#2': 2}
+    # the pinned subscriptions get a connection of their own
+    assert subscribe(exchange, ['balance']) == url + '#private'
+    assert subscribe(exchange, ['balance:USDT']) == url + '#private'
+    try:
+        subscribe(exchange, ['trades:3', 'trades:4'])
+        assert False
+    except ExchangeError as e:
+        assert 'cannot subscribe' in str(e)
+    # the subscriptions of a closed connection move to the connections with room on the next watch call
+    del exchange.clients[url + '#1']
+    assert subscribe(exchange, ['ticker:3']) == url + '#2'
+    assert subscribe(exchange, ['ticker:4']) == url + '#1'
+    exchange.connection_pool(url).pin('ohlcv', 'candles')
+    assert subscribe(exchange, ['ohlcv:1m']) == url + '#candles'
+    await exchange.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(test_connection_pool())
@@ -0,0 +1,73 @@
+import asyncio
+import gzip
+import json
+import os
+import sys
+import zlib
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from aiohttp import WSMessage, WSMsgType  # noqa: E402
+from ccxt.async_support.base.ws.client import Client  # noqa: E402
+from ccxt.async_support.base.ws.functions import Decompressor, gunzip, inflate  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_decompressor.py
+
+
+def deflate_stream(messages, strip=True):
+    # the frames of a permessage-deflate stream, compressed with the context of the previous frames
+    context = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    frames = []
+    for message in messages:
+        frame = context.compress(json.dumps(message).encode()) + context.flush(zlib.Z_SYNC_FLUSH)
+        frames.append(frame[:-4] if strip else frame)
+    return frames
+
+
+async def test_decompressor():
+    message = json.dumps({'ch': 'market.btcusdt.depth.step0', 'tick': {'bids': [[37000, 1]] * 10}})
+    assert gunzip(gzip.compress(message.encode())) == message
+    # the members after the first one and the padding between them
+    assert gunzip(gzip.compress(b'[1,') + b'\x00\x00' + gzip.compress(b'2]')) == '[1,2]'
+    # a truncated member is an error, not a part of the message
+    for compressed in [gzip.compress(message.encode())[:-1], gzip.compress(message.encode())[:20], gzip.compress(b'[1,') + gzip.compress(b'2]')[:-8]]:
+        try:
+            gunzip(compressed)
+            assert False
+        except EOFError:
+            pass
+    compressed = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    assert inflate(compressed.compress(message.encode()) + compressed.flush()) == message.encode()
+    messages = [{'id': i, 'channel': 'trades', 'data': [{'price': '37000', 'amount': '0.1'}]} for i in range(5)]
+    for strip in [True, False]:
+        decompressor = Decompressor(True)
+        assert [json.loads(decompressor.inflate(frame)) for frame in deflate_stream(messages, strip)] == messages
+    # the frames after the first one cannot be inflated without its context
+    frames = deflate_stream(messages)
+    decompressor = Decompressor(True)
+    decompressor.inflate(frames[0])
+    decompressor.reset()
+    try:
+        decompressor.inflate(frames[1])
+        assert False
+    except zlib.error:
+        pass
+    received = []
+
+    def callback(*args):
+        pass
+
+    client = Client('wss://test', lambda client, message: received.append(message), callback, callback, callback, {
+        'asyncio_loop': asyncio.get_running_loop(),
+        'inflate': True,
+        'contextTakeover': True,
+    })
+    for frame in frames:
+        client.handle_message(WSMessage(WSMsgType.BINARY, frame, None))
+    assert received == messages
+
+
+if __name__ == '__main__':
+    asyncio.run(test_decompressor())
@@ -7,8 +7,10 @@ import sys
 root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 sys.path.append(root)
 
-from ccxt import ExchangeClosedByUser
+from ccxt import ExchangeClosedByUser, UnsubscribeError
+from ccxt.async_support.base.exchange import Exchange
 from ccxt.async_support.base.ws.future import Future
+from ccxt.async_support.base.ws.client import Client
 
 # Helper functions
 async def resolve_later(future, result, delay):
@@ -178,6 +180,108 @@ async def test_closed_by_user():
     except Exception as e:
         assert False, f"Received Exception {e}"
 
+def create_client():
+    def callback(*args):
+        pass
+    return Client('wss://test', callback, callback, callback, callback)
+
+async def test_multi_future():
+    print("test_multi_future")
+    client = create_client()
+    hashes = ['ticker:' + str(i) for i in range(100)]
+    future = client.multi_future(hashes)
+    multi_future = client.multi_futures[tuple(hashes)]
+    client.resolve("first", 'ticker:50')
+    client.resolve("second", 'ticker:60')
+    assert await future == "first"
+    # nobody waits for the second update, the multi future is unregistered
+    assert client.multi_futures == {}
+    assert client.waiters == {}
+    future = client.multi_future(hashes)
+    multi_future = client.multi_futures[tuple(hashes)]
+    client.resolve("third", 'ticker:70')
+    assert await future == "third"
+    # the same message hashes reuse the registered multi future
+    future = client.multi_future(hashes)
+    assert client.multi_futures[tuple(hashes)] is multi_future
+    assert len(client.waiters['ticker:0']) == 1
+    assert client.multi_future(hashes) is future
+    assert 'ticker:1' in client.pending_message_hashes()
+    client.resolve("fourth", 'ticker:1')
+    assert await future == "fourth"
+    assert client.pending_message_hashes() == []
+
+async def test_multi_future_unsubscribe():
+    print("test_multi_future_unsubscribe")
+    client = create_client()
+    exchange = Exchange({'id': 'test'})
+    ticker = client.multi_future(['ticker:a', 'ticker:b'])
+    trades = client.multi_future(['trades:a', 'trades:b'])
+    exchange.clean_unsubscription(client, 'ticker:a', 'unsubscribe:ticker:a')
+    try:
+        await ticker
+        assert False, "Expected an UnsubscribeError"
+    except UnsubscribeError:
+        pass
+    # the multi futures of the unsubscribed message hashes are unregistered
+    assert list(client.multi_futures.keys()) == [('trades:a', 'trades:b')]
+    assert sorted(client.waiters.keys()) == ['trades:a', 'trades:b']
+    exchange.clean_unsubscription(client, 'trades:', 'unsubscribe:trades', True)
+    try:
+        await trades
+        assert False, "Expected an UnsubscribeError"
+    except UnsubscribeError:
+        pass
+    assert client.multi_futures == {}
+    assert client.waiters == {}
+
+async def test_multi_future_reject():
+    print("test_multi_future_reject")
+    client = create_client()
+    future = client.multi_future(['a', 'b'])
+    client.reject(Exception("Error in b"), 'b')
+    try:
+        await future
+        assert False, "Expected an exception but none was raised"
+    except Exception as e:
+        assert str(e) == "Error in b"
+    # rejections without a waiter are kept for the next call
+    client.reject(Exception("Error in a"), 'a')
+    future = client.multi_future(['a', 'b'])
+    try:
+        await future
+        assert False, "Expected an exception but none was raised"
+    except Exception as e:
+        assert str(e) == "Error in a"
+    assert client.rejections == {}
+    future = client.multi_future(['a', 'b'])
+    client.reject(ExchangeClosedByUser())
+    try:
+        await future
+        assert False, "Expected an ExchangeClosedByUser"
+    except ExchangeClosedByUser:
+        pass
+    # a cancelled future is replaced on the next call
+    future = client.multi_future(['a', 'b'])
+    future.cancel()
+    future = client.multi_future(['a', 'b'])
+    client.resolve("after cancel", 'a')
+    assert await future == "after cancel"
+    # the exchanges rejecting every key of client.futures reach the multi futures too
+    future = client.multi_future(['a', 'b'])
+    error = Exception("listen key expired")
+    message_hashes = list(client.futures.keys())
+    assert message_hashes == ['a', 'b']
+    for message_hash in message_hashes:
+        client.reject(error, message_hash)
+    try:
+        await future
+        assert False, "Expected an exception but none was raised"
+    except Exception as e:
+        assert e is error
+    assert client.rejections == {}
+    assert list(client.futures.keys()) == []
+
 async def test_ws_future():
     await test_resolve_before()
     await test_reject()
@@ -191,4 +295,7 @@ async def test_ws_future():
     await test_race_with_wait_for_completion()
     await test_race_with_precompleted_future()
     await test_closed_by_user()
+    await test_multi_future()
+    await test_multi_future_reject()
+    await test_multi_future_unsubscribe()
 
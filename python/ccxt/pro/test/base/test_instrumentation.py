@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from aiohttp import web, WSMessage, WSMsgType  # noqa: E402
+import ccxt  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.base.instrumentation import Instrumentation, Histogram  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_instrumentation.py
+
+
+class InstrumentedExchange(Exchange):
+    base_url = None
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': self.base_url + '/' + path, 'method': method, 'body': None, 'headers': None}
+
+    async def fetch_ticker(self, symbol, params={}):
+        response = await self.fetch2('ticker', 'public', 'GET', params)
+        return {'symbol': symbol, 'last': response['last']}
+
+    async def fetch_tickers(self, symbols=None, params={}):
+        return await asyncio.gather(*[self.fetch_ticker(symbol) for symbol in symbols])
+
+    def message_handlers(self):
+        return {
+            'event': {
+                'trade': 'handle_trade_event',
+            },
+        }
+
+    def handle_trade_event(self, client, message):
+        client.resolve(message, 'trade')
+
+    def handle_message(self, client, message):
+        handler = self.message_handler('event', message.get('e'))
+        if handler is not None:
+            getattr(self, handler)(client, message)
+
+
+def metrics(instrumentation, kind, name):
+    return [metric for metric in instrumentation.snapshot()[kind] if metric['name'] == name]
+
+
+async def test_instrumentation():
+    async def ticker(request):
+        return web.json_response({'last': '100'})
+
+    app = web.Application()
+    app.router.add_get('/ticker', ticker)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    recorded = []
+    instrumentation = Instrumentation()
+    instrumentation.add_listener(lambda kind, name, value, labels: recorded.append((name, value, labels)))
+    exchange = InstrumentedExchange({'id': 'instrumented', 'instrumentation': instrumentation, 'enableRateLimit': True})
+    exchange.base_url = 'http://127.0.0.1:' + str(runner.addresses[0][1])
+    try:
+        assert (await exchange.fetchTicker('BTC/USDT'))['last'] == '100'
+        tickers = await exchange.fetch_tickers(['BTC/USDT', 'ETH/USDT'])
+        assert len(tickers) == 2
+        labels = {'exchange': 'instrumented', 'api': 'public', 'path': 'ticker'}
+        for name in ['rest.request', 'rest.throttle', 'rest.sign', 'rest.network', 'rest.decode']:
+            [metric] = metrics(instrumentation, 'histograms', name)
+            assert metric['labels'] == labels and metric['count'] == 3, name
+        [request] = metrics(instrumentation, 'histograms', 'rest.request')
+        [network] = metrics(instrumentation, 'histograms', 'rest.network')
+        assert request['sum'] >= network['sum']
+        # the requests of fetch_ticker called by fetch_tickers are requests of fetch_tickers
+        method_requests = {metric['labels']['method']: metric for metric in metrics(instrumentation, 'histograms', 'method.request')}
+        assert method_requests['fetch_ticker']['count'] == 3 and method_requests['fetch_tickers']['count'] == 1
+        ticker_requests = [value for name, value, labels in recorded if name == 'method.request' and labels['method'] == 'fetch_ticker']
+        assert abs(method_requests['fetch_tickers']['sum'] - sum(ticker_requests[1:])) < 0.000001
+        assert metrics(instrumentation, 'gauges', 'throttler.queue')[0]['labels']['bucket'] == 'default'
+        # the messages, their decoding and their handlers
+        client = exchange.client('wss://instrumented')
+        for i in range(3):
+            client.handle_message(WSMessage(WSMsgType.TEXT, json.dumps({'e': 'trade', 'i': i}), None))
+        client.handle_message(WSMessage(WSMsgType.TEXT, json.dumps({'e': 'unknown'}), None))
+        [messages] = metrics(instrumentation, 'counters', 'ws.messages')
+        assert messages['value'] == 4 and messages['labels'] == {'exchange': 'instrumented', 'url': 'wss://instrumented'}
+        assert metrics(instrumentation, 'histograms', 'ws.decode')[0]['count'] == 4
+        [handler] = metrics(instrumentation, 'histograms', 'ws.handler')
+        assert handler['count'] == 3 and handler['labels'] == {'exchange': 'instrumented', 'handler': 'handle_trade_event'}
+        assert 'ws.handle' in [name for name, value, labels in recorded]
+    finally:
+        await exchange.close()
+        await runner.cleanup()
+    # without instrumentation the methods of the class run
+    exchange = InstrumentedExchange()
+    assert 'fetch2' not in exchange.__dict__ and 'fetch_ticker' not in exchange.__dict__
+    await exchange.close()
+    sync_exchange = ccxt.binance({'instrumentation': True})
+    assert isinstance(sync_exchange.instrumentation, Instrumentation)
+    assert sync_exchange.fetchTicker is sync_exchange.fetch_ticker
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.record(value)
+    assert histogram.percentile(0.5) == 50 and histogram.percentile(0.99) == 100 and histogram.min == 1
+
+
+if __name__ == '__main__':
+    asyncio.run(test_instrumentation())
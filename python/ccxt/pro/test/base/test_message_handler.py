@@ -0,0 +1,50 @@
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+import ccxt.pro as ccxtpro  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_message_handler.py
+
+
+async def test_message_handler():
+    binance = ccxtpro.binance()
+    # the routing tables of message_handlers are read once per instance
+    assert binance.message_handler('event', 'depthUpdate') == 'handleOrderBook'
+    assert binance.message_routes is binance.message_routes
+    assert binance.message_handler('event', '24hrTicker@arr') == 'handleTickers'
+    assert binance.message_handler('event', None) is None
+    assert binance.message_handler('event', 'unknown') is None
+    assert binance.message_handler('unknown', 'depthUpdate') is None
+    bybit = ccxtpro.bybit()
+    # an exact topic first, then the first topic contained in it
+    assert bybit.message_handler('topic', 'order.create') == 'handleOrderWs'
+    assert bybit.message_handler('topic', 'orderbook.50.BTCUSDT') is None
+    assert bybit.message_handler('topic', 'orderbook.50.BTCUSDT', True) == 'handleOrderBook'
+    assert bybit.message_handler('topic', 'publicTrade.BTCUSDT', True) == 'handleTrades'
+    assert bybit.message_handler('topic', 'unknown', True) is None
+    assert 'unknown' in bybit.message_routes_found['topic']
+    # the same handlers as the transpiled message_handler
+    for topic in ['order.create', 'orderbook.50.BTCUSDT', 'publicTrade.BTCUSDT', 'tickers.BTCUSDT', 'unknown']:
+        assert bybit.message_handler('topic', topic, True) == ccxt.Exchange.message_handler(bybit, 'topic', topic, True)
+    # the handlers replaced on the instance route the messages
+    handled = []
+    bybit.handleTrades = lambda client, message: handled.append(message)
+    bybit.handle_message(bybit.client('wss://test'), {'topic': 'publicTrade.BTCUSDT', 'data': []})
+    assert len(handled) == 1
+    # the bookTicker without an event still reaches its handler
+    handled = []
+    binance.handle_bids_asks = lambda client, message: handled.append(message)
+    binance.handle_message(binance.client('wss://test'), {'u': 1, 's': 'BTCUSDT', 'b': '1', 'B': '1', 'a': '2', 'A': '1'})
+    assert len(handled) == 1
+    await binance.close()
+    await bybit.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(test_message_handler())
@@ -0,0 +1,107 @@
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws import order_book_side  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_order_book_apply_deltas.py
+
+
+def random_batch(rng, size, with_counts):
+    batch = []
+    for _ in range(size):
+        price = str(round(100 + rng.randint(-30, 30) * 0.5, 1))
+        amount = rng.choice(['0', '0.000', '1', '2.5', '3.25'])
+        if with_counts:
+            batch.append([price, amount, str(rng.randint(0, 3))])
+        else:
+            batch.append([price, amount])
+    return batch
+
+
+def store_one_by_one(side, batch, with_counts):
+    for delta in batch:
+        if with_counts:
+            side.storeArray([float(delta[0]), float(delta[1]), int(delta[2])])
+        else:
+            side.storeArray([float(delta[0]), float(delta[1])])
+
+
+def apply_at_once(side, batch, with_counts):
+    prices = [delta[0] for delta in batch]
+    sizes = [delta[1] for delta in batch]
+    counts = [delta[2] for delta in batch] if with_counts else None
+    side.apply_deltas(prices, sizes, counts)
+
+
+def test_apply_deltas_matches_store_array(cls, with_counts, seed):
+    rng = random.Random(seed)
+    expected = cls()
+    actual = cls()
+    # small batches sweep through the side, big ones rebuild it
+    for size in [40, 3, 5, 1, 0, 80, 7, 2, 120, 4]:
+        batch = random_batch(rng, size, with_counts)
+        store_one_by_one(expected, batch, with_counts)
+        apply_at_once(actual, batch, with_counts)
+        assert actual == expected, cls.__name__ + ' ' + str(actual) + ' != ' + str(expected)
+        if not issubclass(cls, order_book_side.ChunkedOrderBookSide):
+            assert actual._index == expected._index
+
+
+def test_apply_deltas_indexed(cls):
+    expected = cls()
+    actual = cls()
+    batch = [['10', '1', 'a'], ['11', '2', 'b'], [None, '3', 'a'], ['9', '1', 'b'], ['12', '0', 'a'], ['12', '4', 'c']]
+    for delta in batch:
+        expected.storeArray([None if delta[0] is None else float(delta[0]), float(delta[1]), delta[2]])
+    actual.apply_deltas([delta[0] for delta in batch], [delta[1] for delta in batch], [delta[2] for delta in batch])
+    assert actual == expected, cls.__name__ + ' ' + str(actual) + ' != ' + str(expected)
+
+
+def test_volume_at_indexed(cls, seed):
+    # many orders per price with a small chunk size, so the levels of a price span several chunks
+    rng = random.Random(seed)
+    expected = cls()
+    actual = type('SmallChunks', (order_book_side.ChunkedIndexedOrderBookSide,), {'side': cls.side, 'chunk_size': 2})()
+    for order_id in range(200):
+        delta = [float(rng.randint(1, 10)), float(rng.randint(0, 3)), str(order_id % 50)]
+        expected.storeArray(list(delta))
+        actual.storeArray(list(delta))
+    for price in range(0, 12):
+        assert actual.volume_at(float(price)) == expected.volume_at(float(price)), str(price)
+
+
+def test_apply_deltas_keeps_extra_values():
+    # bitget-like sides keep the raw delta as a third value
+    bids = order_book_side.Bids([[10.0, 1.0, ['10', '1']]])
+    bids.apply_deltas(['10'], ['2'])
+    assert bids == [[10.0, 2.0, ['10', '1']]]
+
+
+def test_ws_order_book_apply_deltas():
+    seed = 0
+    for cls, with_counts in [
+        (order_book_side.Asks, False),
+        (order_book_side.Bids, False),
+        (order_book_side.CountedAsks, True),
+        (order_book_side.CountedBids, True),
+        (order_book_side.ChunkedAsks, False),
+        (order_book_side.ChunkedBids, False),
+        (order_book_side.ChunkedCountedAsks, True),
+        (order_book_side.ChunkedCountedBids, True),
+    ]:
+        seed += 1
+        test_apply_deltas_matches_store_array(cls, with_counts, seed)
+    for cls in [order_book_side.IndexedBids, order_book_side.ChunkedIndexedAsks]:
+        test_apply_deltas_indexed(cls)
+    test_volume_at_indexed(order_book_side.IndexedBids, seed + 1)
+    test_volume_at_indexed(order_book_side.IndexedAsks, seed + 2)
+    test_apply_deltas_keeps_extra_values()
+
+
+if __name__ == '__main__':
+    test_ws_order_book_apply_deltas()
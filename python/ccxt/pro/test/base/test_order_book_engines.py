@@ -0,0 +1,103 @@
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.order_book import engines  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_order_book_engines.py
+
+
+def random_deltas(rng, kind, count, levels=50):
+    deltas = []
+    for i in range(count):
+        price = round(100 + rng.randint(-levels, levels) * 0.5, 1)
+        size = rng.choice([0, 0, 1, 2.5, 3, 10])
+        if kind == 'counted_order_book':
+            deltas.append([price, size, rng.randint(0, 3)])
+        elif kind == 'indexed_order_book':
+            deltas.append([price if rng.random() > 0.1 else None, size, str(rng.randint(0, 40))])
+        else:
+            deltas.append([price, size])
+    return deltas
+
+
+def clean_indexed(deltas):
+    # the price can only be omitted for ids that are already in the book
+    seen = set()
+    result = []
+    for delta in deltas:
+        if delta[0] is None and delta[2] not in seen:
+            continue
+        if delta[1]:
+            seen.add(delta[2])
+        result.append(delta)
+    return result
+
+
+def apply(book, deltas, limit):
+    for delta in deltas:
+        side = book['bids'] if delta[0] is None or delta[0] < 100 else book['asks']
+        side.storeArray(list(delta))
+        if limit:
+            book.limit()
+
+
+def test_engine_matches_bisect(kind, depth, limit, seed):
+    rng = random.Random(seed)
+    snapshot = {
+        'bids': [[round(100 - i * 0.5, 1), 1, 1 if kind == 'counted_order_book' else str(i)] for i in range(1, 20)],
+        'asks': [[round(100 + i * 0.5, 1), 1, 1 if kind == 'counted_order_book' else str(100 + i)] for i in range(1, 20)],
+    }
+    if kind == 'order_book':
+        snapshot = {
+            'bids': [bid[0:2] for bid in snapshot['bids']],
+            'asks': [ask[0:2] for ask in snapshot['asks']],
+        }
+    expected = engines['bisect'][kind](snapshot, depth)
+    actual = engines['chunked'][kind](snapshot, depth)
+    for _ in range(20):
+        deltas = random_deltas(rng, kind, 30)
+        if kind == 'indexed_order_book':
+            # the same order id can not be on both sides of the book
+            deltas = clean_indexed([delta for delta in deltas if delta[0] is None or delta[0] < 100])
+            for delta in deltas:
+                expected['bids'].storeArray(list(delta))
+                actual['bids'].storeArray(list(delta))
+            if limit:
+                expected.limit()
+                actual.limit()
+        else:
+            apply(expected, deltas, limit)
+            apply(actual, deltas, limit)
+        assert actual == expected, kind + ' ' + str(actual) + ' != ' + str(expected)
+        assert len(actual['bids']) == len(expected['bids'])
+        assert actual['bids'][0:5] == expected['bids'][0:5]
+        assert list(reversed(actual['asks'])) == list(reversed(expected['asks']))
+
+
+def test_engine_reset():
+    book = engines['chunked']['order_book']({'bids': [[1, 1], [2, 2]], 'asks': [[3, 3]]})
+    book['bids'].store(1.5, 1)
+    book.reset({'bids': [[0.5, 1]], 'asks': [[4, 1], [3.5, 2]]})
+    assert book['bids'] == [[0.5, 1]]
+    assert book['asks'] == [[3.5, 2], [4, 1]]
+    book['asks'].store(3.5, 0)
+    book['asks'].store(3.5, 7)
+    assert book['asks'] == [[3.5, 7], [4, 1]]
+
+
+def test_ws_order_book_engines():
+    seed = 0
+    for kind in ['order_book', 'counted_order_book', 'indexed_order_book']:
+        for depth, limit in [(None, False), (10, True)]:
+            seed += 1
+            test_engine_matches_bisect(kind, depth, limit, seed)
+    test_engine_reset()
+
+
+if __name__ == '__main__':
+    test_ws_order_book_engines()
@@ -0,0 +1,98 @@
+import gc
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.order_book import engines  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_order_book_read.py
+
+
+def test_read_api(engine):
+    book = engines[engine]['order_book']({
+        'bids': [[10, 1], [9, 2], [8, 3]],
+        'asks': [[11, 1], [12, 2], [13, 3]],
+    })
+    assert book.best_bid() == [10, 1]
+    assert book.best_ask() == [11, 1]
+    assert book.mid() == 10.5
+    assert book.spread() == 1
+    assert book.depth_at(9) == 2
+    assert book.depth_at(12) == 2
+    assert book.depth_at(9.5) == 0
+    # buying for 11 + 24 + 13 quote fills the first two levels and a third of the last one
+    assert book.cumulative_volume('asks', 48) == 1 + 2 + 1
+    assert book.cumulative_volume('asks', 35 + 26) == 1 + 2 + 2
+    assert book.cumulative_volume('asks', 1000) == 6
+    bids, asks = book.top(2)
+    assert len(bids) == 2
+    assert bids == [[10, 1], [9, 2]]
+    assert asks[-1] == [12, 2]
+    assert list(asks) == [[11, 1], [12, 2]]
+    # views are live
+    book['bids'].store(10.5, 4)
+    assert bids[0] == [10.5, 4]
+    assert book.top(10)[0] == [[10.5, 4], [10, 1], [9, 2], [8, 3]]
+    empty = engines[engine]['order_book']({})
+    assert empty.best_bid() is None
+    assert empty.mid() is None
+    assert len(empty.top(5)[1]) == 0
+
+
+def test_snapshot(engine):
+    book = engines[engine]['order_book']({
+        'bids': [[10, 1], [9, 2]],
+        'asks': [[11, 1]],
+        'nonce': 5,
+    })
+    snapshot = book.snapshot()
+    assert snapshot['nonce'] == 5
+    assert snapshot['bids'] == [[10, 1], [9, 2]]
+    # no writes in between, the same snapshot is shared and nothing is copied
+    assert book.snapshot()['bids'] is snapshot['bids']
+    assert snapshot['bids']._levels is None
+    book['bids'].store(10, 7)
+    book['bids'].store(8, 1)
+    book['asks'].store(11, 0)
+    assert snapshot['bids'] == [[10, 1], [9, 2]]
+    assert snapshot['asks'] == [[11, 1]]
+    assert book['bids'] == [[10, 7], [9, 2], [8, 1]]
+    assert book.snapshot()['bids'] == [[10, 7], [9, 2], [8, 1]]
+    try:
+        snapshot['bids'][0][1] = 3
+        assert False, 'snapshot levels must be immutable'
+    except TypeError:
+        pass
+    # dropped snapshots are never copied
+    book.snapshot()
+    gc.collect()
+    book['bids'].store(7, 1)
+    assert book['bids']._snapshot is None or book['bids']._snapshot() is None
+    book.reset({'bids': [[1, 1]]})
+    snapshot = book.snapshot()
+    book.reset({'bids': [[2, 2]]})
+    assert snapshot['bids'] == [[1, 1]]
+
+
+def test_indexed_read_api(engine):
+    book = engines[engine]['indexed_order_book']({
+        'bids': [[10, 1, 'a'], [10, 2, 'b'], [9, 2, 'c']],
+        'asks': [[11, 1, 'd']],
+    })
+    assert book.depth_at(10) == 3
+    assert book.depth_at(11) == 1
+    assert book.best_bid() == [10, 1, 'a']
+
+
+def test_ws_order_book_read():
+    for engine in engines:
+        test_read_api(engine)
+        test_snapshot(engine)
+        test_indexed_read_api(engine)
+
+
+if __name__ == '__main__':
+    test_ws_order_book_read()
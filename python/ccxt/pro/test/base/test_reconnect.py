@@ -0,0 +1,99 @@
+import asyncio
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from aiohttp import web  # noqa: E402
+from ccxt import NetworkError  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.order_book import DeltaCache  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_reconnect.py
+
+
+class ReconnectExchange(Exchange):
+    url = None
+
+    def handle_message(self, client, message):
+        client.resolve(message, message['hash'])
+
+    async def watch_ticker(self, symbol):
+        message_hash = 'ticker:' + symbol
+        return await self.watch(self.url, message_hash, {'subscribe': message_hash}, message_hash)
+
+
+async def start_server(received, connections):
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        connections.append(ws)
+        async for message in ws:
+            subscribe = json.loads(message.data)['subscribe']
+            received.append(subscribe)
+            await ws.send_str(json.dumps({'hash': subscribe, 'connection': len(connections)}))
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/ws', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, 'ws://127.0.0.1:' + str(port) + '/ws'
+
+
+async def test_reconnect():
+    received = []
+    connections = []
+    runner, url = await start_server(received, connections)
+    exchange = ReconnectExchange({'id': 'reconnecttest', 'options': {'ws': {'reconnect': {'delay': 10, 'maxDelay': 50}}}})
+    exchange.url = url
+    try:
+        assert (await exchange.watch_ticker('BTC/USDT'))['connection'] == 1
+        client = exchange.client(url)
+        client.subscriptions['orderbook:BTC/USDT'] = True
+        exchange.orderbooks['BTC/USDT'] = exchange.order_book({'bids': [[100, 1]], 'nonce': 5, 'symbol': 'BTC/USDT'})
+        exchange.orderbooks['BTC/USDT:USDT'] = exchange.order_book({'bids': [[100, 1]], 'nonce': 5, 'symbol': 'BTC/USDT:USDT'})
+        # the exchanges like binance replace the cache by a list once the snapshot is applied
+        exchange.orderbooks['BTC/USDT'].cache = [{'u': 4}]
+        # the consumer keeps waiting across the gap
+        pending = asyncio.ensure_future(exchange.watch_ticker('BTC/USDT'))
+        await asyncio.sleep(0)
+        await connections[0].close()
+        ticker = await asyncio.wait_for(pending, 5)
+        assert ticker['connection'] == 2
+        assert received == ['ticker:BTC/USDT', 'ticker:BTC/USDT']
+        assert exchange.clients[url] is client
+        stats = client.reconnect_stats
+        assert stats['reconnects'] == 1 and stats['lastGap'] is not None and stats['totalGap'] >= stats['lastGap']
+        # the book of the resubscribed symbol waits for a new snapshot, the other one is untouched
+        assert exchange.orderbooks['BTC/USDT']['nonce'] is None and len(exchange.orderbooks['BTC/USDT']['bids']) == 0
+        assert exchange.orderbooks['BTC/USDT:USDT']['nonce'] == 5
+        # the deltas buffered until the new snapshot are bounded again
+        cache = exchange.orderbooks['BTC/USDT'].cache
+        assert isinstance(cache, DeltaCache) and len(cache) == 0 and cache.max_size == 1000
+    finally:
+        await exchange.close()
+        await runner.cleanup()
+    # the futures are rejected once the retries run out
+    exchange = ReconnectExchange({'id': 'reconnecttest', 'options': {'ws': {'reconnect': {'delay': 1, 'maxRetries': 2}}}})
+    exchange.url = url
+    try:
+        await asyncio.wait_for(exchange.watch_ticker('BTC/USDT'), 5)
+        assert False
+    except NetworkError:
+        pass
+    assert url not in exchange.clients
+    await exchange.close()
+    assert Exchange.message_hash_has_symbol('orderbook:BTC/USDT:100', 'BTC/USDT')
+    assert not Exchange.message_hash_has_symbol('orderbook:BTC/USDT:USDT', 'BTC/USDT')
+    assert Exchange.message_hash_has_symbol('orderbook::ETH/USDT,BTC/USDT', 'BTC/USDT')
+
+
+if __name__ == '__main__':
+    asyncio.run(test_reconnect())
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.order_book import DeltaCache  # noqa: E402
+from ccxt.async_support.base.ws.snapshot_scheduler import SnapshotScheduler  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_snapshot_scheduler.py
+
+
+async def test_snapshot_scheduler():
+    started = []
+    running = [0, 0]  # running, max running
+
+    async def fetch(symbol):
+        started.append(symbol)
+        running[0] += 1
+        running[1] = max(running[1], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return {'symbol': symbol}
+
+    scheduler = SnapshotScheduler(2, ['ETH/USDT', 'SOL/USDT'])
+    symbols = ['A/USDT', 'B/USDT', 'C/USDT', 'SOL/USDT', 'ETH/USDT']
+    tasks = [asyncio.ensure_future(scheduler.fetch(symbol, fetch, symbol)) for symbol in symbols]
+    await asyncio.sleep(0)
+    assert scheduler.pending() == 3
+    results = await asyncio.gather(*tasks)
+    assert [result['symbol'] for result in results] == symbols
+    # the first two take the free slots, the prioritized symbols go before the others that wait
+    assert started == ['A/USDT', 'B/USDT', 'ETH/USDT', 'SOL/USDT', 'C/USDT']
+    assert running[1] == 2 and scheduler.running == 0
+    stats = scheduler.stats['C/USDT']
+    assert stats['snapshots'] == 1 and stats['firstBook'] >= stats['fetched'] and stats['waited'] >= 10
+    # a cancelled request gives its slot to the next one
+    scheduler = SnapshotScheduler(1)
+    first = asyncio.ensure_future(scheduler.fetch('A/USDT', fetch, 'A/USDT'))
+    cancelled = asyncio.ensure_future(scheduler.fetch('B/USDT', fetch, 'B/USDT'))
+    last = asyncio.ensure_future(scheduler.fetch('C/USDT', fetch, 'C/USDT'))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    assert (await last)['symbol'] == 'C/USDT'
+    await first
+    assert scheduler.running == 0 and scheduler.pending() == 0
+    # the deltas buffered before the snapshot are bounded
+    cache = DeltaCache(3)
+    for i in range(5):
+        cache.append({'u': i})
+    assert [delta['u'] for delta in cache] == [2, 3, 4] and cache.dropped == 2
+    exchange = Exchange({'options': {'watchOrderBook': {'maxCachedDeltas': 10, 'snapshotConcurrency': 1}}})
+    assert exchange.order_book().cache.max_size == 10
+    assert type(Exchange({'options': {'watchOrderBook': {'maxCachedDeltas': 0}}}).order_book().cache) is list
+
+    async def fetch_order_book(symbol, limit=None, params={}):
+        return await fetch(symbol)
+
+    exchange.fetch_order_book = fetch_order_book
+    books = await asyncio.gather(exchange.fetch_rest_order_book_safe('BTC/USDT'), exchange.fetch_rest_order_book_safe('ETH/USDT'))
+    assert [book['symbol'] for book in books] == ['BTC/USDT', 'ETH/USDT']
+    assert sorted(exchange.order_book_snapshot_stats().keys()) == ['BTC/USDT', 'ETH/USDT']
+    assert exchange.snapshot_scheduler.concurrency == 1
+    await exchange.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(test_snapshot_scheduler())
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt import NetworkError  # noqa: E402
+import ccxt.pro as ccxtpro  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.cache import ArrayCache  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_stream.py
+
+url = 'wss://stream.test'
+
+
+class StreamExchange(Exchange):
+    id = 'streamtest'
+
+    async def watch_ticker(self, symbol, params={}):
+        return await self.watch(url, 'ticker:' + symbol)
+
+    async def watch_order_book(self, symbol, limit=None, params={}):
+        return await self.watch(url, 'orderbook:' + symbol)
+
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        return await self.watch_multiple(url, ['trades:' + symbol for symbol in symbols])
+
+
+def create_exchange():
+    exchange = StreamExchange()
+    # no connection is opened, the updates are resolved by the test
+    exchange.client(url).connected.resolve(True)
+    return exchange
+
+
+async def test_stream_queue():
+    exchange = create_exchange()
+    client = exchange.client(url)
+    stream = exchange.stream_ticker('BTC/USDT')
+    await asyncio.sleep(0)
+    for i in range(5):
+        client.resolve({'last': i}, 'ticker:BTC/USDT')
+    client.resolve({'last': 100}, 'ticker:ETH/USDT')
+    # every update is delivered, the first one also resolves the subscribing watch call
+    received = []
+    async for ticker in stream:
+        received.append(ticker['last'])
+        if len(received) == 5:
+            break
+    assert received == [0, 1, 2, 3, 4]
+    await asyncio.sleep(0)
+    assert stream.task.done()
+    assert 'ticker:BTC/USDT' not in client.futures
+    later = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    assert not later.done()
+    client.resolve({'last': 5}, 'ticker:BTC/USDT')
+    assert (await later)['last'] == 5
+    stream.close()
+    assert client.streams == {}
+    try:
+        await stream.__anext__()
+        assert False
+    except StopAsyncIteration:
+        pass
+    await exchange.close()
+
+
+async def test_stream_overflow():
+    exchange = create_exchange()
+    client = exchange.client(url)
+    oldest = exchange.stream_ticker('BTC/USDT', max_size=2)
+    newest = exchange.stream_ticker('BTC/USDT', max_size=2, overflow='dropNewest')
+    failing = exchange.stream_ticker('BTC/USDT', max_size=2, overflow='raise')
+    await asyncio.sleep(0)
+    for i in range(4):
+        client.resolve(i, 'ticker:BTC/USDT')
+    assert list(oldest.queue) == [2, 3] and oldest.dropped == 2
+    assert list(newest.queue) == [0, 1] and newest.dropped == 2
+    assert failing.closed
+    # the queued updates are consumed before the error
+    assert [await failing.__anext__(), await failing.__anext__()] == [0, 1]
+    try:
+        await failing.__anext__()
+        assert False
+    except RuntimeError as e:
+        assert 'max_size' in str(e)
+    try:
+        exchange.stream_ticker('BTC/USDT', overflow='block')
+        assert False
+    except ValueError:
+        pass
+    await exchange.close()
+    # closing the exchange ends the streams
+    assert oldest.closed and newest.closed
+    # the exchanges that define their own stream method, like binance, still stream
+    binance = ccxtpro.binance()
+    assert binance.stream_ticker.__func__ is Exchange.stream_ticker
+    assert binance.stream_updates.__func__ is Exchange.stream_updates
+    await binance.close()
+
+
+async def test_stream_caches_and_callbacks():
+    exchange = create_exchange()
+    client = exchange.client(url)
+    received = []
+    stream = exchange.stream_trades(['BTC/USDT', 'ETH/USDT'], callback=received.append)
+    await asyncio.sleep(0)
+    assert sorted(client.streams.keys()) == ['trades:BTC/USDT', 'trades:ETH/USDT']
+    trades = ArrayCache(3)
+    for i in range(2):
+        trades.append({'symbol': 'BTC/USDT', 'id': i})
+    client.resolve(trades, 'trades:BTC/USDT')
+    trades.append({'symbol': 'ETH/USDT', 'id': 2})
+    client.resolve(trades, 'trades:ETH/USDT')
+    # nothing new
+    client.resolve(trades, 'trades:ETH/USDT')
+    for i in range(3, 8):
+        trades.append({'symbol': 'BTC/USDT', 'id': i})
+    client.resolve(trades, 'trades:BTC/USDT')
+    assert [[trade['id'] for trade in update] for update in received] == [[0, 1], [2], [5, 6, 7]]
+    # errors end the stream
+    client.reject(NetworkError('connection lost'))
+    try:
+        await stream.join()
+        assert False
+    except NetworkError:
+        pass
+    assert client.streams == {}
+    await exchange.close()
+
+
+async def test_stream_order_book_snapshots():
+    exchange = create_exchange()
+    client = exchange.client(url)
+    stream = exchange.stream_order_book('BTC/USDT')
+    await asyncio.sleep(0)
+    orderbook = OrderBook({'bids': [[100.0, 1.0]], 'asks': [[101.0, 1.0]], 'nonce': 1})
+    client.resolve(orderbook, 'orderbook:BTC/USDT')
+    orderbook['bids'].store(100.0, 2.0)
+    orderbook['asks'].store(102.0, 3.0)
+    orderbook['nonce'] = 2
+    client.resolve(orderbook, 'orderbook:BTC/USDT')
+    orderbook['bids'].store(100.0, 0)
+    # every queued update keeps the levels it was resolved with
+    first = await stream.__anext__()
+    second = await stream.__anext__()
+    assert first['nonce'] == 1
+    assert list(map(list, first['bids'])) == [[100.0, 1.0]]
+    assert list(map(list, first['asks'])) == [[101.0, 1.0]]
+    assert second['nonce'] == 2
+    assert list(map(list, second['bids'])) == [[100.0, 2.0]]
+    assert list(map(list, second['asks'])) == [[101.0, 1.0], [102.0, 3.0]]
+    assert len(orderbook['bids']) == 0
+    stream.close()
+    await exchange.close()
+
+
+async def test_stream():
+    await test_stream_queue()
+    await test_stream_overflow()
+    await test_stream_caches_and_callbacks()
+    await test_stream_order_book_snapshots()
+
+
+if __name__ == '__main__':
+    asyncio.run(test_stream())
@@ -0,0 +1,231 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base.throttler import Throttler, FileThrottler, fcntl  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_throttler.py
+
+
+async def test_throttler_rate():
+    # 1 token per 10ms, 10 requests should take about 90ms
+    throttler = Throttler({'refillRate': 1 / 10, 'capacity': 1})
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*[throttler() for _ in range(10)])
+    elapsed = (loop.time() - start) * 1000
+    assert 80 <= elapsed < 300, elapsed
+    stats = throttler.stats()
+    assert stats['granted'] == 10
+    assert stats['queueSize'] == 0
+    assert sum(stats['waitTime']['histogram'].values()) == 10
+    assert stats['waitTime']['max'] >= 80
+    assert not throttler.running
+    assert throttler.timer is None
+
+
+async def test_throttler_batch():
+    # a full bucket releases everything it can afford in one go
+    throttler = Throttler({'refillRate': 1 / 1000, 'capacity': 3, 'tokens': 3})
+    futures = [throttler() for _ in range(5)]
+    assert [future.done() for future in futures] == [True, True, True, True, False]
+    assert throttler.stats()['queueSize'] == 1
+    throttler.timer.cancel()
+
+
+async def test_throttler_cost_and_cancel():
+    throttler = Throttler({'refillRate': 1 / 10, 'capacity': 1})
+    first = throttler(5)
+    assert first.done()
+    assert throttler.config['tokens'] == -5
+    cancelled = throttler(100)
+    last = throttler(1)
+    cancelled.cancel()
+    await last
+    # the cancelled request did not consume its cost
+    assert throttler.config['tokens'] > -5
+    assert throttler.stats()['granted'] == 2
+
+
+async def test_throttler_max_capacity():
+    throttler = Throttler({'refillRate': 1 / 1000, 'maxCapacity': 2})
+    futures = [throttler() for _ in range(4)]
+    try:
+        throttler()
+        assert False
+    except RuntimeError as e:
+        assert 'maxCapacity' in str(e)
+    throttler.timer.cancel()
+    for future in futures:
+        future.cancel()
+
+
+async def test_throttler_unlimited():
+    throttler = Throttler({'refillRate': float('inf')})
+    await asyncio.gather(*[throttler() for _ in range(100)])
+    assert throttler.stats()['granted'] == 100
+
+
+async def test_throttler_no_refill():
+    # a refillRate of 0 waits for a sync instead of dividing by zero
+    throttler = Throttler({'refillRate': 0, 'capacity': 1})
+    await throttler()
+    waiting = throttler()
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    throttler.sync(1)
+    await waiting
+    assert not throttler.running
+
+
+async def test_throttler_sync_and_backoff():
+    throttler = Throttler({'refillRate': 1 / 1000, 'capacity': 1})
+    spent = throttler.spent
+    await throttler()
+    waiting = [throttler() for _ in range(3)]
+    assert not any(future.done() for future in waiting)
+    # the server reports 4 tokens left for a request sent before the first grant
+    throttler.sync(4, spent)
+    assert all(future.done() for future in waiting)
+    assert throttler.config['tokens'] == 0
+    throttler.backoff(50)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await throttler()
+    assert (loop.time() - start) * 1000 >= 45
+
+
+async def test_rate_limit_headers():
+    exchange = ccxt.binance()
+    url = 'https://api.binance.com/api/v3/depth'
+    [feedback] = exchange.parse_rate_limit_headers(url, 200, {'X-MBX-USED-WEIGHT-1M': '5000'})
+    # 1000 weight left at 0.2 tokens per weight
+    assert feedback['remaining'] == 200
+    assert 0 < feedback['reset'] <= 60000
+    fapi = 'https://fapi.binance.com/fapi/v1/depth'
+    [feedback] = exchange.parse_rate_limit_headers(fapi, 200, {'x-mbx-used-weight-1m': '2000'})
+    assert feedback['remaining'] == 400 and feedback['bucket'] == 'fapi'
+    # the futures weight resyncs the futures bucket only, the spot requests keep their own budget
+    tokens = exchange.throttler.config['tokens']
+    exchange.handle_rate_limit_headers(fapi, 200, {'x-mbx-used-weight-1m': '10'}, exchange.rate_limit_spent())
+    assert exchange.throttler.config['tokens'] == tokens
+    assert exchange.rate_limit_throttler('fapi').config['tokens'] == 2390
+    assert exchange.calculate_rate_limiter_cost('fapiPublic', 'GET', 'depth', {}, {'cost': 2}) == {'fapi': 2}
+    assert exchange.calculate_rate_limiter_cost('sapiV2', 'GET', 'sub-account/futures/account', {}, {'cost': 0.1}) == {'sapi': 0.1}
+    assert exchange.calculate_rate_limiter_cost('public', 'GET', 'depth', {}, {'cost': 1}) == 1
+    feedback = exchange.parse_rate_limit_headers(url, 429, {'Retry-After': '2', 'x-mbx-used-weight-1m': '6000'})
+    assert feedback == [{'bucket': None, 'remaining': 0, 'reset': 2000}]
+    assert exchange.parse_rate_limit_headers(url, 200, {}) == []
+    exchange.handle_rate_limit_headers(url, 200, {'x-mbx-used-weight-1m': '5000'}, exchange.rate_limit_spent())
+    assert exchange.throttler.config['tokens'] == 200
+    exchange.handle_rate_limit_headers(url, 418, {'Retry-After': '1'})
+    assert exchange.throttler.config['tokens'] == -1000 * exchange.tokenBucket['refillRate']
+    bybit = ccxt.bybit()
+    headers = {'X-Bapi-Limit-Status': '5', 'X-Bapi-Limit': '10', 'X-Bapi-Limit-Reset-Timestamp': str(bybit.milliseconds() + 1000)}
+    assert bybit.parse_rate_limit_headers('https://api.bybit.com/v5/order/create', 200, headers) == []
+    headers['X-Bapi-Limit-Status'] = '0'
+    [feedback] = bybit.parse_rate_limit_headers('https://api.bybit.com/v5/order/create', 200, headers)
+    assert feedback['remaining'] == 0
+    assert 0 < feedback['reset'] <= 1000
+    await exchange.close()
+    await bybit.close()
+
+
+async def test_rate_limit_buckets():
+    exchange = ccxt.binance({'rateLimit': 10, 'rateLimitBuckets': {'orders': {'refillRate': 1 / 1000}}})
+    config = exchange.api['private']['post']['order']
+    # the cost of the order endpoints names the orders bucket next to the ip weight of the main bucket
+    assert config == {'cost': 0.2, 'orders': 1}
+    assert exchange.calculate_rate_limiter_cost('private', 'POST', 'order', {}, config) == {'default': 0.2, 'orders': 1}
+    assert exchange.calculate_rate_limiter_cost('private', 'GET', 'order', {}, {'cost': 0.8}) == 0.8
+    assert ccxt.binance().calculate_rate_limiter_cost('private', 'POST', 'order', {}, config) == {'default': 0.2, 'orders': 1}
+    orders = exchange.rate_limit_throttler('orders')
+    assert orders is not exchange.throttler
+    assert exchange.rate_limit_throttler('default') is exchange.throttler
+    await exchange.throttle({'default': 1, 'orders': 1})
+    # the orders bucket is now empty for a second, market data calls do not wait on it
+    pending = asyncio.ensure_future(exchange.throttle({'default': 1, 'orders': 1}))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(5):
+        await exchange.throttle(1)
+    assert (loop.time() - start) * 1000 < 500
+    assert not pending.done()
+    assert orders.stats()['queueSize'] == 1
+    pending.cancel()
+    # the order count header resyncs the orders bucket only
+    url = 'https://api.binance.com/api/v3/order'
+    feedback = exchange.parse_rate_limit_headers(url, 200, {'x-mbx-used-weight-1m': '10', 'x-mbx-order-count-10s': '100'})
+    assert [entry['bucket'] for entry in feedback] == [None, 'orders']
+    assert feedback[1]['remaining'] == 0
+    exchange.handle_rate_limit_headers(url, 200, {'x-mbx-order-count-10s': '90'}, exchange.rate_limit_spent())
+    # 10 orders left at 0.1 tokens per order
+    assert orders.config['tokens'] == 1
+    await exchange.close()
+
+
+async def test_shared_throttler():
+    first = ccxt.binance({'sharedRateLimiter': True})
+    second = ccxt.binance({'sharedRateLimiter': True})
+    other = ccxt.binance({'sharedRateLimiter': 'my-key'})
+    alone = ccxt.binance()
+    assert first.rate_limiter_key() == 'binance:api.binance.com'
+    assert first.throttler is second.throttler
+    assert first.rate_limit_throttler('orders') is second.rate_limit_throttler('orders')
+    assert other.throttler is not first.throttler
+    assert alone.throttler is not first.throttler
+    for exchange in [first, second, other, alone]:
+        await exchange.close()
+
+
+async def test_file_throttler():
+    if os.name == 'nt':
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bucket.json')
+        # two throttlers on the same file act as two processes sharing a bucket
+        config = {'refillRate': 1 / 10, 'capacity': 1}
+        first = FileThrottler(config, path)
+        second = FileThrottler(config, path)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*([first() for _ in range(5)] + [second() for _ in range(5)]))
+        elapsed = (loop.time() - start) * 1000
+        assert elapsed >= 80, elapsed
+        assert first.stats()['granted'] + second.stats()['granted'] == 10
+        # a bucket locked by another process is not waited for on the event loop, the grant is retried
+        throttler = FileThrottler({'refillRate': float('inf'), 'delay': 0.005}, path)
+        with open(path, 'a+') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            waiting = throttler()
+            await asyncio.sleep(0.02)
+            assert not waiting.done() and throttler.timer is not None
+            throttler.sync(5)
+            fcntl.flock(file, fcntl.LOCK_UN)
+        await asyncio.wait_for(waiting, 1)
+        await asyncio.sleep(0.02)
+        assert throttler.stats()['granted'] == 1
+
+
+async def test_ws_throttler():
+    await test_throttler_rate()
+    await test_throttler_batch()
+    await test_throttler_cost_and_cancel()
+    await test_throttler_max_capacity()
+    await test_throttler_unlimited()
+    await test_throttler_no_refill()
+    await test_throttler_sync_and_backoff()
+    await test_rate_limit_headers()
+    await test_rate_limit_buckets()
+    await test_shared_throttler()
+    await test_file_throttler()
+
+
+if __name__ == '__main__':
+    asyncio.run(test_ws_throttler())
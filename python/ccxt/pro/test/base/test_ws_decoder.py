@@ -0,0 +1,134 @@
+import asyncio
+import gzip
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from aiohttp import WSMessage, WSMsgType  # noqa: E402
+from ccxt.async_support.base.ws.client import Client  # noqa: E402
+from ccxt.base.instrumentation import Instrumentation  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/pro/test/base/test_ws_decoder.py
+
+
+def create_client(received, config={}):
+    def on_message(client, message):
+        received.append(message)
+
+    def callback(*args):
+        pass
+
+    settings = {'asyncio_loop': asyncio.get_running_loop(), 'decoder': {'threshold': 100, 'compressedThreshold': 10}}
+    settings.update(config)
+    return Client('wss://test', on_message, callback, callback, callback, settings)
+
+
+def text(message):
+    return WSMessage(WSMsgType.TEXT, json.dumps(message), None)
+
+
+async def test_ws_decoder_order():
+    received = []
+    client = create_client(received)
+    large = {'id': 1, 'data': 'x' * 1000}
+    client.handle_message(text({'id': 0}))
+    # the small frames received after a large one wait for it
+    client.handle_message(text(large))
+    client.handle_message(text({'id': 2}))
+    client.handle_message(WSMessage(WSMsgType.TEXT, 'pong', None))
+    assert received == [{'id': 0}]
+    assert len(client.decoding) == 3
+    while client.decoding:
+        await asyncio.sleep(0.001)
+    assert received == [{'id': 0}, large, {'id': 2}, 'pong']
+    client.handle_message(text({'id': 3}))
+    assert received[-1] == {'id': 3}
+    await client.close()
+
+
+async def test_ws_decoder_compressed():
+    received = []
+    executor = ThreadPoolExecutor(1)
+    client = create_client(received, {'gunzip': True, 'decoder': {'executor': executor, 'compressedThreshold': 10}})
+    assert client.decoder_executor() is executor
+    for i in range(5):
+        client.handle_message(WSMessage(WSMsgType.BINARY, gzip.compress(json.dumps({'id': i}).encode()), None))
+    while client.decoding:
+        await asyncio.sleep(0.001)
+    assert received == [{'id': i} for i in range(5)]
+    # a frame that fails to decode is a connection error
+    errors = []
+    client.on_error = errors.append
+    client.handle_message(WSMessage(WSMsgType.BINARY, b'not gzipped', None))
+    client.handle_message(text({'id': 5}))
+    while not errors:
+        await asyncio.sleep(0.001)
+    assert len(client.decoding) == 0
+    executor.shutdown()
+
+
+async def test_ws_decoder_failing_handler():
+    received = []
+
+    def on_message(client, message):
+        received.append(message)
+        if message == 'fail':
+            raise ValueError(message)
+
+    client = create_client(received)
+    client.on_message_callback = on_message
+    client.handle_message(WSMessage(WSMsgType.TEXT, 'fail' + ' ' * 200, None))
+    client.handle_message(WSMessage(WSMsgType.TEXT, 'fail', None))
+    client.handle_message(text({'id': 1}))
+    while client.decoding:
+        await asyncio.sleep(0.001)
+    # the handler that failed did not hold back the frames after it
+    assert received == ['fail' + ' ' * 200, 'fail', {'id': 1}]
+    await client.close()
+
+
+async def test_ws_decoder_shared_executor():
+    received = []
+    first = create_client(received)
+    second = create_client(received)
+    first.instrumentation = Instrumentation()
+    first.handle_message(text({'id': 0, 'data': 'x' * 1000}))
+    executor = first.decoder_executor()
+    assert second.decoder_executor() is executor
+    while first.decoding:
+        await asyncio.sleep(0.001)
+    # the frames decoded off the loop are timed too
+    [decode] = [metric for metric in first.instrumentation.snapshot()['histograms'] if metric['name'] == 'ws.decode']
+    assert decode['count'] == 1
+    # the shared executor is shut down once the last client using it is closed
+    await first.close()
+    assert Client.executors == {'thread': executor}
+    await second.close()
+    assert Client.executors == {}
+    try:
+        executor.submit(print)
+        assert False, 'Expected the executor to be shut down'
+    except RuntimeError:
+        pass
+
+
+async def test_ws_decoder():
+    loop = asyncio.get_running_loop()
+    handler = loop.get_exception_handler()
+    loop.set_exception_handler(lambda loop, context: None)
+    try:
+        await test_ws_decoder_order()
+        await test_ws_decoder_compressed()
+        await test_ws_decoder_failing_handler()
+        await test_ws_decoder_shared_executor()
+    finally:
+        loop.set_exception_handler(handler)
+
+
+if __name__ == '__main__':
+    asyncio.run(test_ws_decoder())
@@ -8,6 +8,18 @@ from asyncio import run
 
 from ccxt.pro.test.base.test_order_book import test_ws_order_book  # noqa: F401
 from ccxt.pro.test.base.test_cache import test_ws_cache  # noqa: F401
+from ccxt.pro.test.base.test_order_book_engines import test_ws_order_book_engines  # noqa: F401
+from ccxt.pro.test.base.test_order_book_apply_deltas import test_ws_order_book_apply_deltas  # noqa: F401
+from ccxt.pro.test.base.test_order_book_read import test_ws_order_book_read  # noqa: F401
+from ccxt.pro.test.base.test_throttler import test_ws_throttler  # noqa: F401
+from ccxt.pro.test.base.test_stream import test_stream  # noqa: F401
+from ccxt.pro.test.base.test_message_handler import test_message_handler  # noqa: F401
+from ccxt.pro.test.base.test_ws_decoder import test_ws_decoder  # noqa: F401
+from ccxt.pro.test.base.test_decompressor import test_decompressor  # noqa: F401
+from ccxt.pro.test.base.test_connection_pool import test_connection_pool  # noqa: F401
+from ccxt.pro.test.base.test_reconnect import test_reconnect  # noqa: F401
+from ccxt.pro.test.base.test_snapshot_scheduler import test_snapshot_scheduler  # noqa: F401
+from ccxt.pro.test.base.test_instrumentation import test_instrumentation  # noqa: F401
 # todo : from ccxt.pro.test.base.test_close import test_ws_close  # noqa: F401
 from ccxt.pro.test.base.test_future import test_ws_future  # noqa: F401
 from ccxt.pro.test.base.test_abnormal_close import test_abnormal_close  # noqa: F401
@@ -15,6 +27,18 @@ from ccxt.pro.test.base.test_abnormal_close import test_abnormal_close  # noqa:
 def test_base_init_ws():
     test_ws_order_book()
     test_ws_cache()
+    test_ws_order_book_engines()
+    test_ws_order_book_apply_deltas()
+    test_ws_order_book_read()
     # todo : run(test_ws_close())
     run(test_ws_future())
+    run(test_ws_throttler())
+    run(test_stream())
+    run(test_message_handler())
+    run(test_ws_decoder())
+    run(test_decompressor())
+    run(test_connection_pool())
+    run(test_reconnect())
+    run(test_snapshot_scheduler())
+    run(test_instrumentation())
     # run(test_abnormal_close()) stays in infinite loop in travis
@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.ohlcv_columns import np  # noqa: E402
+
+# Benchmarks the candles built from trades by build_ohlcvc, by build_ohlcvc_columns over the columns of
+# the same trades and by an OHLCVCBuilder updated with batches of them, run by:
+# - python python/ccxt/test/base/benchmark_build_ohlcvc.py [trades]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(1)
+    timestamp = 1700000000000
+    timestamps = []
+    prices = []
+    amounts = []
+    for i in range(count):
+        timestamp += rng.randint(0, 400)
+        timestamps.append(timestamp)
+        prices.append(round(rng.uniform(90, 110), 2))
+        amounts.append(round(rng.uniform(0.001, 2), 3))
+    trades = [{'timestamp': t, 'price': p, 'amount': a} for t, p, a in zip(timestamps, prices, amounts)]
+    exchange = Exchange()
+    print('%d trades' % count)
+    report('build_ohlcvc', lambda: exchange.build_ohlcvc(trades, '1m'))
+    report('build_ohlcvc_columns', lambda: exchange.build_ohlcvc_columns(timestamps, prices, amounts, '1m'))
+    if np is not None:
+        columns = (np.array(timestamps), np.array(prices), np.array(amounts))
+        report('build_ohlcvc_columns numpy', lambda: exchange.build_ohlcvc_columns(*columns, '1m', 0, 2147483647, 'numpy'))
+
+    def incremental():
+        builder = exchange.ohlcvc_builder('1m')
+        for i in range(0, count, 100):
+            builder.update(timestamps[i:i + 100], prices[i:i + 100], amounts[i:i + 100])
+        return builder.candles
+
+    report('OHLCVCBuilder, 100 trades per update', incremental)
+
+
+def report(name, fn):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        candles = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print('%-38s %8.1f ms  %d candles' % (name, best * 1000, len(candles)))
+
+
+if __name__ == '__main__':
+    main()
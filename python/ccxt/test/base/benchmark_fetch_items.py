@@ -0,0 +1,82 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# Benchmarks the decoding of a large response whole and as a stream of items, run by:
+# - python python/ccxt/test/base/benchmark_fetch_items.py [response.json] [path]
+# the path is dot-separated, e.g. symbols for the exchangeInfo of binance, without a file the response
+# is built like the exchangeInfo of binance, the body arrives in chunks of streamChunkSize bytes
+
+
+def sample_body(count=3000):
+    symbols = []
+    for i in range(count):
+        symbols.append({
+            'symbol': 'S' + str(i) + 'USDT', 'status': 'TRADING', 'baseAsset': 'S' + str(i), 'quoteAsset': 'USDT',
+            'orderTypes': ['LIMIT', 'LIMIT_MAKER', 'MARKET', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT_LIMIT'],
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': '0.01000000', 'maxPrice': '1000000.00000000', 'tickSize': '0.01000000'},
+                {'filterType': 'LOT_SIZE', 'minQty': '0.00001000', 'maxQty': '9000.00000000', 'stepSize': '0.00001000'},
+                {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'maxNotional': '9000000.00000000'},
+            ],
+            'permissions': ['SPOT', 'MARGIN'] + ['TRD_GRP_' + str(j).zfill(3) for j in range(30)],
+        })
+    return json.dumps({'timezone': 'UTC', 'serverTime': 1700000000000, 'symbols': symbols}).encode()
+
+
+def whole(exchange, body, path):
+    # fetch reads the text of the body, strips it and decodes it, then the exchange picks the items
+    text = exchange.on_rest_response(200, 'OK', '', 'GET', {}, body.decode('utf-8'), {}, None)
+    response = exchange.parse_json(text)
+    for key in path:
+        response = response[key]
+    first = None
+    for item in response:
+        if first is None:
+            first = time.perf_counter()
+    return first
+
+
+def streamed(exchange, body, path):
+    stream = exchange.json_item_stream(path)
+    first = None
+    for i in range(0, len(body), exchange.streamChunkSize):
+        for item in stream.feed(body[i:i + exchange.streamChunkSize]):
+            if first is None:
+                first = time.perf_counter()
+    stream.close()
+    return first
+
+
+def measure(method, exchange, body, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = method(exchange, body, path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (first - start) * 1000, elapsed * 1000, peak / 1048576
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            body = file.read()
+    else:
+        body = sample_body()
+    path = sys.argv[2].split('.') if len(sys.argv) > 2 else ['symbols']
+    exchange = Exchange({'id': 'benchmark'})
+    print('%.1f MB body' % (len(body) / 1048576))
+    for name, method in [('whole', whole), ('streamed', streamed)]:
+        print('%-9s first item %8.2f ms  all items %8.2f ms  peak memory %7.2f MB' % ((name,) + measure(method, exchange, body, path)))
+
+
+if __name__ == '__main__':
+    main()
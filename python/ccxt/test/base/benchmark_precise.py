@@ -0,0 +1,116 @@
+import json
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+from ccxt.base.precise import Precise  # noqa: E402
+
+# Benchmarks the parsing of tickers, orders and trades, where safe_ticker, safe_order and safe_trade
+# chain the Precise.string_* calls, run by:
+# - python python/ccxt/test/base/benchmark_precise.py [repeat]
+# the raw items are the http responses of the static response fixtures of every exchange with markets
+# fixtures, parsed with the markets loaded, the items that fail to parse are left out, the string_*
+# calls made while parsing them are also replayed alone
+
+static = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static')
+parsers = {
+    'fetchTicker': 'parse_ticker',
+    'fetchTickers': 'parse_ticker',
+    'fetchOrder': 'parse_order',
+    'fetchOrders': 'parse_order',
+    'fetchOpenOrders': 'parse_order',
+    'fetchClosedOrders': 'parse_order',
+    'createOrder': 'parse_order',
+    'fetchMyTrades': 'parse_trade',
+    'fetchTrades': 'parse_trade',
+}
+
+
+def raw_items(response):
+    # the dicts of the first list found in the response, or the response
+    if isinstance(response, list):
+        return [item for item in response if isinstance(item, dict)]
+    if isinstance(response, dict):
+        for key in ['data', 'result', 'list', 'rows', 'items', 'orders', 'trades']:
+            if key in response and isinstance(response[key], (list, dict)):
+                items = raw_items(response[key])
+                if items:
+                    return items
+        return [response]
+    return []
+
+
+def load(exchange_id):
+    with open(os.path.join(static, 'markets', exchange_id + '.json')) as file:
+        markets = list(json.load(file).values())
+    with open(os.path.join(static, 'response', exchange_id + '.json')) as file:
+        methods = json.load(file)['methods']
+    exchange = getattr(ccxt, exchange_id)()
+    exchange.set_markets(markets)
+    calls = []
+    for method, parser in parsers.items():
+        for case in methods.get(method, []):
+            for item in raw_items(case.get('httpResponse')):
+                parse_method = getattr(exchange, parser)
+                try:
+                    parse_method(item)
+                except Exception:
+                    continue
+                calls.append((parse_method, item))
+    return calls
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    calls = []
+    for filename in sorted(os.listdir(os.path.join(static, 'markets'))):
+        exchange_id = filename[:-len('.json')]
+        if hasattr(ccxt, exchange_id) and os.path.exists(os.path.join(static, 'response', filename)):
+            calls += load(exchange_id)
+    string_methods = [name for name in dir(Precise) if name.startswith('string_')]
+    originals = {name: getattr(Precise, name) for name in string_methods}
+    recorded = []
+
+    def recording(method):
+        def call(*args):
+            recorded.append((method, args))
+            return method(*args)
+        return call
+
+    for name in string_methods:
+        setattr(Precise, name, staticmethod(recording(originals[name])))
+    for parse_method, item in calls:
+        parse_method(item)
+    for name in string_methods:
+        setattr(Precise, name, staticmethod(originals[name]))
+
+    def parse_all():
+        for parse_method, item in calls:
+            parse_method(item)
+
+    def replay():
+        for method, args in recorded:
+            method(*args)
+
+    print('%d tickers, orders and trades, %d Precise.string_* calls' % (len(calls), len(recorded)))
+    print('parse_*         %8.2f us per item' % (best_of(parse_all, repeat) / len(calls) * 1000000))
+    print('string_* calls  %8.2f us per call' % (best_of(replay, repeat) / len(recorded) * 1000000))
+
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        elapsed = (time.perf_counter() - start) / repeat
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+from ccxt.base.decimal_to_precision import decimal_to_precision, TICK_SIZE, ROUND, TRUNCATE  # noqa: E402
+
+# Benchmarks the rounding of order prices and amounts, run by:
+# - python python/ccxt/test/base/benchmark_precision.py [count]
+# decimal_to_precision is the generic version, price_to_precision and amount_to_precision go through the
+# compiled exchange.decimal_to_precision, the batch rounds all the prices of a market at once
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    exchange = ccxt.Exchange({'id': 'benchmark', 'precisionMode': TICK_SIZE})
+    exchange.set_markets([{'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'spot': True, 'precision': {'price': 0.01, 'amount': 0.00001}}])
+    market = exchange.market('BTC/USDT')
+    prices = [37000 + random.random() * 1000 for _ in range(count)]
+    # above the amount tick, so that no amount truncates to zero
+    amounts = [0.001 + random.random() for _ in range(count)]
+    runs = [
+        ('decimal_to_precision price', lambda: [decimal_to_precision(price, ROUND, market['precision']['price'], exchange.precisionMode, exchange.paddingMode) for price in prices]),
+        ('price_to_precision', lambda: [exchange.price_to_precision('BTC/USDT', price) for price in prices]),
+        ('prices_to_precision', lambda: exchange.prices_to_precision('BTC/USDT', prices)),
+        ('decimal_to_precision amount', lambda: [decimal_to_precision(amount, TRUNCATE, market['precision']['amount'], exchange.precisionMode, exchange.paddingMode) for amount in amounts]),
+        ('amount_to_precision', lambda: [exchange.amount_to_precision('BTC/USDT', amount) for amount in amounts]),
+        ('amounts_to_precision', lambda: exchange.amounts_to_precision('BTC/USDT', amounts)),
+    ]
+    for name, run in runs:
+        start = time.perf_counter()
+        run()
+        print('%-28s %6.2f us' % (name, (time.perf_counter() - start) / count * 1000000))
+
+
+if __name__ == '__main__':
+    main()
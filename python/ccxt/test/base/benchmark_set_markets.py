@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+
+# Benchmarks set_markets over the static markets fixtures, run by:
+# - python python/ccxt/test/base/benchmark_set_markets.py [scale]
+# every fixture is also replicated scale times (default 200) with renamed ids
+# and symbols, to get close to the size of a real binance/okx/bybit market list, set_markets is
+# set_markets_fast, the transpiled Exchange.set_markets is timed at scale for reference
+
+static = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static', 'markets')
+
+
+def scaled(markets, scale):
+    result = []
+    for i in range(scale):
+        suffix = '' if i == 0 else str(i)
+        for market in markets:
+            market = dict(market)
+            for key in ['id', 'symbol', 'base', 'baseId']:
+                if market.get(key) is not None:
+                    market[key] = market[key] + suffix if key != 'symbol' else market['base'] + suffix + market[key][len(market['base']):]
+            result.append(market)
+    return result
+
+
+def best_of(fn, runs=3):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    total = 0
+    total_scaled = 0
+    total_transpiled = 0
+    count = 0
+    for filename in sorted(os.listdir(static)):
+        exchange_id = filename[:-len('.json')]
+        if not hasattr(ccxt, exchange_id):
+            continue
+        with open(os.path.join(static, filename)) as file:
+            markets = list(json.load(file).values())
+        exchange = getattr(ccxt, exchange_id)()
+        total += best_of(lambda: exchange.set_markets(markets))
+        large = scaled(markets, scale)
+        elapsed = best_of(lambda: exchange.set_markets(large))
+        total_scaled += elapsed
+        total_transpiled += best_of(lambda: ccxt.Exchange.set_markets(exchange, large), 1)
+        count += 1
+        if exchange_id in ('binance', 'okx', 'bybit'):
+            print('%-10s %6d markets %8.1f ms' % (exchange_id, len(exchange.markets), elapsed * 1000))
+    print('%d fixtures: %.1f ms as is, %.1f ms at scale %d, %.1f ms transpiled' % (count, total * 1000, total_scaled * 1000, scale, total_transpiled * 1000))
+
+
+if __name__ == '__main__':
+    main()
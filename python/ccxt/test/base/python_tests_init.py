@@ -0,0 +1,29 @@
+import os
+import sys
+from asyncio import run
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# the tests of the python only base code, run with the generated base tests by ccxt/test/tests_init.py
+
+from ccxt.test.base.test_market_cache import test_market_cache  # noqa E402
+from ccxt.test.base.test_set_markets import test_set_markets, test_update_markets  # noqa E402
+from ccxt.test.base.test_fetch_items import test_fetch_items  # noqa E402
+from ccxt.test.base.test_precision_formatter import test_precision_formatter  # noqa E402
+from ccxt.test.base.test_precise_expr import test_precise_expr  # noqa E402
+from ccxt.test.base.test_number_backends import test_number_backends  # noqa E402
+from ccxt.test.base.test_ohlcv_columns import test_ohlcv_columns  # noqa E402
+from ccxt.test.base.test_build_ohlcvc import test_build_ohlcvc  # noqa E402
+
+
+def python_base_tests_init():
+    test_market_cache()
+    test_set_markets()
+    test_update_markets()
+    run(test_fetch_items())
+    test_precision_formatter()
+    test_precise_expr()
+    test_number_backends()
+    run(test_ohlcv_columns())
+    test_build_ohlcvc()
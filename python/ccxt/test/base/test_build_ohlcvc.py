@@ -0,0 +1,85 @@
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.ohlcv_columns import np  # noqa: E402
+from ccxt.async_support.base.ws.cache import ArrayCache  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/test/base/test_build_ohlcvc.py
+
+
+def random_trades(count, start=1700000000000):
+    rng = random.Random(7)
+    trades = []
+    timestamp = start
+    for i in range(count):
+        timestamp += rng.choice([0, 150, 2000, 45000, 180000])
+        price = 0 if rng.random() < 0.02 else round(rng.uniform(90, 110), 2)
+        trades.append({'symbol': 'BTC/USDT', 'timestamp': timestamp, 'price': price, 'amount': round(rng.uniform(0.001, 2), 3)})
+    return trades
+
+
+def columns_of(trades):
+    return [trade['timestamp'] for trade in trades], [trade['price'] for trade in trades], [trade['amount'] for trade in trades]
+
+
+def same_candles(candles, expected):
+    # the volumes summed in another order differ by the float rounding
+    return len(candles) == len(expected) and all(a[:5] + a[6:] == b[:5] + b[6:] and abs(a[5] - b[5]) < 1e-9 for a, b in zip(candles, expected))
+
+
+def test_build_ohlcvc():
+    exchange = Exchange()
+    trades = random_trades(3000)
+    timestamps, prices, amounts = columns_of(trades)
+    # the same candles as build_ohlcvc
+    for timeframe, since, limit in [('1m', 0, 2147483647), ('5m', trades[500]['timestamp'], 2147483647), ('1h', 0, 1000), ('1m', trades[-1]['timestamp'] + 1, 2147483647)]:
+        expected = exchange.build_ohlcvc(trades, timeframe, since, limit)
+        columns = exchange.build_ohlcvc_columns(timestamps, prices, amounts, timeframe, since, limit)
+        assert columns.count is not None and columns.to_list() == expected, timeframe
+    assert exchange.build_ohlcvc_columns([], [], [], '1m').to_list() == []
+    exchange.options['buildOHLCVC'] = {'skipZeroPrices': False}
+    assert exchange.build_ohlcvc_columns(timestamps, prices, amounts, '1m').to_list() == exchange.build_ohlcvc(trades, '1m')
+    if np is None:
+        try:
+            exchange.build_ohlcvc_columns(timestamps, prices, amounts, '1m', 0, 2147483647, 'numpy')
+            assert False
+        except ccxt.NotSupported:
+            pass
+    else:
+        columns = exchange.build_ohlcvc_columns(np.array(timestamps), np.array(prices), np.array(amounts), '1m', 0, 2147483647, 'numpy')
+        assert same_candles(columns.to_list(), exchange.build_ohlcvc(trades, '1m'))
+    exchange.options['buildOHLCVC'] = {}
+    # the incremental candles, the trades of a candle split across the updates
+    builder = exchange.ohlcvc_builder('5m')
+    updated = 0
+    for i in range(0, len(trades), 97):
+        updated += builder.update(*columns_of(trades[i:i + 97]))
+    expected = exchange.build_ohlcvc(trades, '5m')
+    assert same_candles(builder.candles.to_list(), expected) and len(builder.columns()) == len(expected) and updated >= len(expected)
+    # the last candle is updated, the trades of the candles before it are late
+    last = trades[-1]
+    assert builder.update([last['timestamp'] + 1], [1000.0], [1.0]) == 1
+    assert builder.candles[-1][2] == 1000.0 and builder.candles[-1][6] == expected[-1][6] + 1
+    assert builder.update([trades[0]['timestamp']], [100.0], [1.0]) == 0 and builder.late == 1
+    assert len(builder.candles) == len(expected)
+    # the trades appended to a watch_trades cache since the last update
+    cache = ArrayCache(50)
+    builder = exchange.ohlcvc_builder('1m')
+    for i, trade in enumerate(trades[:400]):
+        cache.append(trade)
+        if i % 30 == 0:
+            builder.update_from_cache(cache)
+    builder.update_from_cache(cache)
+    assert builder.update_from_cache(cache) == 0
+    assert same_candles(builder.candles.to_list(), exchange.build_ohlcvc(trades[:400], '1m'))
+
+
+if __name__ == '__main__':
+    test_build_ohlcvc()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+from aiohttp import web  # noqa: E402
+from ccxt import ExchangeError, ExchangeNotAvailable, BadResponse  # noqa: E402
+from ccxt.base.exchange import Exchange as SyncExchange  # noqa: E402
+from ccxt.base.json_stream import JsonItemStream  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/test/base/test_fetch_items.py
+
+
+symbols = [{'symbol': 'S' + str(i) + 'USDT', 'status': 'TRADING', 'filters': [{'tickSize': '0.01000000'}]} for i in range(2000)]
+exchange_info = {'timezone': 'UTC', 'rateLimits': [{'limit': 6000}], 'symbols': symbols, 'serverTime': 1}
+
+
+class StreamExchange(Exchange):
+    base_url = None
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': self.base_url + '/' + path, 'method': method, 'body': None, 'headers': None}
+
+    def handle_errors(self, code, reason, url, method, headers, body, response, requestHeaders, requestBody):
+        if response is not None and response.get('code', 0) != 0:
+            raise ExchangeError(self.id + ' ' + body)
+
+    def parse_market(self, market):
+        return {'id': market['symbol'], 'active': market['status'] == 'TRADING'}
+
+
+class SyncStreamExchange(SyncExchange):
+    base_url = None
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': self.base_url + '/' + path, 'method': method, 'body': None, 'headers': None}
+
+
+def test_json_item_stream():
+    body = json.dumps(exchange_info, indent=1).encode()
+    for size in [1, 3, 4096]:
+        stream = JsonItemStream(['symbols'])
+        items = []
+        for i in range(0, len(body), size):
+            items += stream.feed(body[i:i + size])
+        items += stream.close()
+        assert items == symbols
+        assert stream.envelope == {'timezone': 'UTC', 'rateLimits': [{'limit': 6000}], 'symbols': [], 'serverTime': 1}
+    # the body is not kept once parsed
+    assert len(stream.buffer) < 4096
+    # the entries of objects, the multi-byte characters split across the chunks
+    stream = JsonItemStream(['result', 'tickers'])
+    body = '{"result": {"tickers": {"BTC/USDT": {"last": 1.5}, "€": 12}}}'.encode()
+    assert [item for i in range(len(body)) for item in stream.feed(body[i:i + 1])] == [('BTC/USDT', {'last': 1.5}), ('€', 12)]
+    assert stream.close() == [] and stream.envelope == {'result': {'tickers': {}}}
+    # the numbers that end with the chunk wait for the next one
+    stream = JsonItemStream()
+    assert stream.feed(b'[1, 12') == [1] and stream.feed(b'3]') == [123] and stream.close() == []
+    # the numbers split before their dot, fraction, exponent or its sign parse like json.loads
+    body = b'{"data": [12345.678, 1.5e-7, -0.25, 3E+21, -1e5, 0, 10, {"p": 2.5e-3, "q": [-7.125]}, 1.0], "entries": {"a": 6.02e23, "b": -4.5}, "next": 1e-9}'
+    expected = json.loads(body)
+    for path in [['data'], ['entries']]:
+        stream = JsonItemStream(path)
+        items = [item for i in range(len(body)) for item in stream.feed(body[i:i + 1])] + stream.close()
+        assert items == (expected['data'] if path == ['data'] else list(expected['entries'].items()))
+        assert stream.envelope['next'] == expected['next']
+    stream = JsonItemStream()
+    assert stream.feed(b'-1.5') == [] and stream.feed(b'e-7') == [] and stream.close() == [] and stream.envelope == -1.5e-7
+    stream = JsonItemStream(['data'])
+    assert stream.feed(b'{"code": 1, "msg": "error"}') == [] and stream.close() == [] and not stream.found
+    assert stream.envelope == {'code': 1, 'msg': 'error'}
+    stream = JsonItemStream(['data'])
+    stream.feed(b'{"data": [1, ')
+    try:
+        stream.close()
+        assert False
+    except ValueError:
+        pass
+    assert JsonItemStream(['a'], str, str).feed(b'{"a": [1.10, 2]}') == ['1.10', '2']
+
+
+async def test_fetch_items():
+    test_json_item_stream()
+    sent_first = asyncio.Event()
+    first_item = asyncio.Event()
+
+    async def info(request):
+        response = web.StreamResponse()
+        response.content_type = 'application/json'
+        await response.prepare(request)
+        body = json.dumps(exchange_info).encode()
+        half = len(body) // 2
+        await response.write(body[:half])
+        sent_first.set()
+        # the rest of the body is sent once the first items were consumed
+        await asyncio.wait_for(first_item.wait(), 5)
+        await response.write(body[half:])
+        await response.write_eof()
+        return response
+
+    async def error(request):
+        return web.json_response({'code': -1121, 'msg': 'Invalid symbol.', 'data': []})
+
+    async def unavailable(request):
+        return web.Response(status=503, text='Service Unavailable')
+
+    app = web.Application()
+    app.router.add_get('/exchangeInfo', info)
+    app.router.add_get('/error', error)
+    app.router.add_get('/unavailable', unavailable)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    exchange = StreamExchange({'id': 'streamtest', 'streamChunkSize': 1024, 'enableLastJsonResponse': True})
+    exchange.base_url = 'http://127.0.0.1:' + str(runner.addresses[0][1])
+    try:
+        markets = []
+        async for market in exchange.parse_items(exchange.fetch2_items('exchangeInfo', 'public', 'GET', {}, items=['symbols']), exchange.parse_market):
+            if not markets:
+                # the first items come before the end of the body
+                assert sent_first.is_set() and not first_item.is_set()
+                first_item.set()
+            markets.append(market)
+        assert markets == [exchange.parse_market(symbol) for symbol in symbols]
+        assert exchange.last_json_response['symbols'] == [] and exchange.last_json_response['serverTime'] == 1
+        assert exchange.last_http_response is None
+        # the errors of the fields around the items are raised before the items
+        try:
+            async for item in exchange.fetch2_items('error', 'public', 'GET', {}, items=['data']):
+                assert False
+            assert False
+        except ExchangeError as e:
+            assert 'Invalid symbol.' in str(e)
+        try:
+            async for item in exchange.fetch2_items('unavailable', 'public', 'GET', {}, items=['data']):
+                assert False
+            assert False
+        except ExchangeNotAvailable as e:
+            assert '503' in str(e)
+    finally:
+        await exchange.close()
+        await runner.cleanup()
+    test_sync_fetch_items()
+
+
+def test_sync_fetch_items():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps(exchange_info).encode() if self.path == '/exchangeInfo' else b'{"symbols": [1, '
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    exchange = SyncStreamExchange({'id': 'streamtest', 'enableLastJsonResponse': True})
+    exchange.base_url = 'http://127.0.0.1:' + str(server.server_address[1])
+    try:
+        items = exchange.fetch2_items('exchangeInfo', 'public', 'GET', {}, items=['symbols'])
+        assert list(exchange.parse_items(items, lambda market: market['symbol'])) == [symbol['symbol'] for symbol in symbols]
+        assert exchange.last_json_response['timezone'] == 'UTC'
+        try:
+            list(exchange.fetch2_items('truncated', 'public', 'GET', {}, items=['symbols']))
+            assert False
+        except BadResponse:
+            pass
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    asyncio.run(test_fetch_items())
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import os
+import stat
+import sys
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+import ccxt.async_support as ccxt_async  # noqa: E402
+from ccxt.base.market_cache import MarketCache, MemoryMarketCache, FileMarketCache  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/test/base/test_market_cache.py
+
+static = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static')
+
+
+def load_static(folder):
+    with open(os.path.join(static, folder, 'binance.json')) as file:
+        return json.load(file)
+
+
+def create_exchange(module, cache, fetched):
+    exchange = module.binance({'marketsCache': cache})
+    markets = list(load_static('markets').values())
+    currencies = load_static('currencies')
+    exchange.options['marketHelperProps'] = ['cacheTestHelper']
+    exchange.options['cacheTestHelper'] = {'loaded': True}
+
+    def fetch_markets(params={}):
+        fetched.append('markets')
+        return markets
+
+    def fetch_currencies(params={}):
+        fetched.append('currencies')
+        return currencies
+
+    async def fetch_markets_async(params={}):
+        await asyncio.sleep(0.01)
+        return fetch_markets(params)
+
+    async def fetch_currencies_async(params={}):
+        await asyncio.sleep(0.01)
+        return fetch_currencies(params)
+
+    asynchronous = module is ccxt_async
+    exchange.fetch_markets = fetch_markets_async if asynchronous else fetch_markets
+    exchange.fetch_currencies = fetch_currencies_async if asynchronous else fetch_currencies
+    return exchange
+
+
+def test_market_cache_sync(cache):
+    fetched = []
+    first = create_exchange(ccxt, cache, fetched)
+    first.load_markets()
+    assert fetched == ['currencies', 'markets']
+    second = create_exchange(ccxt, cache, fetched)
+    del second.options['cacheTestHelper']
+    markets = second.load_markets()
+    # the second instance is served from the cache
+    assert fetched == ['currencies', 'markets']
+    assert markets == first.markets
+    assert second.symbols == first.symbols
+    assert second.ids == first.ids
+    assert second.codes == first.codes
+    assert second.markets_by_id == first.markets_by_id
+    assert second.currencies_by_id == first.currencies_by_id
+    assert second.options['cacheTestHelper'] == {'loaded': True}
+    assert second.market('BTC/USDT')['id'] == 'BTCUSDT'
+    second.load_markets(True)
+    assert fetched == ['currencies', 'markets'] * 2
+
+
+async def test_market_cache_refresh():
+    fetched = []
+    cache = {'type': 'memory', 'key': 'binance-refresh-test', 'ttl': 0}
+    first = create_exchange(ccxt_async, cache, fetched)
+    await first.load_markets()
+    second = create_exchange(ccxt_async, cache, fetched)
+    await asyncio.sleep(0.001)
+    markets = await second.load_markets()
+    # the stale markets are returned at once and refreshed in the background
+    assert len(fetched) == 2
+    assert markets == first.markets
+    await second.markets_refreshing
+    assert len(fetched) == 4
+    assert second.markets == first.markets
+    cache['refresh'] = False
+    third = create_exchange(ccxt_async, cache, fetched)
+    await asyncio.sleep(0.001)
+    await third.load_markets()
+    assert len(fetched) == 6
+    assert third.markets_refreshing is None
+    for exchange in [first, second, third]:
+        await exchange.close()
+
+
+def test_market_cache_untrusted(directory):
+    cache = FileMarketCache(directory)
+    entry = {'markets': {'BTC/USDT': {'id': 'BTCUSDT'}}}
+    cache.set('binance', entry)
+    assert cache.get('binance') == entry
+    assert stat.S_IMODE(os.stat(cache.filename('binance')).st_mode) == 0o600
+    # the files writable by others are ignored
+    os.chmod(cache.filename('binance'), 0o666)
+    assert cache.get('binance') is None
+    os.chmod(cache.filename('binance'), 0o600)
+    assert cache.get('binance') == entry
+    # so are the directories writable by others, nothing is written there
+    os.chmod(directory, 0o777)
+    assert cache.get('binance') is None
+    cache.set('okx', entry)
+    assert not os.path.exists(cache.filename('okx'))
+    os.chmod(directory, 0o700)
+
+
+def test_market_cache():
+    try:
+        MarketCache()
+        assert False
+    except TypeError:
+        pass
+    if hasattr(os, 'getuid'):
+        assert FileMarketCache().path.endswith('-' + str(os.getuid()))
+    MemoryMarketCache.entries.clear()
+    test_market_cache_sync({'type': 'memory'})
+    with tempfile.TemporaryDirectory() as directory:
+        test_market_cache_sync({'type': 'file', 'path': directory})
+        assert os.listdir(directory) == ['binance.bin']
+    if hasattr(os, 'getuid'):
+        with tempfile.TemporaryDirectory() as directory:
+            test_market_cache_untrusted(os.path.join(directory, 'markets'))
+    asyncio.run(test_market_cache_refresh())
+
+
+if __name__ == '__main__':
+    test_market_cache()
@@ -0,0 +1,74 @@
+import decimal
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+import ccxt.pro  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook  # noqa: E402
+from ccxt.base.number_backends import ScaledInt, scaled_number  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/test/base/test_number_backends.py
+
+
+def test_number_backends():
+    Decimal = decimal.Decimal
+    exchange = Exchange({'number': 'decimal'})
+    assert exchange.safe_number({'price': '0.1'}, 'price') == Decimal('0.1')
+    assert exchange.parse_bid_ask(['31685.10', '0.78', 3]) == [Decimal('31685.10'), Decimal('0.78'), 3]
+    assert exchange.parse_number('not a number', 'default') == 'default'
+    # the order books keep the numbers of the backend
+    book = OrderBook()
+    exchange.handle_bid_ask_deltas(book['bids'], [['100.1', '1'], ['100.3', '2'], ['100.2', '0.5']])
+    exchange.handle_bid_ask_deltas(book['bids'], [['100.3', '0'], ['100.1', '0.1']])
+    assert book['bids'] == [[Decimal('100.2'), Decimal('0.5')], [Decimal('100.1'), Decimal('0.1')]]
+    assert book['bids'][1][0] + book['bids'][1][1] == Decimal('100.2')
+    # a context shared by the exchanges
+    context = decimal.Context(prec=6, rounding=decimal.ROUND_DOWN)
+    first = Exchange({'number': 'decimal', 'decimalContext': context})
+    second = Exchange({'number': Decimal, 'decimalContext': context})
+    assert first.safe_number({'p': '1.23456789'}, 'p') == Decimal('1.23456') == second.parse_number('1.23456789')
+    # the integers of 10 ** -scale units
+    exchange = Exchange({'number': 'scaled', 'numberScale': 4})
+    price = exchange.safe_number({'price': '73369.845'}, 'price')
+    assert isinstance(price, ScaledInt) and price == 733698450 and str(price) == '73369.845' and float(price) == 73369.845
+    assert exchange.parse_number('0.00005') == 0 and exchange.parse_number('0.00015') == 2 and exchange.parse_number('-0.00015') == -2
+    assert exchange.parse_number('1e-3') == 10 and exchange.parse_number(1.5) == 15000 and price.to_decimal() == Decimal('73369.8450')
+    # the strings read back from the unified structures parse to the same numbers
+    ticker = exchange.safe_ticker({'symbol': 'BTC/USDT', 'last': price, 'bid': exchange.parse_number('73369.8')})
+    assert ticker['last'] == price and ticker['close'] == price and str(ticker['bid']) == '73369.8'
+    assert exchange.number_to_string(price) == '73369.845'
+    assert scaled_number(4) is type(price) and scaled_number(4).parse(scaled_number(8).parse('0.12345')) == 1234
+    book = OrderBook()
+    exchange.handle_bid_ask_deltas(book['asks'], [['0.0002', '3'], ['0.0001', '1.5']])
+    assert book['asks'] == [[1, 15000], [2, 30000]] and str(book['asks'][0][1]) == '1.5'
+    # json.dumps writes the count of units
+    assert json.dumps(price) == '733698450' and json.dumps(str(price)) == '"73369.845"'
+    # the deltas of the ws order books are in the numbers of the snapshot
+    for id in ['binance', 'okx', 'bybit']:
+        for number, expected in [('scaled', [[733698450, 15000]]), ('decimal', [[Decimal('73369.845'), Decimal('1.5')]])]:
+            exchange = getattr(ccxt.pro, id)({'number': number, 'numberScale': 4})
+            book = exchange.order_book({'asks': [exchange.parse_bid_ask(['73369.9', '2'])]})
+            exchange.handle_deltas(book['asks'], [['73369.845', '1.5'], ['73369.9', '0']])
+            assert book['asks'] == expected and type(book['asks'][0][0]) is type(exchange.parse_number('1')), id + ' ' + number
+            # the transpiled handle_bid_ask_deltas of the sync base gives the same numbers as the batch of the ws base
+            book = exchange.order_book({'asks': [exchange.parse_bid_ask(['73369.9', '2'])]})
+            ccxt.Exchange.handle_bid_ask_deltas(exchange, book['asks'], [['73369.845', '1.5'], ['73369.9', '0']])
+            assert book['asks'] == expected and type(book['asks'][0][0]) is type(exchange.parse_number('1')), id + ' ' + number
+    # float remains the default, str and the callables are kept
+    assert Exchange().parse_number('0.1') == 0.1 and Exchange({'number': 'str'}).parse_number('0.10') == '0.10'
+    assert Exchange({'number': str}).number is str and ccxt.binance({'number': 'float'}).number is float
+    try:
+        Exchange({'id': 'numbers', 'number': 'fraction'})
+        assert False
+    except ccxt.NotSupported as e:
+        assert 'fraction' in str(e)
+
+
+if __name__ == '__main__':
+    test_number_backends()
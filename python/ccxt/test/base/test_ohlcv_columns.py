@@ -0,0 +1,135 @@
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+from ccxt.base.exchange import Exchange as SyncExchange  # noqa: E402
+from ccxt.base.ohlcv_columns import OHLCVColumns, np  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.cache import ArrayCacheByTimestamp  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/test/base/test_ohlcv_columns.py
+
+
+minute = 60000
+start = 1700000000000
+
+
+def raw_candles(since, limit):
+    # the candles of the 10 hours from start, newest first like many exchanges, with strings for the prices
+    first = max(0, -((start - since) // minute))
+    return [[start + i * minute, str(100 + i), str(101 + i), str(99 + i), str(100.5 + i), i * 0.25] for i in reversed(range(first, min(first + limit, 600)))]
+
+
+def candle(i):
+    return [start + i * minute, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, i * 0.25]
+
+
+class CandleExchange(SyncExchange):
+    calls = 0
+
+    def milliseconds(self):
+        return start + 600 * minute
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        paginate, params = self.handle_option_and_params(params, 'fetchOHLCV', 'paginate', False)
+        if paginate:
+            return self.fetch_paginated_call_deterministic('fetchOHLCV', symbol, since, limit, timeframe, params, 100)
+        self.calls += 1
+        return self.parse_ohlcvs(raw_candles(since, limit or 100), None, timeframe, since, limit)
+
+
+class AsyncCandleExchange(Exchange):
+    def milliseconds(self):
+        return start + 600 * minute
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        paginate, params = self.handle_option_and_params(params, 'fetchOHLCV', 'paginate', False)
+        if paginate:
+            return await self.fetch_paginated_call_deterministic('fetchOHLCV', symbol, since, limit, timeframe, params, 100)
+        await asyncio.sleep(0)
+        return self.parse_ohlcvs(raw_candles(since, limit or 100), None, timeframe, since, limit)
+
+
+class DictCandleExchange(SyncExchange):
+    def parse_ohlcv(self, ohlcv, market=None):
+        return [self.safe_integer(ohlcv, 't'), self.safe_number(ohlcv, 'o'), self.safe_number(ohlcv, 'h'), self.safe_number(ohlcv, 'l'), self.safe_number(ohlcv, 'c'), self.safe_number(ohlcv, 'v')]
+
+
+def test_columns():
+    rows = [candle(i) for i in range(5)]
+    columns = OHLCVColumns.from_rows(rows)
+    assert len(columns) == 5 and columns == rows and columns[-1] == rows[-1] and list(columns) == rows
+    assert columns.timestamp.typecode == 'q' and columns.close.typecode == 'd' and columns.to_dict()['volume'][2] == 0.5
+    assert columns[1:3].to_list() == rows[1:3]
+    # sorted, the first candle of a timestamp wins when concatenated
+    changed = [row[:4] + [0.0, 0.0] for row in rows[3:]]
+    assert OHLCVColumns.concat([changed + rows[:2], rows[2:]]).to_list() == rows[:3] + changed
+    assert OHLCVColumns.from_rows(list(reversed(rows))).sort() == rows
+    # the since and limit of filter_by_since_limit
+    assert columns.filter_by_since_limit(start + minute, 2).to_list() == rows[1:3]
+    assert columns.filter_by_since_limit(None, 2).to_list() == rows[3:]
+    assert columns.filter_by_since_limit(start + minute, 2, True).to_list() == rows[3:]
+    assert columns.filter_by_since_limit(start + 10 * minute).to_list() == []
+    # the missing values are nan, the candles without a timestamp are left out
+    sparse = OHLCVColumns.from_rows([[start, 1, None, 1, 1], [None, 1, 1, 1, 1, 1]])
+    assert len(sparse) == 1 and sparse.high[0] != sparse.high[0] and sparse.volume[0] != sparse.volume[0]
+    if np is None:
+        try:
+            OHLCVColumns.from_rows(rows, 'numpy')
+            assert False
+        except ccxt.NotSupported as e:
+            assert 'numpy' in str(e)
+    else:
+        numpy_columns = OHLCVColumns.from_rows(rows, 'numpy')
+        assert numpy_columns.timestamp.dtype == np.int64 and numpy_columns == rows
+        assert OHLCVColumns.concat([rows[2:], rows[:3]], 'numpy') == rows
+        assert numpy_columns.filter_by_since_limit(start + minute, 2).to_list() == rows[1:3]
+        assert OHLCVColumns.from_rows(columns, 'numpy').array_type == 'numpy'
+    # the cache of watch_ohlcv
+    cache = ArrayCacheByTimestamp(3)
+    for row in rows:
+        cache.append(list(row))
+    cache.append(rows[4][:5] + [9.0])
+    assert cache.to_columns().to_list() == rows[2:4] + [rows[4][:5] + [9.0]]
+
+
+async def test_ohlcv_columns():
+    test_columns()
+    exchange = CandleExchange()
+    raw = raw_candles(start, 10)
+    rows = [candle(i) for i in range(10)]
+    assert exchange.parse_ohlcvs_columns(raw) == exchange.parse_ohlcvs(raw) == rows
+    assert exchange.parse_ohlcvs_columns(raw, None, '1m', start + minute, 3).to_list() == exchange.parse_ohlcvs(raw, None, '1m', start + minute, 3)
+    # the values parse_ohlcv would take are left to it
+    raw[1][2] = ''
+    assert exchange.parse_ohlcvs_columns(raw)[8][2] != exchange.parse_ohlcvs_columns(raw)[8][2]
+    dicts = [{'t': row[0], 'o': row[1], 'h': row[2], 'l': row[3], 'c': row[4], 'v': row[5]} for row in rows]
+    assert DictCandleExchange().parse_ohlcvs_columns(dicts, None, '1m', None, 4) == rows[6:]
+    # the pages of the paginated calls are concatenated as columns
+    since = start + 30 * minute
+    expected = [candle(i) for i in range(30, 280)]
+    columns = exchange.fetch_ohlcv_array('BTC/USDT', '1m', since, 250, {'paginate': True, 'paginationCalls': 10})
+    assert isinstance(columns, OHLCVColumns) and columns == expected and exchange.calls == 6
+    assert exchange.fetch_ohlcv('BTC/USDT', '1m', since, 250, {'paginate': True, 'paginationCalls': 10}) == expected
+    assert exchange.fetchOHLCVArray('BTC/USDT', '1m', since, 20) == expected[:20]
+    try:
+        exchange.fetch_ohlcv_array('BTC/USDT', '1m', since, 20, {'arrayType': 'pandas'})
+        assert False
+    except ccxt.NotSupported:
+        pass
+    async_exchange = AsyncCandleExchange()
+    try:
+        columns = await async_exchange.fetch_ohlcv_array('BTC/USDT', '1m', since, 250, {'paginate': True, 'paginationCalls': 10})
+        assert isinstance(columns, OHLCVColumns) and columns == expected
+        assert await async_exchange.fetch_ohlcv('BTC/USDT', '1m', since, 250, {'paginate': True, 'paginationCalls': 10}) == expected
+    finally:
+        await async_exchange.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(test_ohlcv_columns())
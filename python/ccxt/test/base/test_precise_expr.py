@@ -0,0 +1,50 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+from ccxt.base.precise import Precise, PreciseExpr, parse, to_string  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/test/base/test_precise_expr.py
+
+
+def test_precise_expr():
+    # the parsed strings and the strings of the scaled integers
+    assert parse('-1.123e-6') == (-1123, 9) and parse('1E8') == (1, -8) and parse('0.00000002') == (2, 8)
+    assert parse('-1.123e-6') is parse('-1.123e-6')
+    assert to_string(-1123, 9) == '-0.000001123' and to_string(1, -8) == '100000000' and to_string(1500, 3) == '1.5'
+    assert to_string(0, 5) == '0' and to_string(-20, 0) == '-20' and to_string(12, 2) == '0.12'
+    # the same results as the chains of string_* calls
+    values = {'price': '73369.84000000', 'average': '-72180.93', 'amount': '0.23925000', 'fee': '0.00012', 'zero': '0'}
+    p = Precise
+    formulas = {
+        '(price - average) * amount / price': p.string_div(p.string_mul(p.string_sub(values['price'], values['average']), values['amount']), values['price']),
+        'price * amount + fee': p.string_add(p.string_mul(values['price'], values['amount']), values['fee']),
+        '-abs(average) % 7': p.string_mod(p.string_neg(p.string_abs(values['average'])), '7'),
+        'max(price, average) - min(amount, fee) + 0.1': p.string_add(p.string_sub(p.string_max(values['price'], values['average']), p.string_min(values['amount'], values['fee'])), '0.1'),
+        "amount * '1e-2'": p.string_mul(values['amount'], '1e-2'),
+    }
+    for formula, expected in formulas.items():
+        assert PreciseExpr(formula).evaluate(values) == expected, formula
+    assert PreciseExpr('price / 3', 2)(price='10') == p.string_div('10', '3', 2) == '3.33'
+    assert PreciseExpr('price / zero')(values) is None
+    assert PreciseExpr('price * fee')(price='1', fee=None) is None
+    assert PreciseExpr('price * amount')(price=2, amount=0.5) == '1'
+    expression = PreciseExpr('a * b + a')
+    assert expression.names == ['a', 'b'] and expression(a='2', b='3') == '8'
+    for unsupported in ['a ** 2', 'a < b', 'round(a)', 'a.b', 'True + a']:
+        try:
+            PreciseExpr(unsupported)
+            assert False, unsupported
+        except (ValueError, SyntaxError):
+            pass
+    # the Precise instances keep their own values
+    a = Precise('1.500')
+    assert str(a) == '1.5' and a.decimals == 1 and a.integer == 15
+    assert str(Precise('2') / Precise('3')) == '0.666666666666666666'
+
+
+if __name__ == '__main__':
+    test_precise_expr()
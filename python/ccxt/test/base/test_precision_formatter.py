@@ -0,0 +1,73 @@
+import decimal
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+from ccxt import InvalidOrder  # noqa: E402
+from ccxt.base.decimal_to_precision import decimal_to_precision, precision_formatter  # noqa: E402
+from ccxt.base.decimal_to_precision import TRUNCATE, ROUND, DECIMAL_PLACES, SIGNIFICANT_DIGITS, TICK_SIZE, NO_PADDING, PAD_WITH_ZERO  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/test/base/test_precision_formatter.py
+
+
+numbers = [
+    0, -0.0, '-0', 1, -1, 37123.4567, -37123.4567, 0.015, -0.015, 2.675, 0.005, 0.00049999, 1e-07, '1e-30', 1.5e+21,
+    '12.', '.5', '+1.25', '0.1234567890123456789', '123456789012345678901234567.5', decimal.Decimal('1.2E+3'),
+    decimal.Decimal('-0.00500'), 99.995, 12345, 'nan', '1_000', ' 1.5',
+]
+precisions = {
+    TICK_SIZE: [0.01, 0.5, '0.05', 0.25, 1, 5, 1.0, 10, 1e-05, decimal.Decimal('0.010'), 0.00000001, 2.5, 0.3],
+    DECIMAL_PLACES: [0, 1, 2, 8, 18, 30, -1],
+    SIGNIFICANT_DIGITS: [1, 3, 8],
+}
+
+
+def outcome(method, *args):
+    try:
+        return method(*args)
+    except Exception as e:
+        return type(e)
+
+
+def test_precision_formatter():
+    # the same results and errors as decimal_to_precision
+    for counting_mode, values in precisions.items():
+        for precision in values:
+            for rounding_mode in [TRUNCATE, ROUND]:
+                for padding_mode in [NO_PADDING, PAD_WITH_ZERO]:
+                    formatter = precision_formatter(rounding_mode, precision, counting_mode, padding_mode)
+                    assert formatter is precision_formatter(rounding_mode, precision, counting_mode, padding_mode)
+                    for n in numbers:
+                        expected = outcome(decimal_to_precision, n, rounding_mode, precision, counting_mode, padding_mode)
+                        assert outcome(formatter, n) == expected, (n, rounding_mode, precision, counting_mode, padding_mode)
+    assert outcome(precision_formatter(ROUND, None, TICK_SIZE), 1) is AssertionError
+    # the formatters of the markets
+    exchange = ccxt.Exchange({'id': 'precisiontest', 'precisionMode': TICK_SIZE})
+    exchange.set_markets([
+        {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'spot': True, 'precision': {'price': 0.01, 'amount': 0.00001}},
+        {'id': 'ETHUSDT', 'symbol': 'ETH/USDT', 'base': 'ETH', 'quote': 'USDT', 'spot': True, 'precision': {'price': 0.05, 'amount': 0.001}},
+    ])
+    assert sorted(exchange.precision_formatters.keys()) == ['BTC/USDT', 'ETH/USDT']
+    assert exchange.price_to_precision('BTC/USDT', 37123.4567) == '37123.46'
+    assert exchange.amount_to_precision('BTC/USDT', 0.123456789) == '0.12345'
+    assert exchange.cost_to_precision('BTC/USDT', 37123.4567) == '37123.45'
+    assert exchange.prices_to_precision('ETH/USDT', [2000.024, 2000.025, None]) == ['2000', '2000.05', None]
+    assert exchange.amounts_to_precision('ETH/USDT', ['1.23456', 2]) == ['1.234', '2']
+    try:
+        exchange.amounts_to_precision('ETH/USDT', [1, 0.0001])
+        assert False
+    except InvalidOrder:
+        pass
+    # a change of the precision of a market rebuilds its formatters
+    exchange.markets['ETH/USDT']['precision']['price'] = 0.1
+    assert exchange.price_to_precision('ETH/USDT', 2000.04) == '2000'
+    exchange.paddingMode = PAD_WITH_ZERO
+    assert exchange.price_to_precision('ETH/USDT', 2000.04) == '2000.0'
+
+
+if __name__ == '__main__':
+    test_precision_formatter()
@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+
+# Test by running:
+# - python python/ccxt/test/base/test_set_markets.py
+
+static = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static')
+
+
+def load_static(folder):
+    with open(os.path.join(static, folder, 'binance.json')) as file:
+        return json.load(file)
+
+
+def test_set_markets():
+    exchange = ccxt.binance()
+    markets = list(load_static('markets').values())
+    exchange.set_markets(markets, load_static('currencies'))
+    assert exchange.symbols == sorted(market['symbol'] for market in markets)
+    assert exchange.ids == sorted(set(market['id'] for market in markets))
+    market = exchange.market('BTC/USDT')
+    assert [market['symbol'] for market in exchange.markets_by_id['BTCUSDT']] == ['BTC/USDT', 'BTC/USDT:USDT']
+    # the template is merged into every market without being shared between them
+    assert market['precision'] is not exchange.market('ETH/USDT')['precision']
+    assert market['limits']['amount'] is not exchange.market('ETH/USDT')['limits']['amount']
+    assert 'BTC' in exchange.currencies and 'USDT' in exchange.codes
+    # the same markets and currencies as the transpiled set_markets
+    reference = ccxt.binance()
+    ccxt.Exchange.set_markets(reference, markets, load_static('currencies'))
+    for key in ['markets', 'markets_by_id', 'symbols', 'ids', 'currencies', 'baseCurrencies', 'quoteCurrencies', 'codes', 'currencies_by_id']:
+        assert getattr(exchange, key) == getattr(reference, key), key
+    reference.currencies = {}
+    ccxt.Exchange.set_markets(reference, markets)
+    exchange.currencies = {}
+    exchange.set_markets(markets)
+    for key in ['currencies', 'baseCurrencies', 'quoteCurrencies', 'codes', 'currencies_by_id']:
+        assert getattr(exchange, key) == getattr(reference, key), key
+    exchange.set_markets(markets, load_static('currencies'))
+    # the indexed markets keep the order of the markets
+    assert [market['symbol'] for market in exchange.markets_by('base', 'BTC')] == [symbol for symbol in exchange.markets if symbol.startswith('BTC/')]
+    swaps = exchange.markets_by('type', 'swap')
+    assert swaps and all(market['swap'] for market in swaps)
+    assert exchange.markets_by('settle', 'NOPE') == []
+    # the returned lists can be modified without affecting the index
+    swaps.clear()
+    assert exchange.markets_by('type', 'swap')
+    # the indexes follow new and updated markets
+    exchange.set_markets(markets[:1])
+    assert len(exchange.markets_by('type', markets[0]['type'])) == 1
+    exchange.markets['TEST/USDT'] = exchange.extend(markets[0], {'symbol': 'TEST/USDT'})
+    assert len(exchange.markets_by('type', markets[0]['type'])) == 2
+
+
+def test_update_markets():
+    markets = list(load_static('markets').values())
+    exchange = ccxt.binance({'incrementalMarketsReload': True})
+    exchange.fetch_markets = lambda params={}: markets
+    exchange.fetch_currencies = lambda params={}: None
+    exchange.load_markets()
+    changes = []
+    exchange.add_markets_listener(changes.append)
+    loaded = exchange.markets
+    symbols = exchange.symbols
+    btc = exchange.market('BTC/USDT')
+    ltc = exchange.market('LTC/USDT')
+    assert len(exchange.markets_by('base', 'ETH')) == 4
+    exchange.load_markets(True)
+    # nothing changed
+    assert changes == []
+    assert exchange.market('LTC/USDT') is ltc
+    new = exchange.extend(markets[0], {'id': 'NEWUSDT', 'symbol': 'NEW/USDT', 'base': 'NEW', 'baseId': 'NEW'})
+    updated = exchange.extend(markets[0], {'precision': exchange.extend(markets[0]['precision'], {'price': 0.1})})
+    markets = [updated, new] + [market for market in markets[1:] if market['symbol'] != 'ETH/USDT']
+    exchange.load_markets(True)
+    [change] = changes
+    assert change['listed'] == ['NEW/USDT']
+    assert change['delisted'] == ['ETH/USDT']
+    assert change['changed'] == {'BTC/USDT': ['precision']}
+    # the loaded markets are updated in place
+    assert exchange.markets is loaded and exchange.symbols is symbols
+    assert exchange.market('BTC/USDT') is btc and btc['precision']['price'] == 0.1
+    assert exchange.market('LTC/USDT') is ltc
+    assert 'ETH/USDT' not in symbols and 'NEW/USDT' in symbols
+    assert 'NEW' in exchange.currencies and exchange.currency('NEW')['id'] == 'NEW'
+    assert len(exchange.markets_by('base', 'ETH')) == 3
+    # and end up as a full reload with the transpiled set_markets would set them
+    reference = ccxt.binance()
+    ccxt.Exchange.set_markets(reference, markets)
+    for key in ['markets', 'markets_by_id', 'symbols', 'ids', 'currencies', 'baseCurrencies', 'quoteCurrencies', 'codes', 'currencies_by_id']:
+        assert getattr(exchange, key) == getattr(reference, key), key
+    exchange.remove_markets_listener(changes.append)
+    markets = markets[1:]
+    exchange.load_markets(True)
+    assert len(changes) == 1
+
+
+if __name__ == '__main__':
+    test_set_markets()
+    test_update_markets()
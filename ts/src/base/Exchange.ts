@@ -2216,6 +2216,14 @@ export default class Exchange {
         }
     }
 
+    handleBidAskDeltas (bookSide: any, deltas, priceKey: IndexType = 0, amountKey: IndexType = 1) {
+        // the price and amount deltas of a message, python applies them to the side in a single batch
+        for (let i = 0; i < deltas.length; i++) {
+            const delta = deltas[i];
+            bookSide.store (this.safeNumber (delta, priceKey), this.safeNumber (delta, amountKey));
+        }
+    }
+
     getCacheIndex (orderbook, deltas) {
         // return the first index of the cache that can be applied to the orderbook or -1 if not possible
         return -1;
@@ -2405,6 +2413,28 @@ export default class Exchange {
         return result;
     }
 
+    messageHandlers () {
+        // the routing tables of handleMessage, { table: { key: name of the handler method }}
+        return {};
+    }
+
+    messageHandler (table: string, key: Str, find: boolean = false): Str {
+        // the name of the method handling the messages with key in a table of messageHandlers
+        // with find and no exact key, the first key of the table contained in key routes the message
+        const handlers = this.safeDict (this.messageHandlers (), table, {});
+        const handler = this.safeString (handlers, key);
+        if ((handler !== undefined) || !find || (key === undefined)) {
+            return handler;
+        }
+        const keys = Object.keys (handlers);
+        for (let i = 0; i < keys.length; i++) {
+            if (key.indexOf (keys[i]) >= 0) {
+                return handlers[keys[i]];
+            }
+        }
+        return undefined;
+    }
+
     filterByLimit (array: object[], limit: Int = undefined, key: IndexType = 'timestamp', fromStart: boolean = false): any {
         if (this.valueIsDefined (limit)) {
             const arrayLength = array.length;
@@ -13,6 +13,9 @@ export default class binanceus extends binance {
             'countries': [ 'US' ], // US
             'hostname': 'binance.us',
             'rateLimit': 50, // 1200 req per min
+            'rateLimitHeaders': [
+                { 'url': '/api/', 'used': 'x-mbx-used-weight-1m', 'limit': 1200, 'window': 60000 },
+            ],
             'certified': false,
             'pro': true,
             'urls': {
@@ -116,10 +119,10 @@ export default class binanceus extends binance {
                         'openOrderList': 3,
                     },
                     'post': {
-                        'order': 1,
+                        'order': { 'cost': 1, 'orders': 1 },
                         'order/test': 1,
-                        'order/cancelReplace': 1,
-                        'order/oco': 1,
+                        'order/cancelReplace': { 'cost': 1, 'orders': 1 },
+                        'order/oco': { 'cost': 1, 'orders': 2 },
                     },
                     'delete': {
                         'order': 1,
@@ -24,6 +24,13 @@ export default class bybit extends Exchange {
             'version': 'v5',
             'userAgent': undefined,
             'rateLimit': 20,
+            'rateLimitHeaders': {
+                // per endpoint and uid limits
+                'remaining': 'X-Bapi-Limit-Status',
+                'limit': 'X-Bapi-Limit',
+                'resetTimestamp': 'X-Bapi-Limit-Reset-Timestamp',
+                'endpoint': true,
+            },
             'hostname': 'bybit.com', // bybit.com, bytick.com, bybit.nl, bybit.com.hk
             'pro': true,
             'certified': true,
@@ -903,9 +903,7 @@ export default class binance extends binanceRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        this.handleBidAskDeltas (bookside, deltas, 0, 1);
     }
 
     handleOrderBookMessage (client: Client, message, orderbook) {
@@ -4463,6 +4461,40 @@ export default class binance extends binanceRest {
         }
     }
 
+    messageHandlers () {
+        return {
+            'event': {
+                'depthUpdate': 'handleOrderBook',
+                'trade': 'handleTrade',
+                'aggTrade': 'handleTrade',
+                'kline': 'handleOHLCV',
+                'markPrice_kline': 'handleOHLCV',
+                'indexPrice_kline': 'handleOHLCV',
+                '1hTicker@arr': 'handleTickers',
+                '4hTicker@arr': 'handleTickers',
+                '1dTicker@arr': 'handleTickers',
+                '24hrTicker@arr': 'handleTickers',
+                '24hrMiniTicker@arr': 'handleTickers',
+                '1hTicker': 'handleTickers',
+                '4hTicker': 'handleTickers',
+                '1dTicker': 'handleTickers',
+                '24hrTicker': 'handleTickers',
+                '24hrMiniTicker': 'handleTickers',
+                'markPriceUpdate': 'handleTickers',
+                'markPriceUpdate@arr': 'handleTickers',
+                'bookTicker': 'handleBidsAsks', // there is no "bookTicker@arr" endpoint
+                'outboundAccountPosition': 'handleBalance',
+                'balanceUpdate': 'handleBalance',
+                'ACCOUNT_UPDATE': 'handleAcountUpdate',
+                'executionReport': 'handleOrderUpdate',
+                'ORDER_TRADE_UPDATE': 'handleOrderUpdate',
+                'forceOrder': 'handleLiquidation',
+                'eventStreamTerminated': 'handleEventStreamTerminated',
+                'externalLockUpdate': 'handleBalance',
+            },
+        };
+    }
+
     handleMessage (client: Client, message) {
         // handle WebSocketAPI
         const eventMsg = this.safeDict (message, 'event');
@@ -4478,48 +4510,19 @@ export default class binance extends binanceRest {
         // user subscription wraps message in subscriptionId and event
         const id = this.safeString (message, 'id');
         const subscriptions = this.safeValue (client.subscriptions, id);
-        let method = this.safeValue (subscriptions, 'method');
+        const method = this.safeValue (subscriptions, 'method');
         if (method !== undefined) {
             method.call (this, client, message);
             return;
         }
         // handle other APIs
-        const methods: Dict = {
-            'depthUpdate': this.handleOrderBook,
-            'trade': this.handleTrade,
-            'aggTrade': this.handleTrade,
-            'kline': this.handleOHLCV,
-            'markPrice_kline': this.handleOHLCV,
-            'indexPrice_kline': this.handleOHLCV,
-            '1hTicker@arr': this.handleTickers,
-            '4hTicker@arr': this.handleTickers,
-            '1dTicker@arr': this.handleTickers,
-            '24hrTicker@arr': this.handleTickers,
-            '24hrMiniTicker@arr': this.handleTickers,
-            '1hTicker': this.handleTickers,
-            '4hTicker': this.handleTickers,
-            '1dTicker': this.handleTickers,
-            '24hrTicker': this.handleTickers,
-            '24hrMiniTicker': this.handleTickers,
-            'markPriceUpdate': this.handleTickers,
-            'markPriceUpdate@arr': this.handleTickers,
-            'bookTicker': this.handleBidsAsks, // there is no "bookTicker@arr" endpoint
-            'outboundAccountPosition': this.handleBalance,
-            'balanceUpdate': this.handleBalance,
-            'ACCOUNT_UPDATE': this.handleAcountUpdate,
-            'executionReport': this.handleOrderUpdate,
-            'ORDER_TRADE_UPDATE': this.handleOrderUpdate,
-            'forceOrder': this.handleLiquidation,
-            'eventStreamTerminated': this.handleEventStreamTerminated,
-            'externalLockUpdate': this.handleBalance,
-        };
         let event = this.safeString (message, 'e');
         if (Array.isArray (message)) {
             const data = message[0];
             event = this.safeString (data, 'e') + '@arr';
         }
-        method = this.safeValue (methods, event);
-        if (method === undefined) {
+        const handler = this.messageHandler ('event', event);
+        if (handler === undefined) {
             const requestId = this.safeString (message, 'id');
             if (requestId !== undefined) {
                 this.handleSubscriptionStatus (client, message);
@@ -4540,7 +4543,7 @@ export default class binance extends binanceRest {
                 this.handleBidsAsks (client, message);
             }
         } else {
-            method.call (this, client, message);
+            this[handler] (client, message);
         }
     }
 }
@@ -1040,9 +1040,7 @@ export default class bybit extends bybitRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        this.handleBidAskDeltas (bookside, deltas, 0, 1);
     }
 
     /**
@@ -2415,6 +2413,36 @@ export default class bybit extends bybitRest {
         }
     }
 
+    messageHandlers () {
+        return {
+            'topic': {
+                'orderbook': 'handleOrderBook',
+                'kline': 'handleOHLCV',
+                'order': 'handleOrder',
+                'stopOrder': 'handleOrder',
+                'ticker': 'handleTicker',
+                'trade': 'handleTrades',
+                'publicTrade': 'handleTrades',
+                'depth': 'handleOrderBook',
+                'wallet': 'handleBalance',
+                'outboundAccountInfo': 'handleBalance',
+                'execution': 'handleMyTrades',
+                'execution.fast': 'handleMyTrades',
+                'ticketInfo': 'handleMyTrades',
+                'user.openapi.perp.trade': 'handleMyTrades',
+                'position': 'handlePositions',
+                'liquidation': 'handleLiquidation',
+                'allLiquidation': 'handleLiquidation',
+                'pong': 'handlePong',
+                'order.create': 'handleOrderWs',
+                'order.amend': 'handleOrderWs',
+                'order.cancel': 'handleOrderWs',
+                'auth': 'handleAuthenticate',
+                'unsubscribe': 'handleUnSubscribe',
+            },
+        };
+    }
+
     handleMessage (client: Client, message) {
         const topic = this.safeString2 (message, 'topic', 'op', '');
         if (this.handleErrorMessage (client, message)) {
@@ -2438,45 +2466,12 @@ export default class bybit extends bybitRest {
             this.handleSubscriptionStatus (client, message);
             return;
         }
-        const methods: Dict = {
-            'orderbook': this.handleOrderBook,
-            'kline': this.handleOHLCV,
-            'order': this.handleOrder,
-            'stopOrder': this.handleOrder,
-            'ticker': this.handleTicker,
-            'trade': this.handleTrades,
-            'publicTrade': this.handleTrades,
-            'depth': this.handleOrderBook,
-            'wallet': this.handleBalance,
-            'outboundAccountInfo': this.handleBalance,
-            'execution': this.handleMyTrades,
-            'execution.fast': this.handleMyTrades,
-            'ticketInfo': this.handleMyTrades,
-            'user.openapi.perp.trade': this.handleMyTrades,
-            'position': this.handlePositions,
-            'liquidation': this.handleLiquidation,
-            'allLiquidation': this.handleLiquidation,
-            'pong': this.handlePong,
-            'order.create': this.handleOrderWs,
-            'order.amend': this.handleOrderWs,
-            'order.cancel': this.handleOrderWs,
-            'auth': this.handleAuthenticate,
-            'unsubscribe': this.handleUnSubscribe,
-        };
-        const exacMethod = this.safeValue (methods, topic);
-        if (exacMethod !== undefined) {
-            exacMethod.call (this, client, message);
+        // an exact topic or the first topic it contains
+        const handler = this.messageHandler ('topic', topic, true);
+        if (handler !== undefined) {
+            this[handler] (client, message);
             return;
         }
-        const keys = Object.keys (methods);
-        for (let i = 0; i < keys.length; i++) {
-            const key = keys[i];
-            if (topic.indexOf (keys[i]) >= 0) {
-                const method = methods[key];
-                method.call (this, client, message);
-                return;
-            }
-        }
         // unified auth acknowledgement
         const type = this.safeString (message, 'type');
         if (type === 'AUTH_RESP') {
@@ -1315,9 +1315,7 @@ export default class okx extends okxRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        this.handleBidAskDeltas (bookside, deltas, 0, 1);
     }
 
     handleOrderBookMessage (client: Client, message, orderbook, messageHash, market = undefined) {
@@ -2396,6 +2394,46 @@ export default class okx extends okxRest {
         return true;
     }
 
+    messageHandlers () {
+        return {
+            'event': {
+                // 'info': this.handleSystemStatus,
+                // 'book': 'handleOrderBook',
+                'login': 'handleAuthenticate',
+                'subscribe': 'handleSubscriptionStatus',
+                'unsubscribe': 'handleUnsubscription',
+                'order': 'handlePlaceOrders',
+                'batch-orders': 'handlePlaceOrders',
+                'amend-order': 'handlePlaceOrders',
+                'batch-amend-orders': 'handlePlaceOrders',
+                'cancel-order': 'handlePlaceOrders',
+                'mass-cancel': 'handleCancelAllOrders',
+            },
+            'channel': {
+                'bbo-tbt': 'handleOrderBook', // newly added channel that sends tick-by-tick Level 1 data, all API users can subscribe, public depth channel, verification not required
+                'books': 'handleOrderBook', // all API users can subscribe, public depth channel, verification not required
+                'books5': 'handleOrderBook', // all API users can subscribe, public depth channel, verification not required, data feeds will be delivered every 100ms (vs. every 200ms now)
+                'books50-l2-tbt': 'handleOrderBook', // only users who're VIP4 and above can subscribe, identity verification required before subscription
+                'books-l2-tbt': 'handleOrderBook', // only users who're VIP5 and above can subscribe, identity verification required before subscription
+                'tickers': 'handleTicker',
+                'mark-price': 'handleTicker',
+                'positions': 'handlePositions',
+                'index-tickers': 'handleTicker',
+                'sprd-tickers': 'handleTicker',
+                'block-tickers': 'handleTicker',
+                'trades': 'handleTrades',
+                'trades-all': 'handleTrades',
+                'account': 'handleBalance',
+                'funding-rate': 'handleFundingRate',
+                // 'margin_account': this.handleBalance,
+                'orders': 'handleOrders',
+                'orders-algo': 'handleOrders',
+                'liquidation-orders': 'handleLiquidation',
+                'balance_and_position': 'handleBalanceAndPosition',
+            },
+        };
+    }
+
     handleMessage (client: Client, message) {
         if (!this.handleErrorMessage (client, message)) {
             return;
@@ -2447,55 +2485,20 @@ export default class okx extends okxRest {
         // if (table === undefined) {
         const event = this.safeString2 (message, 'event', 'op');
         if (event !== undefined) {
-            const methods: Dict = {
-                // 'info': this.handleSystemStatus,
-                // 'book': 'handleOrderBook',
-                'login': this.handleAuthenticate,
-                'subscribe': this.handleSubscriptionStatus,
-                'unsubscribe': this.handleUnsubscription,
-                'order': this.handlePlaceOrders,
-                'batch-orders': this.handlePlaceOrders,
-                'amend-order': this.handlePlaceOrders,
-                'batch-amend-orders': this.handlePlaceOrders,
-                'cancel-order': this.handlePlaceOrders,
-                'mass-cancel': this.handleCancelAllOrders,
-            };
-            const method = this.safeValue (methods, event);
-            if (method !== undefined) {
-                method.call (this, client, message);
+            const handler = this.messageHandler ('event', event);
+            if (handler !== undefined) {
+                this[handler] (client, message);
             }
         } else {
             const arg = this.safeValue (message, 'arg', {});
             const channel = this.safeString (arg, 'channel');
-            const methods: Dict = {
-                'bbo-tbt': this.handleOrderBook, // newly added channel that sends tick-by-tick Level 1 data, all API users can subscribe, public depth channel, verification not required
-                'books': this.handleOrderBook, // all API users can subscribe, public depth channel, verification not required
-                'books5': this.handleOrderBook, // all API users can subscribe, public depth channel, verification not required, data feeds will be delivered every 100ms (vs. every 200ms now)
-                'books50-l2-tbt': this.handleOrderBook, // only users who're VIP4 and above can subscribe, identity verification required before subscription
-                'books-l2-tbt': this.handleOrderBook, // only users who're VIP5 and above can subscribe, identity verification required before subscription
-                'tickers': this.handleTicker,
-                'mark-price': this.handleTicker,
-                'positions': this.handlePositions,
-                'index-tickers': this.handleTicker,
-                'sprd-tickers': this.handleTicker,
-                'block-tickers': this.handleTicker,
-                'trades': this.handleTrades,
-                'trades-all': this.handleTrades,
-                'account': this.handleBalance,
-                'funding-rate': this.handleFundingRate,
-                // 'margin_account': this.handleBalance,
-                'orders': this.handleOrders,
-                'orders-algo': this.handleOrders,
-                'liquidation-orders': this.handleLiquidation,
-                'balance_and_position': this.handleBalanceAndPosition,
-            };
-            const method = this.safeValue (methods, channel);
-            if (method === undefined) {
+            const handler = this.messageHandler ('channel', channel);
+            if (handler === undefined) {
                 if (channel.indexOf ('candle') === 0) {
                     this.handleOHLCV (client, message);
                 }
             } else {
-                method.call (this, client, message);
+                this[handler] (client, message);
             }
         }
     }